@@ -0,0 +1,118 @@
+"""RDAP connection setup: HTTP/1.1 without pre-warming versus HTTP/2 with pre-warming.
+
+Runs iter_check_domains against local TLS stand-in RDAP servers (one per TLD)
+that charge --handshake-ms per new connection and --delay-ms per request, and
+reports sockets opened and time-to-first-result for each mode.
+
+    uv run python benchmarks/bench_connections.py --slds 300 --tlds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from unittest import mock
+
+from domainscout_check.checker import iter_check_domains
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.summary import RunSummary
+
+from standins import StandinRDAPServer, fixed_latency, self_signed_tls
+
+
+MODES = {
+    "http11_cold": {"http2": False, "prewarm_connections": False},
+    "http11_prewarm": {"http2": False, "prewarm_connections": True},
+    "http2_prewarm": {"http2": True, "prewarm_connections": True},
+}
+TLD_NAMES = ["com", "net", "org", "io", "dev"]
+
+
+async def _run_mode(servers: list[StandinRDAPServer], tlds: list[str], args: argparse.Namespace, options: dict, cache_dir: Path) -> dict:
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [f".{tld}" for tld in tlds],
+            "slds": [f"name{idx}" for idx in range(args.slds)],
+            "options": {
+                "max_concurrency": args.concurrency,
+                "cache_mode": "bypass",
+                "enable_dns_fallback": False,
+                "bootstrap_cache_path": str(cache_dir / "rdap_dns.json"),
+                **options,
+            },
+        }
+    )
+    summary = RunSummary(tlds=payload.tlds, allow_unknown=False)
+    sockets_before = sum(server.connections for server in servers)
+    first_result = None
+    started = time.perf_counter()
+    async for _result in iter_check_domains(payload, summary):
+        if first_result is None:
+            first_result = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    return {
+        "wall_s": round(elapsed, 3),
+        "first_result_ms": round((first_result or 0.0) * 1000, 1),
+        "sockets": sum(server.connections for server in servers) - sockets_before,
+        "reused_requests": sum(stats["reused"] for stats in summary.connections.values()),
+        "http_versions": sorted({v for stats in summary.connections.values() for v in stats["http_versions"]}),
+    }
+
+
+async def _bench(args: argparse.Namespace, workdir: Path) -> dict:
+    ssl_context, ca_file = self_signed_tls(workdir)
+    os.environ["SSL_CERT_FILE"] = str(ca_file)
+    tlds = TLD_NAMES[: args.tlds]
+    report: dict = {
+        "lookups": args.slds * len(tlds),
+        "servers": len(tlds),
+        "handshake_ms": args.handshake_ms,
+        "reply_delay_ms": args.delay_ms,
+    }
+    async with AsyncExitStack() as stack:
+        servers = [
+            await stack.enter_async_context(
+                StandinRDAPServer(
+                    registered={f"name{idx}.{tld}" for idx in range(0, args.slds, 4)},
+                    latency=fixed_latency(args.delay_ms / 1000),
+                    handshake_latency=args.handshake_ms / 1000,
+                    ssl_context=ssl_context,
+                )
+            )
+            for tld in tlds
+        ]
+        mapping = {tld: server.base_url for tld, server in zip(tlds, servers)}
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return mapping
+
+        with mock.patch("domainscout_check.checker.load_bootstrap_map", fake_bootstrap):
+            for name, options in MODES.items():
+                # Each mode opens a fresh client, so no connection outlives its run.
+                report[name] = await _run_mode(servers, tlds, args, options, workdir)
+    cold, warm = report["http11_cold"], report["http2_prewarm"]
+    report["socket_reduction"] = round(cold["sockets"] / max(1, warm["sockets"]), 1)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=300)
+    parser.add_argument("--tlds", type=int, default=3, choices=range(1, len(TLD_NAMES) + 1))
+    parser.add_argument("--concurrency", type=int, default=60)
+    parser.add_argument("--handshake-ms", type=float, default=40.0, help="Stand-in cost per new connection")
+    parser.add_argument("--delay-ms", type=float, default=15.0, help="Stand-in reply delay per request")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(asyncio.run(_bench(args, Path(tmp))), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""DNS fallback throughput: asyncio engine versus the to_thread resolver path.
+
+Both paths query a local stand-in DNS server with a fixed reply delay and
+keep up to --in-flight probes outstanding (each probe is an NS + SOA pair).
+
+    uv run python benchmarks/bench_dns.py --probes 5000 --in-flight 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from domainscout_check.dns_engine import AsyncDNSEngine
+from domainscout_check.dns_probe import _probe_domain_dns_sync
+
+from standins import StandinDNSServer, fixed_latency
+
+
+async def _run(probe, probes: int, in_flight: int) -> float:
+    slots = asyncio.Semaphore(in_flight)
+
+    async def one(idx: int) -> None:
+        async with slots:
+            await probe(f"name{idx}.com")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(idx) for idx in range(probes)))
+    return time.perf_counter() - started
+
+
+async def _bench(args: argparse.Namespace) -> dict:
+    registered = {f"name{idx}.com" for idx in range(0, args.probes, 3)}
+    report: dict = {"probes": args.probes, "in_flight": args.in_flight, "reply_delay_ms": args.delay_ms}
+    async with StandinDNSServer(registered=registered, latency=fixed_latency(args.delay_ms / 1000)) as server:
+        target = [("127.0.0.1", server.port)]
+
+        async def threaded(domain: str) -> None:
+            await asyncio.to_thread(_probe_domain_dns_sync, domain, args.timeout, target)
+
+        async with AsyncDNSEngine(target) as engine:
+
+            async def native(domain: str) -> None:
+                await engine.probe(domain, args.timeout)
+
+            for name, probe in (("to_thread", threaded), ("async_engine", native)):
+                elapsed = await _run(probe, args.probes, args.in_flight)
+                report[name] = {
+                    "wall_s": round(elapsed, 3),
+                    "probes_per_s": round(args.probes / elapsed, 1),
+                }
+            report["async_engine"]["queries_per_s"] = round(engine.queries / report["async_engine"]["wall_s"], 1)
+            report["async_engine"]["timeouts"] = engine.timeouts
+    report["speedup"] = round(report["to_thread"]["wall_s"] / report["async_engine"]["wall_s"], 2)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--probes", type=int, default=5000)
+    parser.add_argument("--in-flight", type=int, default=1000)
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="Stand-in server reply delay")
+    parser.add_argument("--timeout", type=float, default=2.5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_bench(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
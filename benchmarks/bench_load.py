@@ -0,0 +1,254 @@
+"""End-to-end load: the real check_domains against local stand-in RDAP and DNS servers.
+
+Every scenario (SLD count x TLD count x max_concurrency x batch_size) runs in a fresh
+process so peak RSS is its own. Each TLD gets a stand-in RDAP server with lognormal
+reply latency, 429/503/hang rates and a connection limit; RDAP failures fall back to
+a stand-in DNS server. Reports throughput, per-domain p50/p95/p99 latency, peak RSS
+(stand-ins included; ``rss_base_mb`` is the level before the run) and peak open
+sockets (client and stand-in ends both count), and writes the report as JSON.
+
+    uv run python benchmarks/bench_load.py --sizes 100,1000,5000 --tlds 1,3
+    uv run python benchmarks/bench_load.py --baseline .rig_cache/benchmarks/load-<previous>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from unittest import mock
+
+from domainscout_check import checker
+from domainscout_check.models import CheckDomainsInput
+
+from standins import StandinDNSServer, StandinRDAPServer, fixed_latency, lognormal_latency
+
+
+TLD_NAMES = ["com", "net", "org"]
+
+
+def _ints(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+
+def _open_sockets() -> int | None:
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            continue  # closed since listing (including listdir's own descriptor)
+    return count
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6, 1)
+
+
+async def _sample_sockets(peak: list[int]) -> None:
+    while True:
+        count = _open_sockets()
+        if count is None:
+            return
+        peak[0] = max(peak[0], count)
+        await asyncio.sleep(0.01)
+
+
+async def _scenario(cfg: dict) -> dict:
+    tlds = TLD_NAMES[: cfg["tlds"]]
+    slds = [f"name{idx}" for idx in range(cfg["slds"])]
+    ratio = cfg["taken_ratio"]
+    registered = {f"{sld}.{tld}" for idx, sld in enumerate(slds) if int((idx + 1) * ratio) > int(idx * ratio) for tld in tlds}
+    latencies: list[float] = []
+    real_lookup = checker._lookup_domain
+
+    async def timed_lookup(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await real_lookup(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    async with AsyncExitStack() as stack:
+        dns_server = await stack.enter_async_context(
+            StandinDNSServer(registered=registered, latency=fixed_latency(cfg["dns_delay_ms"] / 1000), drop_rate=cfg["dns_drop_rate"])
+        )
+        servers = [
+            await stack.enter_async_context(
+                StandinRDAPServer(
+                    registered=registered,
+                    latency=lognormal_latency(cfg["rdap_median_ms"] / 1000, cfg["rdap_sigma"], cap_s=2.0),
+                    throttle_rate=cfg["throttle_rate"],
+                    error_rate=cfg["error_rate"],
+                    hang_rate=cfg["hang_rate"],
+                    hang_seconds=cfg["timeout_ms"] / 1000 * 2,
+                    max_connections=cfg["server_max_connections"],
+                    seed=idx,
+                )
+            )
+            for idx, _tld in enumerate(tlds)
+        ]
+        mapping = {tld: server.base_url for tld, server in zip(tlds, servers)}
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return mapping
+
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": [f".{tld}" for tld in tlds],
+                "slds": slds,
+                "options": {
+                    "max_concurrency": cfg["max_concurrency"],
+                    "batch_size": cfg["batch_size"],
+                    "timeout_ms": cfg["timeout_ms"],
+                    "cache_mode": "bypass",
+                    "http2": False,
+                    "dns_nameservers": [dns_server.address],
+                    "bootstrap_cache_path": str(Path(cfg["workdir"]) / "rdap_dns.json"),
+                },
+            }
+        )
+        rss_base = _peak_rss_mb()
+        peak_sockets = [_open_sockets() or 0]
+        sampler = asyncio.create_task(_sample_sockets(peak_sockets))
+        with mock.patch.object(checker, "load_bootstrap_map", fake_bootstrap), mock.patch.object(checker, "_lookup_domain", timed_lookup):
+            started = time.perf_counter()
+            output = await checker.check_domains(payload)
+            elapsed = time.perf_counter() - started
+        sampler.cancel()
+
+    latencies.sort()
+    statuses: dict[str, int] = {}
+    for result in output.results:
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    rdap_statuses: dict[str, int] = {}
+    for server in servers:
+        for code, count in server.statuses.items():
+            rdap_statuses[str(code)] = rdap_statuses.get(str(code), 0) + count
+    return {
+        "lookups": len(output.results),
+        "wall_s": round(elapsed, 3),
+        "domains_per_s": round(len(output.results) / elapsed, 1),
+        "latency_ms": {f"p{pct}": round(_percentile(latencies, pct) * 1000, 1) for pct in (50, 95, 99)},
+        "rss_base_mb": rss_base,
+        "rss_peak_mb": _peak_rss_mb(),
+        "peak_open_sockets": peak_sockets[0] if _open_sockets() is not None else None,
+        "rdap_connections": sum(server.connections for server in servers),
+        "rdap_refused": sum(server.refused for server in servers),
+        "rdap_requests": sum(server.requests for server in servers),
+        "rdap_statuses": rdap_statuses,
+        "dns_queries": dns_server.received,
+        "statuses": statuses,
+    }
+
+
+def _run_scenario(cfg: dict) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(_scenario({**cfg, "workdir": tmp}))
+
+
+def _scenario_key(row: dict) -> tuple:
+    return (row["slds"], row["tlds"], row["max_concurrency"], row["batch_size"])
+
+
+def _compare(rows: list[dict], baseline_path: Path, tolerance: float) -> list[dict]:
+    previous = {_scenario_key(row): row for row in json.loads(baseline_path.read_text())["scenarios"]}
+    regressions = []
+    for row in rows:
+        before = previous.get(_scenario_key(row))
+        if before is None:
+            continue
+        throughput = row["domains_per_s"] / max(before["domains_per_s"], 1e-9)
+        p95 = row["latency_ms"]["p95"] / max(before["latency_ms"]["p95"], 1e-9)
+        if throughput < 1 - tolerance or p95 > 1 + tolerance:
+            regressions.append({"scenario": list(_scenario_key(row)), "throughput_ratio": round(throughput, 3), "p95_ratio": round(p95, 3)})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_ints, default=[100, 1000, 5000], help="Comma-separated SLD counts")
+    parser.add_argument("--tlds", type=_ints, default=[1, 2, 3], help=f"Comma-separated TLD counts (max {len(TLD_NAMES)})")
+    parser.add_argument("--concurrency", type=_ints, default=[20, 60], help="Comma-separated max_concurrency values")
+    parser.add_argument("--batch-size", type=_ints, default=[50, 200], help="Comma-separated batch_size values")
+    parser.add_argument("--rdap-median-ms", type=float, default=30.0)
+    parser.add_argument("--rdap-sigma", type=float, default=0.5, help="Lognormal spread of RDAP reply latency")
+    parser.add_argument("--throttle-rate", type=float, default=0.01, help="Share of RDAP replies that are 429")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Share of RDAP replies that are 503")
+    parser.add_argument("--hang-rate", type=float, default=0.002, help="Share of RDAP requests left to time out")
+    parser.add_argument("--server-max-connections", type=int, default=50, help="Per stand-in RDAP server")
+    parser.add_argument("--dns-delay-ms", type=float, default=10.0)
+    parser.add_argument("--dns-drop-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-ms", type=int, default=1000)
+    parser.add_argument("--taken-ratio", type=float, default=0.65)
+    parser.add_argument("--output", type=Path, help="Report path (default .rig_cache/benchmarks/load-<UTC time>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare throughput and p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change flagged as a regression")
+    args = parser.parse_args()
+    if max(args.tlds) > len(TLD_NAMES):
+        parser.error(f"--tlds values must be at most {len(TLD_NAMES)}")
+
+    fixed = {
+        "rdap_median_ms": args.rdap_median_ms,
+        "rdap_sigma": args.rdap_sigma,
+        "throttle_rate": args.throttle_rate,
+        "error_rate": args.error_rate,
+        "hang_rate": args.hang_rate,
+        "server_max_connections": args.server_max_connections,
+        "dns_delay_ms": args.dns_delay_ms,
+        "dns_drop_rate": args.dns_drop_rate,
+        "timeout_ms": args.timeout_ms,
+        "taken_ratio": args.taken_ratio,
+    }
+    rows = []
+    for slds, tlds, concurrency, batch_size in itertools.product(args.sizes, args.tlds, args.concurrency, args.batch_size):
+        scenario = {"slds": slds, "tlds": tlds, "max_concurrency": concurrency, "batch_size": batch_size}
+        # One process per scenario: ru_maxrss only ever grows, and no pooled state leaks between runs.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            row = {**scenario, **pool.submit(_run_scenario, {**fixed, **scenario}).result()}
+        rows.append(row)
+        sys.stderr.write(
+            f"slds={slds} tlds={tlds} conc={concurrency} batch={batch_size}: "
+            f"{row['domains_per_s']}/s p95={row['latency_ms']['p95']}ms rss={row['rss_peak_mb']}MB\n"
+        )
+
+    report: dict = {
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": sys.version.split()[0],
+        "stand_ins": fixed,
+        "scenarios": rows,
+    }
+    if args.baseline is not None:
+        report["regressions"] = _compare(rows, args.baseline, args.tolerance)
+    output = args.output or Path(".rig_cache/benchmarks") / f"load-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps({"report": str(output), "scenarios": len(rows), "regressions": report.get("regressions")}, indent=2))
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""MS2 request size: every TS1 result versus compact counts plus top candidates.
+
+Builds synthetic TS1 output rows (--slds x 3 TLDs, with the evidence fields TS1
+emits) and reports the serialized MS2 request size and build time for both modes.
+
+    uv run python benchmarks/bench_ms2_payload.py --slds 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from math import ceil
+
+from domainscout.ms2_payload import CANDIDATES_PER_RANKED_SLOT, compact_request, payload_bytes
+
+TLDS = [".com", ".net", ".io"]
+
+
+def _results(slds: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for sld in range(slds):
+        for tld in TLDS:
+            status = rng.choices(["taken", "available", "unknown", "invalid"], weights=[65, 25, 9, 1])[0]
+            rows.append(
+                {
+                    "domain": f"brandname{sld}{tld}",
+                    "status": status,
+                    "confidence": rng.choice([0.3, 0.65, 0.8, 0.98]),
+                    "method": "rdap",
+                    "rdap_server": "https://rdap.example.net/",
+                    "http_status": 200 if status == "taken" else 404,
+                }
+            )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = _results(args.slds, args.seed)
+    ranked_target = max(1, ceil(args.slds * 0.10))
+    base = {"theme": "bench", "tld_preference": TLDS, "ranked_target_count": ranked_target}
+
+    started = time.perf_counter()
+    full = json.dumps({**base, "results": results}, separators=(",", ":"))
+    full_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    compact = compact_request(base, results, TLDS, ranked_target * CANDIDATES_PER_RANKED_SLOT)
+    compact_bytes = payload_bytes(compact)
+    compact_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        json.dumps(
+            {
+                "results": len(results),
+                "candidates": len(compact["candidates"]["domain"]),
+                "full_bytes": len(full.encode()),
+                "compact_bytes": compact_bytes,
+                "reduction": round(1 - compact_bytes / len(full.encode()), 4),
+                "full_serialize_ms": round(full_ms, 1),
+                "compact_build_and_serialize_ms": round(compact_ms, 1),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+"""Local naming score: batch scoring time and the lookups a pre-check prune saves.
+
+Scores --slds synthetic MS1-style candidates (brandable names, long compounds, hyphens,
+digit filler) with score_slds, and the --slds x --tlds TS1 domains with score_domains
+(what the MS2 fallback ranking scores), best of --repeat each. Reports how many SLDs
+and TS1 lookups prune_lowest drops at --prune-percent.
+
+    uv run python benchmarks/bench_naming_score.py --slds 5000 --prune-percent 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from domainscout.naming_score import prune_lowest, score_domains, score_slds
+
+SYLLABLES = ["pix", "el", "forge", "moon", "beam", "ar", "cade", "nova", "lum", "qu", "zy", "tr", "ck", "io", "ra"]
+
+
+def _candidates(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    slds: list[str] = []
+    seen: set[str] = set()
+    while len(slds) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6)))
+        roll = rng.random()
+        if roll < 0.1:
+            name = f"{name[:6]}-{name[6:] or 'hq'}"
+        elif roll < 0.2:
+            name = f"{name}{rng.randint(1, 999)}"
+        if name not in seen:
+            seen.add(name)
+            slds.append(name[:63])
+    return slds
+
+
+def _best_ms(score, items: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        score(items)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--tlds", type=int, default=3)
+    parser.add_argument("--prune-percent", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    slds = _candidates(args.slds, args.seed)
+    domains = [f"{sld}.{tld}" for sld in slds for tld in ["com", "net", "io", "dev", "ai"][: args.tlds]]
+    kept, dropped = prune_lowest(slds, args.prune_percent)
+    print(
+        json.dumps(
+            {
+                "slds": len(slds),
+                "score_ms": round(_best_ms(score_slds, slds, args.repeat), 2),
+                "domains": len(domains),
+                "domains_score_ms": round(_best_ms(score_domains, domains, args.repeat), 2),
+                "pruned": len(dropped),
+                "lookups_saved": len(dropped) * args.tlds,
+                "lowest": dropped[:5],
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
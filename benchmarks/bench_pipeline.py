@@ -0,0 +1,108 @@
+"""Wall time of the lookup pipeline versus the old batch-and-gather loop.
+
+RDAP and DNS calls are replaced with in-process sleeps drawn from a
+long-tailed latency distribution, so the numbers isolate scheduling.
+
+    uv run python benchmarks/bench_pipeline.py --slds 5000 --tlds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import domainscout_check.checker as checker
+from domainscout_check.models import CheckDomainsInput, DNSProbeEvidence
+from domainscout_check.scheduler import RDAPScheduler
+
+
+TLDS = [".com", ".net", ".io"]
+
+
+def _install_fake_network(rng: random.Random, timeout_rate: float, timeout_s: float, scale: float) -> None:
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {tld.lstrip("."): f"https://rdap{idx}.bench" for idx, tld in enumerate(TLDS)}
+
+    async def fake_query(_client, _base, _domain):
+        if rng.random() < timeout_rate:
+            await asyncio.sleep(timeout_s * scale)
+            return "unknown", 0.25, None, "timeout", None
+        await asyncio.sleep(min(timeout_s, rng.lognormvariate(-2.5, 0.8)) * scale)
+        return ("taken", 0.98, 200, None, None) if rng.random() < 0.65 else ("available", 0.80, 404, None, None)
+
+    async def fake_dns(_domain, _timeout_ms, engine=None, nameservers=None):
+        await asyncio.sleep(rng.lognormvariate(-3.5, 0.5) * scale)
+        return DNSProbeEvidence(dns_ns=True)
+
+    checker.load_bootstrap_map = fake_bootstrap
+    checker.query_rdap_domain = fake_query
+    checker.probe_domain_dns = fake_dns
+    checker.append_run_log = lambda *_args, **_kwargs: None
+
+
+async def _legacy_batch_and_gather(payload: CheckDomainsInput) -> int:
+    tlds = [t.lower() for t in payload.tlds]
+    rdap_base_map = await checker.load_bootstrap_map()
+    scheduler = RDAPScheduler(payload.options, (checker._resolve_rdap_base(t, rdap_base_map, payload) for t in tlds))
+    ctx = checker.LookupContext(rdap_base_map=rdap_base_map, client=None, scheduler=scheduler)
+    ctx.backends = checker.build_lookup_backends(ctx, payload.options)
+    checked = 0
+    batch_size = payload.options.batch_size
+    for idx in range(0, len(payload.slds), batch_size):
+        tasks = [
+            checker._check_one_domain(f"{sld}{tld}", tld, payload, ctx)
+            for sld in payload.slds[idx : idx + batch_size]
+            for tld in tlds
+        ]
+        checked += len(await asyncio.gather(*tasks))
+    return checked
+
+
+async def _pipeline(payload: CheckDomainsInput) -> int:
+    return len((await checker.check_domains(payload)).results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--tlds", type=int, default=3, choices=[1, 2, 3])
+    parser.add_argument("--max-concurrency", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--timeout-rate", type=float, default=0.01, help="Share of RDAP attempts that hang")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every simulated latency")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": TLDS[: args.tlds],
+                "slds": [f"bench{i}" for i in range(args.slds)],
+                "options": {
+                    "max_concurrency": args.max_concurrency,
+                    "batch_size": args.batch_size,
+                    "cache_mode": "bypass",
+                    "bootstrap_cache_path": str(Path(tmp) / "rdap_dns.json"),
+                },
+            }
+        )
+        report = {"slds": args.slds, "tlds": args.tlds, "max_concurrency": args.max_concurrency}
+        for name, runner in (("batch_and_gather", _legacy_batch_and_gather), ("pipeline", _pipeline)):
+            _install_fake_network(random.Random(args.seed), args.timeout_rate, payload.options.timeout_ms / 1000, args.scale)
+            started = time.perf_counter()
+            checked = asyncio.run(runner(payload))
+            elapsed = time.perf_counter() - started
+            report[name] = {"wall_s": round(elapsed, 3), "lookups": checked, "lookups_per_s": round(checked / elapsed, 1)}
+
+    report["speedup"] = round(report["batch_and_gather"]["wall_s"] / report["pipeline"]["wall_s"], 2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
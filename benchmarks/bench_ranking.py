@@ -0,0 +1,176 @@
+"""MS2 ranked-output normalization: full sort + list-bucket rebalance vs per-TLD top-k heaps.
+
+Both paths take the same synthetic TS1 results (--slds x 3 TLDs, shuffled) and a short
+MS2 ranking, and return the ceil(candidate_count * 0.10) rows the harness keeps. Reports
+CPU time, best of --repeat, and checks both paths return the same rows.
+
+    uv run python benchmarks/bench_ranking.py --slds 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from math import ceil
+
+from domainscout.naming_score import score_domains
+from domainscout.ranking import extract_tld, select_ranked
+
+TLDS = [".com", ".net", ".io"]
+
+
+def _legacy_fallback_ranked(results: list[dict], tlds: list[str]) -> list[dict]:
+    tld_order = {tld.lower(): idx for idx, tld in enumerate(tlds)}
+    status_order = {"available": 0, "unknown": 1, "taken": 2, "invalid": 3}
+    brand = dict(zip((row["domain"] for row in results), score_domains([row["domain"] for row in results])))
+
+    def sort_key(row: dict) -> tuple[int, int, float, float, int, str]:
+        domain = row["domain"]
+        tld = extract_tld(domain)
+        return (
+            status_order.get(row["status"], 99),
+            tld_order.get(tld, len(tlds) + 1),
+            -float(row["confidence"]),
+            -brand[domain],
+            len(domain),
+            domain,
+        )
+
+    ranked: list[dict] = []
+    for row in sorted(results, key=sort_key):
+        tld = extract_tld(row["domain"])
+        ranked.append(
+            {
+                "domain": row["domain"],
+                "status": row["status"],
+                "confidence": row["confidence"],
+                "tld_preference_rank": tld_order.get(tld, len(tlds)),
+                "summary": "autofilled_from_ts1_fallback",
+            }
+        )
+    return ranked
+
+
+def _legacy_rebalance(ranked: list[dict], tlds: list[str], max_count: int) -> list[dict]:
+    if max_count <= 0:
+        return []
+    if not ranked:
+        return []
+    if not tlds:
+        return ranked[:max_count]
+
+    requested_tlds: list[str] = []
+    seen_tlds: set[str] = set()
+    for tld in tlds:
+        normalized = tld.lower()
+        if normalized in seen_tlds:
+            continue
+        requested_tlds.append(normalized)
+        seen_tlds.add(normalized)
+
+    buckets: dict[str, list[dict]] = {tld: [] for tld in requested_tlds}
+    for row in ranked:
+        bucket_tld = extract_tld(row["domain"])
+        if bucket_tld in buckets:
+            buckets[bucket_tld].append(row)
+
+    selected: list[dict] = []
+    seen_domains: set[str] = set()
+    progress = True
+    while len(selected) < max_count and progress:
+        progress = False
+        for tld in requested_tlds:
+            bucket = buckets[tld]
+            if not bucket:
+                continue
+            row = bucket.pop(0)
+            domain = row["domain"]
+            if domain in seen_domains:
+                continue
+            selected.append(row)
+            seen_domains.add(domain)
+            progress = True
+            if len(selected) >= max_count:
+                break
+
+    if len(selected) < max_count:
+        for row in ranked:
+            domain = row["domain"]
+            if domain in seen_domains:
+                continue
+            selected.append(row)
+            seen_domains.add(domain)
+            if len(selected) >= max_count:
+                break
+
+    return selected[:max_count]
+
+
+def _legacy_select(model_ranked: list[dict], results: list[dict], tlds: list[str], max_count: int) -> list[dict]:
+    deduped: list[dict] = []
+    seen: set[str] = set()
+    for row in [*model_ranked, *_legacy_fallback_ranked(results, tlds)]:
+        if row["domain"] not in seen:
+            seen.add(row["domain"])
+            deduped.append(row)
+    return _legacy_rebalance(deduped, tlds, max_count)
+
+
+def _results(slds: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for sld in range(slds):
+        for tld in TLDS:
+            status = rng.choices(["taken", "available", "unknown", "invalid"], weights=[65, 25, 9, 1])[0]
+            rows.append({"domain": f"brandname{sld}{tld}", "status": status, "confidence": rng.choice([0.3, 0.65, 0.8, 0.98]), "method": "rdap"})
+    rng.shuffle(rows)
+    return rows
+
+
+def _best(path, repeat: int) -> tuple[float, list[dict]]:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        rows = path()
+        timings.append(time.process_time() - started)
+    return min(timings), rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = _results(args.slds, args.seed)
+    target = ceil(args.slds * 0.10)
+    model_ranked = [{"domain": row["domain"], "status": row["status"], "confidence": 0.9} for row in results[:3]]
+
+    def legacy() -> list[dict]:
+        seen = {row["domain"] for row in model_ranked}
+        deduped = model_ranked + [row for row in _legacy_fallback_ranked(results, TLDS) if row["domain"] not in seen]
+        return _legacy_rebalance(deduped, TLDS, target)
+
+    legacy_s, legacy_rows = _best(legacy, args.repeat)
+    topk_s, topk_rows = _best(lambda: select_ranked(model_ranked, results, TLDS, target), args.repeat)
+    print(
+        json.dumps(
+            {
+                "results": len(results),
+                "ranked": target,
+                "legacy_cpu_s": round(legacy_s, 4),
+                "topk_cpu_s": round(topk_s, 4),
+                "speedup": round(legacy_s / max(topk_s, 1e-9), 1),
+                "identical": legacy_rows == topk_rows,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""Result boundary: DomainResult list + model_dump vs the columnar ResultTable.
+
+Both paths take the same synthetic results (the run's stream order), sort them by
+(TLD, domain) and render the TS1 JSON text, as the CLI (``--indent 2``) and the daemon
+(compact) do: the legacy path through model_dump and json.dumps, the columnar path
+through ``output_json``. Reports peak traced memory while the results stream in, are held
+and rendered, and CPU time of each path over pre-built results (best of --repeat,
+without tracemalloc).
+
+    uv run python benchmarks/bench_result_table.py --slds 5000 --tlds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from domainscout_check.checker import output_json
+from domainscout_check.models import CheckDomainsOutput, DomainResult
+from domainscout_check.result_table import ResultTable
+from domainscout_check.summary import RunSummary, extract_tld
+
+TLD_NAMES = [".com", ".net", ".org", ".io", ".dev"]
+
+
+def _stream(slds: int, tlds: list[str], seed: int):
+    rng = random.Random(seed)
+    order = [(sld, tld) for sld in range(slds) for tld in tlds]
+    rng.shuffle(order)
+    for sld, tld in order:
+        domain = f"brandname{sld}{tld}"
+        if rng.random() < 0.65:
+            yield DomainResult(domain=domain, status="taken", confidence=0.98, method="rdap", rdap_server=f"https://rdap{tld}/", rdap_http=200)
+        elif rng.random() < 0.9:
+            yield DomainResult(domain=domain, status="available", confidence=0.8, method="rdap", rdap_server=f"https://rdap{tld}/", rdap_http=404)
+        else:
+            yield DomainResult(
+                domain=domain, status="unknown", confidence=0.25, method="rdap+dns", dns_nxdomain=False, dns_ns=False, dns_soa=False, error="timeout"
+            )
+
+
+def _legacy(results, tlds: list[str], indent: int | None) -> int:
+    summary = RunSummary(tlds=tlds, allow_unknown=True)
+    rows = []
+    for result in results:
+        summary.add(result)
+        rows.append(result)
+    rows.sort(key=lambda r: (extract_tld(r.domain), r.domain))
+    output = CheckDomainsOutput(checked_at="", results=rows, suggested_best=summary.suggested_best)
+    return len(json.dumps(output.model_dump(mode="json"), indent=indent))
+
+
+def _columnar(results, tlds: list[str], indent: int | None) -> int:
+    summary = RunSummary(tlds=tlds, allow_unknown=True)
+    table = ResultTable()
+    for result in results:
+        summary.add(result)
+        table.append(result)
+    table.sort_by_tld()
+    return len(output_json(table, summary, indent=indent))
+
+
+def _measure(path, args: argparse.Namespace, tlds: list[str]) -> dict:
+    tracemalloc.start()
+    size = path(_stream(args.slds, tlds, args.seed), tlds, args.indent)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = list(_stream(args.slds, tlds, args.seed))
+    timings = []
+    for _ in range(args.repeat):
+        started = time.process_time()
+        path(results, tlds, args.indent)
+        timings.append(time.process_time() - started)
+    return {"peak_mb": round(peak / 1e6, 2), "cpu_s": round(min(timings), 3), "json_bytes": size}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--tlds", type=int, default=3, help=f"TLD count (max {len(TLD_NAMES)})")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--indent", type=int, default=None, help="Render indented JSON, as the CLI does with 2")
+    args = parser.parse_args()
+    tlds = TLD_NAMES[: args.tlds]
+
+    legacy = _measure(_legacy, args, tlds)
+    columnar = _measure(_columnar, args, tlds)
+    print(
+        json.dumps(
+            {
+                "results": args.slds * len(tlds),
+                "legacy": legacy,
+                "columnar": columnar,
+                "peak_ratio": round(columnar["peak_mb"] / legacy["peak_mb"], 3),
+                "cpu_ratio": round(columnar["cpu_s"] / max(legacy["cpu_s"], 1e-9), 3),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
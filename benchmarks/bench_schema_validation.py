@@ -0,0 +1,86 @@
+"""Harness schema checks: per-call jsonschema.validate vs compiled, cached validators.
+
+Validates the five payloads of one workflow run at --slds SLDs x 3 TLDs (MS1 output,
+TS1 input, TS1 output, MS2 output twice), the way run_workflow does. "legacy" re-reads
+the schema and calls jsonschema.validate each time; "cached" uses validate_payload with
+the harness's trusted arrays. Best of --repeat runs, CPU seconds.
+
+    uv run python benchmarks/bench_schema_validation.py --slds 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import jsonschema
+
+from domainscout.schema_utils import SCHEMAS_DIR, validate_payload
+
+TLDS = [".com", ".net", ".io"]
+
+
+def _payloads(slds: int) -> list[tuple[dict, str, tuple[str, ...]]]:
+    names = [f"brandname{i}" for i in range(slds)]
+    results = [
+        {"domain": f"{sld}{tld}", "status": "taken", "confidence": 0.98, "method": "rdap", "rdap_server": "https://rdap.example/", "rdap_http": 200}
+        for sld in names
+        for tld in TLDS
+    ]
+    ranked = [{"domain": row["domain"], "status": "taken", "confidence": 0.98, "tld_preference_rank": 0} for row in results[: max(1, slds // 10)]]
+    ms2 = {"best_domain": None, "rationale": "none", "ranked": ranked}
+    return [
+        ({"slds": names}, "ms1_generate_slds.schema.json", ()),
+        ({"tlds": TLDS, "slds": names, "options": {"timeout_ms": 2500}}, "ts1_check_domains_in.schema.json", ("slds",)),
+        ({"checked_at": "2026-02-16T14:02:11Z", "results": results, "suggested_best": None}, "ts1_check_domains_out.schema.json", ("results",)),
+        (ms2, "ms2_pick_best.schema.json", ()),
+        (ms2, "ms2_pick_best.schema.json", ()),
+    ]
+
+
+def _legacy(payloads) -> None:
+    for payload, name, _trusted in payloads:
+        jsonschema.validate(payload, json.loads((SCHEMAS_DIR / name).read_text()))
+
+
+def _cached(payloads) -> None:
+    for payload, name, trusted in payloads:
+        validate_payload(payload, name, trusted=trusted)
+
+
+def _best(path, payloads, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        path(payloads)
+        timings.append(time.process_time() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = _payloads(args.slds)
+    legacy = _best(_legacy, payloads, args.repeat)
+    cached = _best(_cached, payloads, args.repeat)
+    print(
+        json.dumps(
+            {
+                "slds": args.slds,
+                "results": args.slds * len(TLDS),
+                "legacy_cpu_s": round(legacy, 4),
+                "cached_cpu_s": round(cached, 4),
+                "speedup": round(legacy / max(cached, 1e-9), 1),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Sharded checking: lookups per second with 1..N checker processes.
+
+Each TLD's stand-in RDAP server runs in its own process (so the servers do not
+compete with the checker for one core), answers after --delay-ms, and the checker
+runs the same SLD list with options.shards = 1, 2, ... --max-shards. Per-server rate
+limits are off here; with them on, shards split each server's budget and throughput
+is capped by the servers, not the checker.
+
+    uv run python benchmarks/bench_sharding.py --slds 3000 --tlds 3 --max-shards 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from domainscout_check.checker import iter_check_domains
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.summary import RunSummary
+
+from standins import StandinRDAPServer, fixed_latency
+
+
+TLD_NAMES = ["com", "net", "org"]
+
+
+def _serve(tld: str, slds: int, delay_ms: float, ready, stop) -> None:
+    async def serve() -> None:
+        registered = {f"name{idx}.{tld}" for idx in range(0, slds, 4)}
+        async with StandinRDAPServer(registered=registered, latency=fixed_latency(delay_ms / 1000)) as server:
+            ready.put(server.base_url)
+            while not stop.is_set():
+                await asyncio.sleep(0.1)
+
+    asyncio.run(serve())
+
+
+async def _run(args: argparse.Namespace, tlds: list[str], shards: int, cache_dir: Path) -> dict:
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [f".{tld}" for tld in tlds],
+            "slds": [f"name{idx}" for idx in range(args.slds)],
+            "options": {
+                "shards": shards,
+                "max_concurrency": args.concurrency,
+                "cache_mode": "bypass",
+                "enable_dns_fallback": False,
+                "bootstrap_cache_path": str(cache_dir / "rdap_dns.json"),
+            },
+        }
+    )
+    summary = RunSummary(tlds=payload.tlds, allow_unknown=False)
+    started = time.perf_counter()
+    count = 0
+    async for _result in iter_check_domains(payload, summary):
+        count += 1
+    elapsed = time.perf_counter() - started
+    return {"wall_s": round(elapsed, 3), "lookups_per_s": round(count / elapsed, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=3000)
+    parser.add_argument("--tlds", type=int, default=3, choices=range(1, len(TLD_NAMES) + 1))
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-shards", type=int, default=4)
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="Stand-in reply delay per request")
+    args = parser.parse_args()
+
+    tlds = TLD_NAMES[: args.tlds]
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Queue(), ctx.Event()
+    servers = [ctx.Process(target=_serve, args=(tld, args.slds, args.delay_ms, ready, stop)) for tld in tlds]
+    for process in servers:
+        process.start()
+    # Queue order is start-up order, not TLD order; each server answers any TLD.
+    mapping = {tld: ready.get(timeout=30) for tld in tlds}
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return mapping
+
+    report: dict = {"lookups": args.slds * len(tlds), "servers": len(tlds), "reply_delay_ms": args.delay_ms}
+    try:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch(
+            "domainscout_check.checker.load_bootstrap_map", fake_bootstrap
+        ), mock.patch("domainscout_check.sharding.load_bootstrap_map", fake_bootstrap):
+            for shards in range(1, args.max_shards + 1):
+                report[f"shards_{shards}"] = asyncio.run(_run(args, tlds, shards, Path(tmp)))
+    finally:
+        stop.set()
+        for process in servers:
+            process.join(timeout=5)
+    base = report["shards_1"]["lookups_per_s"]
+    report["speedup"] = round(report[f"shards_{args.max_shards}"]["lookups_per_s"] / base, 2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""Simulated backend: scheduler load test with no network.
+
+Runs --slds x --tlds lookups through the ``simulated`` lookup backend (log-normal
+latency, optional error/timeout rates and a throughput cap) and reports lookups per
+second, how the verdicts split, and what the scheduler did: requests, retries and
+Retry-After pauses per lane. Use it to compare concurrency, rate-limit or retry changes
+at volumes no stand-in server setup reaches. ``iter_lookups`` is driven directly, so
+the SLD list is not held to the 5000-per-request input limit.
+
+    uv run python benchmarks/bench_simulated.py --slds 400000 --tlds 3
+    uv run python benchmarks/bench_simulated.py --slds 50000 --error-rate 0.02 --max-lps 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from domainscout_check.checker import iter_lookups
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.summary import RunSummary
+
+
+TLD_NAMES = ["com", "net", "org", "io", "dev", "app"]
+
+
+async def _run(args: argparse.Namespace, workdir: Path) -> dict:
+    tlds = [f".{tld}" for tld in TLD_NAMES[: args.tlds]]
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": tlds,
+            "slds": ["name0"],
+            "options": {
+                "max_concurrency": args.concurrency,
+                "batch_size": 1000,
+                "timeout_ms": args.timeout_ms,
+                "cache_mode": "bypass",
+                "coalesce_inflight": False,
+                "lookup_backends": ["simulated"],
+                "simulated": {
+                    "latency_ms_median": args.median_ms,
+                    "latency_ms_p99": args.p99_ms,
+                    "error_rate": args.error_rate,
+                    "timeout_rate": args.timeout_rate,
+                    "max_lookups_per_second": args.max_lps,
+                },
+                "bootstrap_cache_path": str(workdir / "rdap_dns.json"),
+            },
+        }
+    )
+    summary = RunSummary(tlds=tlds, allow_unknown=False)
+    statuses: Counter[str] = Counter()
+    started = time.perf_counter()
+    slds = [f"name{idx}" for idx in range(args.slds)]
+    async for result in iter_lookups(payload, slds, tlds, (), summary):
+        statuses[result.status] += 1
+    elapsed = time.perf_counter() - started
+    lookups = sum(statuses.values())
+    return {
+        "lookups": lookups,
+        "wall_s": round(elapsed, 2),
+        "lookups_per_s": round(lookups / elapsed),
+        "statuses": dict(statuses),
+        "retries": summary.retries,
+        "lanes": summary.rdap_servers,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slds", type=int, default=100_000)
+    parser.add_argument("--tlds", type=int, default=3, choices=range(1, len(TLD_NAMES) + 1))
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--timeout-ms", type=int, default=2000)
+    parser.add_argument("--median-ms", type=float, default=40.0)
+    parser.add_argument("--p99-ms", type=float, default=400.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--max-lps", type=float, default=None, help="Simulated registry throughput cap")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = asyncio.run(_run(args, Path(tmp)))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""Zone-file index: build time, on-disk size, lookup throughput and diff apply time.
+
+Generates a synthetic TLD zone (NS pairs plus some glue, like a CZDS file), builds
+the sorted mmap index, probes it with a 65% present / 35% absent candidate mix and
+applies a daily diff touching --diff-fraction of the names.
+
+    uv run python benchmarks/bench_zone_index.py --names 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from domainscout_check.zone_index import ZoneIndex, apply_zone_diff, build_zone_index
+
+
+def _label(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(4, 16)))
+
+
+def _write_zone(path: Path, names: list[str]) -> None:
+    with path.open("w", encoding="ascii") as fh:
+        fh.write("$ORIGIN com.\n@ 900 IN SOA a.gtld-servers.net. nstld.verisign-grs.com. 1700000000 1800 900 604800 86400\n")
+        for idx, name in enumerate(names):
+            fh.write(f"{name}.com. 172800 IN NS ns1.{name}.com.\n{name}.com. 172800 IN NS ns2.{name}.com.\n")
+            if idx % 10 == 0:
+                fh.write(f"ns1.{name}.com. 172800 IN A 192.0.2.1\n")
+
+
+def _bench(args: argparse.Namespace, workdir: Path) -> dict:
+    rng = random.Random(args.seed)
+    names = list({_label(rng) for _ in range(args.names)})
+    zone_path = workdir / "com.zone"
+    _write_zone(zone_path, names)
+    index_path = workdir / "com.zidx"
+
+    started = time.perf_counter()
+    header = build_zone_index(zone_path, "com", index_path)
+    build_s = time.perf_counter() - started
+
+    present = rng.sample(names, k=int(args.lookups * 0.65))
+    probes = present + [f"{_label(rng)}zz" for _ in range(args.lookups - len(present))]
+    rng.shuffle(probes)
+    with ZoneIndex(index_path) as index:
+        started = time.perf_counter()
+        hits = sum(1 for label in probes if label in index)
+        lookup_s = time.perf_counter() - started
+
+    changed = int(len(names) * args.diff_fraction)
+    removed = rng.sample(names, k=changed)
+    added = [f"{_label(rng)}new" for _ in range(changed)]
+    started = time.perf_counter()
+    apply_zone_diff(index_path, added, removed)
+    diff_s = time.perf_counter() - started
+
+    return {
+        "names": header["count"],
+        "zone_mb": round(zone_path.stat().st_size / 1e6, 1),
+        "index_mb": round(index_path.stat().st_size / 1e6, 1),
+        "build_s": round(build_s, 3),
+        "lookups": len(probes),
+        "hit_rate": round(hits / len(probes), 3),
+        "lookups_per_s": round(len(probes) / lookup_s),
+        "diff_names": 2 * changed,
+        "diff_apply_s": round(diff_s, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--diff-fraction", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(_bench(args, Path(tmp)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
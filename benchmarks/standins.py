@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import math
+import random
+import ssl
+import subprocess
+from collections import Counter
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable, Iterable
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+from domainscout_check.dns_engine import enlarge_receive_buffer
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def fixed_latency(seconds: float) -> LatencySampler:
+    return lambda _rng: seconds
+
+
+def lognormal_latency(median_s: float, sigma: float, cap_s: float | None = None) -> LatencySampler:
+    mu = math.log(median_s)
+
+    def sample(rng: random.Random) -> float:
+        value = rng.lognormvariate(mu, sigma)
+        return min(value, cap_s) if cap_s is not None else value
+
+    return sample
+
+
+class _DNSServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: StandinDNSServer) -> None:
+        self.server = server
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+        enlarge_receive_buffer(transport)
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        self.server.received += 1
+        if self.server.drop_rate and self.server.rng.random() < self.server.drop_rate:
+            return
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+        wire = self.server.answer(query).to_wire()
+        delay = self.server.latency(self.server.rng)
+        loop = asyncio.get_running_loop()
+        if delay > 0:
+            loop.call_later(delay, self._send, wire, addr)
+        else:
+            self._send(wire, addr)
+
+    def _send(self, wire: bytes, addr: tuple) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(wire, addr)
+
+
+class StandinDNSServer:
+    """UDP DNS responder for tests and benchmarks.
+
+    Names in ``registered`` answer NS and SOA; everything else is NXDOMAIN.
+    """
+
+    def __init__(
+        self,
+        registered: Iterable[str] = (),
+        latency: LatencySampler = fixed_latency(0.0),
+        drop_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.registered = {name.lower().rstrip(".") for name in registered}
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.host = host
+        self.port = 0
+        self.received = 0
+        self._transport: asyncio.DatagramTransport | None = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        name = question.name.to_text(omit_final_dot=True).lower()
+        if name not in self.registered:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            return response
+        if question.rdtype == dns.rdatatype.NS:
+            response.answer.append(dns.rrset.from_text(question.name, 300, "IN", "NS", f"ns1.{name}."))
+        elif question.rdtype == dns.rdatatype.SOA:
+            response.answer.append(
+                dns.rrset.from_text(question.name, 300, "IN", "SOA", f"ns1.{name}. admin.{name}. 1 7200 900 1209600 300")
+            )
+        return response
+
+    async def start(self) -> StandinDNSServer:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DNSServerProtocol(self),
+            local_addr=(self.host, 0),
+        )
+        self._transport = transport
+        self.port = transport.get_extra_info("sockname")[1]
+        return self
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def __aenter__(self) -> StandinDNSServer:
+        return await self.start()
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.close()
+
+
+def _rdap_route(method: str, path: str, registered: set[str]) -> tuple[int, bytes]:
+    if path.startswith("/domain/"):
+        name = path[len("/domain/") :].lower().rstrip(".")
+        if name in registered:
+            body = json.dumps({"objectClassName": "domain", "ldhName": name})
+            return 200, body.encode()
+        return 404, b'{"errorCode": 404}'
+    if path == "/help":
+        return 200, b'{"rdapConformance": ["rdap_level_0"]}'
+    return 400, b'{"errorCode": 400}'
+
+
+class StandinRDAPServer:
+    """RDAP responder speaking HTTP/1.1, and HTTP/2 when TLS negotiates ``h2`` via ALPN.
+
+    ``handshake_latency`` is charged once per new connection, like a TCP+TLS setup
+    on a real network path; ``latency`` is charged per request. ``throttle_rate``
+    answers 429 with ``Retry-After: retry_after``, ``error_rate`` answers 503 without
+    one, and ``hang_rate`` holds the request for ``hang_seconds`` so the client times
+    out. Connections beyond ``max_connections`` are closed on accept.
+    """
+
+    def __init__(
+        self,
+        registered: Iterable[str] = (),
+        latency: LatencySampler = fixed_latency(0.0),
+        handshake_latency: float = 0.0,
+        ssl_context: ssl.SSLContext | None = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 30.0,
+        max_connections: int | None = None,
+    ) -> None:
+        self.registered = {name.lower().rstrip(".") for name in registered}
+        self.latency = latency
+        self.handshake_latency = handshake_latency
+        self.ssl_context = ssl_context
+        self.rng = random.Random(seed)
+        self.host = host
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.max_connections = max_connections
+        self.port = 0
+        self.connections = 0
+        self.refused = 0
+        self.requests = 0
+        self.statuses: Counter[int] = Counter()
+        self._server: asyncio.base_events.Server | None = None
+        self._handlers: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._closing = asyncio.Event()
+
+    @property
+    def base_url(self) -> str:
+        scheme = "https" if self.ssl_context is not None else "http"
+        return f"{scheme}://{self.host}:{self.port}"
+
+    async def start(self) -> StandinRDAPServer:
+        self._closing.clear()
+        self._server = await asyncio.start_server(self._accept, host=self.host, port=0, ssl=self.ssl_context)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._handlers.items())
+            self._closing.set()
+            for _task, writer in handlers:
+                writer.close()
+            await asyncio.gather(*(task for task, _writer in handlers), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> StandinRDAPServer:
+        return await self.start()
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.close()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.max_connections is not None and len(self._handlers) >= self.max_connections:
+            self.refused += 1
+            writer.close()
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self._handlers[task] = writer
+        self.connections += 1
+        try:
+            if self.handshake_latency:
+                await asyncio.sleep(self.handshake_latency)
+            ssl_object = writer.get_extra_info("ssl_object")
+            if ssl_object is not None and ssl_object.selected_alpn_protocol() == "h2":
+                await self._serve_http2(reader, writer)
+            else:
+                await self._serve_http11(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+            pass
+        finally:
+            if task is not None:
+                self._handlers.pop(task, None)
+            writer.close()
+
+    async def _respond(self, method: str, path: str) -> tuple[int, bytes, list[tuple[str, str]]]:
+        self.requests += 1
+        delay = self.latency(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        headers: list[tuple[str, str]] = []
+        roll = self.rng.random() if path.startswith("/domain/") else 1.0
+        if roll < self.hang_rate:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._closing.wait(), self.hang_seconds)
+            status, body = _rdap_route(method, path, self.registered)
+        elif roll < self.hang_rate + self.throttle_rate:
+            status, body = 429, b'{"errorCode": 429}'
+            headers.append(("retry-after", str(self.retry_after)))
+        elif roll < self.hang_rate + self.throttle_rate + self.error_rate:
+            status, body = 503, b'{"errorCode": 503}'
+        else:
+            status, body = _rdap_route(method, path, self.registered)
+        self.statuses[status] += 1
+        return status, b"" if method == "HEAD" else body, headers
+
+    async def _serve_http11(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while request_line := await reader.readline():
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            length = 0
+            while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            if length:
+                await reader.readexactly(length)
+            status, body, headers = await self._respond(method, path)
+            extra = "".join(f"{name}: {value}\r\n" for name, value in headers)
+            writer.write(
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                "Content-Type: application/rdap+json\r\n"
+                f"{extra}Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+
+    async def _serve_http2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        streams: set[asyncio.Task] = set()
+
+        async def answer(stream_id: int, method: str, path: str) -> None:
+            status, body, extra = await self._respond(method, path)
+            headers = [(":status", str(status)), ("content-type", "application/rdap+json"), ("content-length", str(len(body))), *extra]
+            conn.send_headers(stream_id, headers, end_stream=not body)
+            if body:
+                conn.send_data(stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+        try:
+            while data := await reader.read(65535):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = dict(event.headers)
+                        task = asyncio.create_task(answer(event.stream_id, headers[":method"], headers[":path"]))
+                        streams.add(task)
+                        task.add_done_callback(streams.discard)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        finally:
+            for task in list(streams):
+                task.cancel()
+
+
+def self_signed_tls(directory: Path, host: str = "127.0.0.1") -> tuple[ssl.SSLContext, Path]:
+    """Server context (ALPN h2, http/1.1) and CA file for a throwaway localhost certificate.
+
+    Uses the ``openssl`` CLI so the stand-ins need no extra Python dependencies.
+    """
+    cert, key = directory / "standin-cert.pem", directory / "standin-key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", str(key), "-out", str(cert), "-subj", f"/CN={host}",
+            "-addext", f"subjectAltName=IP:{host}",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    return context, cert
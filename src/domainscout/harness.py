@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from math import ceil
 from typing import Protocol
 
-from domainscout_check.checker import check_domains
+from domainscout_check.checker import check_domains_table, output_document
 from domainscout_check.models import CheckDomainsInput
 
+from .ms2_payload import CANDIDATES_PER_RANKED_SLOT, compact_request, payload_bytes
+from .naming_score import prune_lowest
+from .ranking import select_ranked
 from .schema_utils import validate_payload
 
 MIN_CANDIDATE_COUNT = 1
@@ -41,6 +45,34 @@ class HarnessOptions:
     rdap_fallback_base: str | None = None
     deterministic_mode: bool = False
     deterministic_seed: int = 17
+    find_best_fast: bool = False
+    find_best_target: int = 1
+    rdap_server_concurrency: int | None = None
+    rdap_rate_limit_per_server: float | None = None
+    rdap_rate_burst: int = 5
+    rdap_retry_after_max_seconds: float = 30.0
+    rdap_breaker_threshold: int = 5
+    rdap_breaker_cooldown_seconds: float = 30.0
+    rdap_retry_budget_percent: float = 20.0
+    rdap_hedging: bool = False
+    rdap_hedge_percentile: float = 95.0
+    rdap_hedge_budget_percent: float = 5.0
+    http2: bool = True
+    prewarm_connections: bool = True
+    dns_engine: str = "async"
+    dns_nameservers: list[str] | None = None
+    coalesce_inflight: bool = True
+    cache_mode: str | None = None
+    cache_path: str | None = None
+    cache_ttl_taken_seconds: int = 259200
+    cache_ttl_available_seconds: int = 14400
+    zone_index_dir: str | None = None
+    shards: int = 1
+    lookup_backends: list[str] | None = None
+    simulated: dict | None = None
+    precheck_prune_percent: float = 0.0
+    ms2_compact: bool = False
+    ms2_candidate_limit: int | None = None
 
 
 @dataclass(frozen=True)
@@ -49,6 +81,9 @@ class WorkflowResult:
     ts1_input: dict
     ts1_output: dict
     ms2_output: dict
+    validation_ms: dict[str, float] = field(default_factory=dict)
+    precheck: dict | None = None
+    ms2_payload: dict | None = None
 
 
 class ModelBridge(Protocol):
@@ -65,13 +100,6 @@ def _normalize_candidate_count(candidate_count: int) -> int:
     return candidate_count
 
 
-def _extract_tld(domain: str) -> str:
-    parts = domain.rsplit(".", maxsplit=1)
-    if len(parts) != 2:
-        return ""
-    return f".{parts[1].lower()}"
-
-
 def _append_note(ms1_output: dict, note_suffix: str) -> dict:
     normalized = dict(ms1_output)
     note_prefix = normalized.get("notes", "").strip()
@@ -109,119 +137,22 @@ def _pad_slds_to_candidate_count(slds: list[str], theme: str, candidate_count: i
     return padded
 
 
-def _build_ms2_fallback_ranked(results: list[dict], tlds: list[str]) -> list[dict]:
-    tld_order = {tld.lower(): idx for idx, tld in enumerate(tlds)}
-    status_order = {"available": 0, "unknown": 1, "taken": 2, "invalid": 3}
-
-    def sort_key(row: dict) -> tuple[int, int, float, int, str]:
-        domain = row["domain"]
-        tld = _extract_tld(domain)
-        return (
-            status_order.get(row["status"], 99),
-            tld_order.get(tld, len(tlds) + 1),
-            -float(row["confidence"]),
-            len(domain),
-            domain,
-        )
-
-    ranked: list[dict] = []
-    for row in sorted(results, key=sort_key):
-        tld = _extract_tld(row["domain"])
-        ranked.append(
-            {
-                "domain": row["domain"],
-                "status": row["status"],
-                "confidence": row["confidence"],
-                "tld_preference_rank": tld_order.get(tld, len(tlds)),
-                "summary": "autofilled_from_ts1_fallback",
-            }
-        )
-    return ranked
-
-
-def _rebalance_ranked_for_tld_coverage(ranked: list[dict], tlds: list[str], max_count: int) -> list[dict]:
-    if max_count <= 0:
-        return []
-    if not ranked:
-        return []
-    if not tlds:
-        return ranked[:max_count]
-
-    requested_tlds: list[str] = []
-    seen_tlds: set[str] = set()
-    for tld in tlds:
-        normalized = tld.lower()
-        if normalized in seen_tlds:
-            continue
-        requested_tlds.append(normalized)
-        seen_tlds.add(normalized)
-
-    buckets: dict[str, list[dict]] = {tld: [] for tld in requested_tlds}
-    for row in ranked:
-        bucket_tld = _extract_tld(row["domain"])
-        if bucket_tld in buckets:
-            buckets[bucket_tld].append(row)
-
-    selected: list[dict] = []
-    seen_domains: set[str] = set()
-    progress = True
-    while len(selected) < max_count and progress:
-        progress = False
-        for tld in requested_tlds:
-            bucket = buckets[tld]
-            if not bucket:
-                continue
-            row = bucket.pop(0)
-            domain = row["domain"]
-            if domain in seen_domains:
-                continue
-            selected.append(row)
-            seen_domains.add(domain)
-            progress = True
-            if len(selected) >= max_count:
-                break
-
-    if len(selected) < max_count:
-        for row in ranked:
-            domain = row["domain"]
-            if domain in seen_domains:
-                continue
-            selected.append(row)
-            seen_domains.add(domain)
-            if len(selected) >= max_count:
-                break
-
-    return selected[:max_count]
-
-
 def _normalize_ranked_output(ms2_output: dict, ts1_results: list[dict], tlds: list[str], target_count: int) -> dict:
     if target_count <= 0:
         return ms2_output
 
     max_count = min(target_count, len(ts1_results))
-    ranked = ms2_output.get("ranked", [])
-    deduped_ranked: list[dict] = []
-    seen_domains: set[str] = set()
-    for row in ranked:
-        domain = row["domain"]
-        if domain in seen_domains:
-            continue
-        seen_domains.add(domain)
-        deduped_ranked.append(row)
-
-    for row in _build_ms2_fallback_ranked(ts1_results, tlds):
-        domain = row["domain"]
-        if domain in seen_domains:
-            continue
-        deduped_ranked.append(row)
-        seen_domains.add(domain)
-
     normalized = dict(ms2_output)
-    normalized["ranked"] = _rebalance_ranked_for_tld_coverage(deduped_ranked, tlds, max_count)
+    normalized["ranked"] = select_ranked(ms2_output.get("ranked", []), ts1_results, tlds, max_count)
     return normalized
 
 
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
 def run_workflow(user_input: UserInput, model_bridge: ModelBridge, options: HarnessOptions) -> WorkflowResult:
+    validation_ms: dict[str, float] = {}
     candidate_count = _normalize_candidate_count(user_input.candidate_count)
     ranked_target_count = max(1, ceil(candidate_count * DEFAULT_MS2_RANKED_RATIO))
     ms1_request = {
@@ -235,7 +166,7 @@ def run_workflow(user_input: UserInput, model_bridge: ModelBridge, options: Harn
     }
 
     ms1_output = model_bridge.generate_slds(ms1_request)
-    validate_payload(ms1_output, "ms1_generate_slds.schema.json")
+    validation_ms["ms1_output"] = _ms(validate_payload(ms1_output, "ms1_generate_slds.schema.json"))
     slds = ms1_output["slds"][:candidate_count]
     if len(slds) < len(ms1_output["slds"]):
         ms1_output = dict(ms1_output)
@@ -247,6 +178,17 @@ def run_workflow(user_input: UserInput, model_bridge: ModelBridge, options: Harn
         ms1_output["slds"] = slds
         ms1_output = _append_note(ms1_output, f"padded_to_candidate_count={candidate_count}")
 
+    precheck = None
+    if options.precheck_prune_percent > 0:
+        started = time.perf_counter()
+        slds, pruned = prune_lowest(slds, options.precheck_prune_percent)
+        precheck = {
+            "scored": len(slds) + len(pruned),
+            "pruned": len(pruned),
+            "lookups_saved": len(pruned) * len(user_input.tlds),
+            "score_ms": _ms(time.perf_counter() - started),
+        }
+
     ts1_input = {
         "tlds": user_input.tlds,
         "slds": slds,
@@ -262,13 +204,44 @@ def run_workflow(user_input: UserInput, model_bridge: ModelBridge, options: Harn
             "rdap_fallback_base": options.rdap_fallback_base,
             "deterministic_mode": options.deterministic_mode,
             "deterministic_seed": options.deterministic_seed,
+            "find_best_fast": options.find_best_fast,
+            "find_best_target": options.find_best_target,
+            "rdap_server_concurrency": options.rdap_server_concurrency,
+            "rdap_rate_limit_per_server": options.rdap_rate_limit_per_server,
+            "rdap_rate_burst": options.rdap_rate_burst,
+            "rdap_retry_after_max_seconds": options.rdap_retry_after_max_seconds,
+            "rdap_breaker_threshold": options.rdap_breaker_threshold,
+            "rdap_breaker_cooldown_seconds": options.rdap_breaker_cooldown_seconds,
+            "rdap_retry_budget_percent": options.rdap_retry_budget_percent,
+            "rdap_hedging": options.rdap_hedging,
+            "rdap_hedge_percentile": options.rdap_hedge_percentile,
+            "rdap_hedge_budget_percent": options.rdap_hedge_budget_percent,
+            "http2": options.http2,
+            "prewarm_connections": options.prewarm_connections,
+            "dns_engine": options.dns_engine,
+            "dns_nameservers": options.dns_nameservers,
+            "coalesce_inflight": options.coalesce_inflight,
+            "cache_path": options.cache_path,
+            "cache_ttl_taken_seconds": options.cache_ttl_taken_seconds,
+            "cache_ttl_available_seconds": options.cache_ttl_available_seconds,
+            "zone_index_dir": options.zone_index_dir,
+            "shards": options.shards,
+            "lookup_backends": options.lookup_backends,
         },
     }
-    validate_payload(ts1_input, "ts1_check_domains_in.schema.json")
-
-    ts1_output_model = asyncio.run(check_domains(CheckDomainsInput.model_validate(ts1_input)))
-    ts1_output = ts1_output_model.model_dump(mode="json")
-    validate_payload(ts1_output, "ts1_check_domains_out.schema.json")
+    # Left out when unset so TS1's own default (and its environment override) applies.
+    if options.cache_mode is not None:
+        ts1_input["options"]["cache_mode"] = options.cache_mode
+    if options.simulated is not None:
+        ts1_input["options"]["simulated"] = options.simulated
+    # The SLDs are MS1's (already validated) plus SLD_RE-checked unique padding.
+    validation_ms["ts1_input"] = _ms(validate_payload(ts1_input, "ts1_check_domains_in.schema.json", trusted=("slds",)))
+
+    ts1_table, ts1_summary = asyncio.run(check_domains_table(CheckDomainsInput.model_validate(ts1_input)))
+    ts1_output = output_document(ts1_table, ts1_summary)
+    # Every row passed ResultTable.append, which enforces the row schema (backends build rows
+    # with model_construct, so the DomainResult model alone does not), and the table renders them.
+    validation_ms["ts1_output"] = _ms(validate_payload(ts1_output, "ts1_check_domains_out.schema.json", trusted=("results",)))
 
     ms2_request = {
         "theme": user_input.theme,
@@ -284,19 +257,40 @@ def run_workflow(user_input: UserInput, model_bridge: ModelBridge, options: Harn
             "Include approximately ranked_target_count items in ranked."
         ),
     }
+    ms2_payload = None
+    if options.ms2_compact:
+        limit = options.ms2_candidate_limit or ranked_target_count * CANDIDATES_PER_RANKED_SLOT
+        full_bytes = payload_bytes(ms2_request)
+        base = {key: value for key, value in ms2_request.items() if key != "results"}
+        base["instructions"] = (
+            "Return only structured JSON payload matching ms2_pick_best schema. "
+            "Include approximately ranked_target_count items in ranked, chosen from candidates "
+            "(column-wise: row i is candidates[column][i]); counts holds per-TLD status totals."
+        )
+        ms2_request = compact_request(base, ts1_output["results"], user_input.tlds, limit)
+        compact_bytes = payload_bytes(ms2_request)
+        ms2_payload = {
+            "mode": "compact",
+            "full_bytes": full_bytes,
+            "bytes": compact_bytes,
+            "reduction": round(1 - compact_bytes / full_bytes, 4),
+        }
     ms2_output = model_bridge.pick_best(ms2_request)
-    validate_payload(ms2_output, "ms2_pick_best.schema.json")
+    validation_ms["ms2_output"] = _ms(validate_payload(ms2_output, "ms2_pick_best.schema.json"))
     ms2_output = _normalize_ranked_output(
         ms2_output=ms2_output,
         ts1_results=ts1_output["results"],
         tlds=user_input.tlds,
         target_count=ranked_target_count,
     )
-    validate_payload(ms2_output, "ms2_pick_best.schema.json")
+    validation_ms["ms2_ranked"] = _ms(validate_payload(ms2_output, "ms2_pick_best.schema.json"))
 
     return WorkflowResult(
         ms1_output=ms1_output,
         ts1_input=ts1_input,
         ts1_output=ts1_output,
         ms2_output=ms2_output,
+        validation_ms=validation_ms,
+        precheck=precheck,
+        ms2_payload=ms2_payload,
     )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+
+from .ranking import STATUS_ORDER, extract_tld, select_ranked
+
+CANDIDATE_STATUSES = ("available", "unknown")
+CANDIDATE_COLUMNS = ("domain", "status", "confidence", "tld_preference_rank")
+# Candidates sent per ranked slot, so MS2 still has a real choice to make.
+CANDIDATES_PER_RANKED_SLOT = 3
+
+
+def status_counts(results: list[dict], tlds: list[str]) -> dict[str, dict[str, int]]:
+    """Result counts per TLD and status; requested TLDs come first, in preference order."""
+    counts: dict[str, dict[str, int]] = {tld.lower(): dict.fromkeys(STATUS_ORDER, 0) for tld in tlds}
+    for row in results:
+        tld = extract_tld(row["domain"])
+        by_status = counts.get(tld) or counts.setdefault(tld, dict.fromkeys(STATUS_ORDER, 0))
+        by_status[row["status"]] = by_status.get(row["status"], 0) + 1
+    return counts
+
+
+def candidate_columns(results: list[dict], tlds: list[str], limit: int) -> dict[str, list]:
+    """Top ``limit`` available/unknown results, column-wise, with only the fields MS2 ranks on.
+
+    Rows are picked in the harness's own fallback order (``ranking.select_ranked``):
+    dealt across the requested TLDs, then status, confidence and local naming score.
+    """
+    eligible = [row for row in results if row["status"] in CANDIDATE_STATUSES]
+    rows = select_ranked([], eligible, tlds, limit)
+    return {column: [row[column] for row in rows] for column in CANDIDATE_COLUMNS}
+
+
+def compact_request(base: dict, results: list[dict], tlds: list[str], limit: int) -> dict:
+    """``base`` (the MS2 request without ``results``) plus aggregates and top candidates."""
+    candidates = candidate_columns(results, tlds, limit)
+    return {
+        **base,
+        "counts": status_counts(results, tlds),
+        "candidates": candidates,
+        "candidates_omitted": sum(row["status"] in CANDIDATE_STATUSES for row in results) - len(candidates["domain"]),
+    }
+
+
+def payload_bytes(payload: dict) -> int:
+    return len(json.dumps(payload, separators=(",", ":")).encode())
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import re
+import string
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Sequence
+
+# Weights from the naming guide's scorecard (references/domain_naming_guide.md, section 8).
+# Brand fit needs the positioning brief, so it is left to MS2; the remaining 80% is
+# renormalized over what can be read off the string itself.
+WEIGHTS = {
+    "memorability": 0.25,
+    "clarity": 0.20,
+    "distinctiveness": 0.20,
+    "pronounceability": 0.10,
+    "channel_consistency": 0.05,
+}
+_TOTAL_WEIGHT = sum(WEIGHTS.values())
+
+_CLASSES = str.maketrans(
+    {
+        **{ch: "v" for ch in "aeiouy"},
+        **{ch: "c" for ch in string.ascii_lowercase if ch not in "aeiouy"},
+        **{ch: "d" for ch in string.digits},
+        "-": "h",
+    }
+)
+_CONSONANT_RUNS = re.compile(r"c{4,}")
+_TRIPLE_LETTER = re.compile(r"(.)\1\1")
+# Chunks that read as another letter in lowercase or a logo lockup: rn/m, vv/w, ii/u, l1, 0o.
+_AMBIGUOUS_CHUNKS = re.compile(r"rn|vv|ii|l1|1l|0o|o0")
+# Names built only from generic filler words (plus an optional number): nothing to own.
+_GENERIC_FILLER = re.compile(
+    r"^(?:the|my|get|go|best|top|new|pro|brand|name|names|domain|site|web|online|app|apps|shop|store|hq|hub|theme|co)+\d*$",
+    re.MULTILINE,
+)
+_HANDLE_MAX = 15
+
+
+def _length_score(length: int) -> float:
+    if 4 <= length <= 10:
+        return 1.0
+    if length < 4:
+        return 0.8
+    return max(0.0, 1.0 - (length - 10) / 10)
+
+
+_LENGTH_SCORES = [_length_score(length) for length in range(64)]
+
+
+def _hits_per_row(pattern: re.Pattern[str], blob: str, starts: list[int]) -> list[int]:
+    """Matches of ``pattern`` in a newline-joined blob, counted per row."""
+    hits = [0] * len(starts)
+    for match in pattern.finditer(blob):
+        hits[bisect_right(starts, match.start()) - 1] += 1
+    return hits
+
+
+def score_slds(slds: Sequence[str]) -> list[float]:
+    """Brand-quality score in [0, 1] for each SLD, from the string alone.
+
+    Memorability is length, discounted for hard-to-say names; clarity penalizes hyphens
+    and digits (a trailing number, as in padded ``theme123`` filler, counts extra);
+    distinctiveness penalizes tripled letters, look-alike chunks, a trailing number (a
+    numbered copy of a name) and names made only of generic words (``mysite``,
+    ``bestapp``); pronounceability is vowel balance and long consonant clusters; channel
+    consistency is whether the name works as a social handle.
+
+    The batch is scored column-wise: one ``translate`` and one scan per pattern over all
+    SLDs joined by newlines, then a single pass combining plain per-row counts.
+    """
+    if not slds:
+        return []
+    starts = list(accumulate((len(sld) + 1 for sld in slds[:-1]), initial=0))
+    blob = "\n".join(slds)
+    class_blob = blob.translate(_CLASSES)
+    clusters = _hits_per_row(_CONSONANT_RUNS, class_blob, starts)
+    tripled = _hits_per_row(_TRIPLE_LETTER, blob, starts)
+    look_alike = _hits_per_row(_AMBIGUOUS_CHUNKS, blob, starts)
+    generic = _hits_per_row(_GENERIC_FILLER, blob, starts)
+
+    length_scores = _LENGTH_SCORES
+    w_mem = WEIGHTS["memorability"] / _TOTAL_WEIGHT
+    w_clar = WEIGHTS["clarity"] / _TOTAL_WEIGHT
+    w_dist = WEIGHTS["distinctiveness"] / _TOTAL_WEIGHT
+    w_pron = WEIGHTS["pronounceability"] / _TOTAL_WEIGHT
+    w_chan = WEIGHTS["channel_consistency"] / _TOTAL_WEIGHT
+    scores: list[float] = []
+    append = scores.append
+    for classes, n_clusters, n_tripled, n_look_alike, n_generic in zip(
+        class_blob.split("\n"), clusters, tripled, look_alike, generic
+    ):
+        length = len(classes)
+        hyphens = classes.count("h")
+        digits = classes.count("d")
+        letters = length - hyphens - digits
+        pron = 0.0
+        if letters:
+            off_balance = abs(classes.count("v") / letters - 0.45) / 0.45
+            pron = (1.0 - off_balance if off_balance < 1.0 else 0.0) - 0.25 * n_clusters
+            pron = pron if pron > 0.0 else 0.0
+        numbered = classes.endswith("d")
+        clarity = 1.0 - 0.35 * hyphens - 0.15 * digits - (0.2 if numbered else 0.0)
+        distinct = 1.0 - 0.3 * n_look_alike - 0.4 * n_tripled - (0.5 if numbered else 0.0) - 0.6 * n_generic
+
+        score = (
+            w_mem * length_scores[length if length < 64 else 63] * (0.5 + 0.5 * pron)
+            + (w_clar * clarity if clarity > 0.0 else 0.0)
+            + (w_dist * distinct if distinct > 0.0 else 0.0)
+            + w_pron * pron
+            + (w_chan if not hyphens and length <= _HANDLE_MAX else 0.0)
+        )
+        append(round(score, 4))
+    return scores
+
+
+def score_domains(domains: Iterable[str]) -> list[float]:
+    """``score_slds`` over the SLD part of each domain.
+
+    A TS1 run checks every SLD in up to three TLDs, so each distinct SLD is scored once.
+    """
+    slds = [domain.split(".", 1)[0].lower() for domain in domains]
+    distinct = list(dict.fromkeys(slds))
+    by_sld = dict(zip(distinct, score_slds(distinct)))
+    return [by_sld[sld] for sld in slds]
+
+
+def prune_lowest(slds: Sequence[str], percent: float) -> tuple[list[str], list[str]]:
+    """Drop the lowest-scoring ``percent`` of SLDs; returns (kept, dropped) in input order.
+
+    Ties keep the earlier SLD, so MS1's own order decides between equal scores and the
+    padded filler at the end of the list goes first. At least one SLD is always kept.
+    """
+    drop = min(len(slds) - 1, int(len(slds) * percent / 100))
+    if drop <= 0:
+        return list(slds), []
+    scores = score_slds(slds)
+    ranked = sorted(range(len(slds)), key=lambda idx: (scores[idx], -idx))
+    dropped = set(ranked[:drop])
+    return (
+        [sld for idx, sld in enumerate(slds) if idx not in dropped],
+        [sld for idx, sld in enumerate(slds) if idx in dropped],
+    )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterator
+
+from .naming_score import score_domains
+
+STATUS_ORDER = {"available": 0, "unknown": 1, "taken": 2, "invalid": 3}
+FALLBACK_SUMMARY = "autofilled_from_ts1_fallback"
+
+
+def extract_tld(domain: str) -> str:
+    parts = domain.rsplit(".", maxsplit=1)
+    if len(parts) != 2:
+        return ""
+    return f".{parts[1].lower()}"
+
+
+class FallbackQueue:
+    """TS1 results of one TLD bucket, popped in MS2 fallback order.
+
+    Fallback order is status, TLD preference, confidence (high first), brand score (high
+    first), length, domain. The heap holds only sort keys and row indexes; a row dict is
+    built when it is popped.
+    """
+
+    def __init__(self, results: list[dict], tld_order: dict[str, int], tld_count: int) -> None:
+        self._results = results
+        self._tld_order = tld_order
+        self._tld_count = tld_count
+        self._heap: list[tuple] = []
+
+    def add(self, idx: int, tld: str, brand_score: float) -> None:
+        row = self._results[idx]
+        domain = row["domain"]
+        self._heap.append(
+            (
+                STATUS_ORDER.get(row["status"], 99),
+                self._tld_order.get(tld, self._tld_count + 1),
+                -float(row["confidence"]),
+                -brand_score,
+                len(domain),
+                domain,
+                idx,
+            )
+        )
+
+    def drain(self, seen: set[str]) -> Iterator[dict]:
+        heapq.heapify(self._heap)
+        while self._heap:
+            idx = heapq.heappop(self._heap)[-1]
+            row = self._results[idx]
+            domain = row["domain"]
+            if domain in seen:
+                continue
+            seen.add(domain)
+            yield {
+                "domain": domain,
+                "status": row["status"],
+                "confidence": row["confidence"],
+                "tld_preference_rank": self._tld_order.get(extract_tld(domain), self._tld_count),
+                "summary": FALLBACK_SUMMARY,
+            }
+
+
+def select_ranked(model_ranked: list[dict], results: list[dict], tlds: list[str], max_count: int) -> list[dict]:
+    """Top ``max_count`` ranked rows: MS2's own picks first, then TS1 fallback rows.
+
+    Rows are dealt round-robin across the requested TLDs (each TLD's MS2 picks in MS2
+    order, then its fallback rows), then topped up from TLDs that were not requested.
+    Fallback rows with the same status and confidence are ordered by the local naming
+    score (``naming_score.score_domains``), so auto-filled rows are the better names.
+    Each TLD keeps its own heap, so only the rows that are emitted are ever ordered or
+    built: O(n + k log n) instead of sorting all n results.
+    """
+    if max_count <= 0:
+        return []
+    tld_order = {tld.lower(): idx for idx, tld in enumerate(tlds)}
+    requested = list(dict.fromkeys(tld.lower() for tld in tlds))
+
+    seen: set[str] = set()
+    model_rows: dict[str, list[dict]] = {tld: [] for tld in requested}
+    other_model_rows: list[dict] = []
+    for row in model_ranked:
+        domain = row["domain"]
+        if domain in seen:
+            continue
+        seen.add(domain)
+        model_rows.get(extract_tld(domain), other_model_rows).append(row)
+
+    queues = {tld: FallbackQueue(results, tld_order, len(tlds)) for tld in requested}
+    other_queue = FallbackQueue(results, tld_order, len(tlds))
+    brand_scores = score_domains([row["domain"] for row in results])
+    for idx, row in enumerate(results):
+        tld = extract_tld(row["domain"])
+        queues.get(tld, other_queue).add(idx, tld, brand_scores[idx])
+
+    streams = [_chain(model_rows[tld], queues[tld].drain(seen)) for tld in requested]
+    selected: list[dict] = []
+    while streams and len(selected) < max_count:
+        live = []
+        for stream in streams:
+            row = next(stream, None)
+            if row is None:
+                continue
+            selected.append(row)
+            live.append(stream)
+            if len(selected) >= max_count:
+                return selected
+        streams = live
+
+    selected.extend(_take(_chain(other_model_rows, other_queue.drain(seen)), max_count - len(selected)))
+    return selected
+
+
+def _chain(first: list[dict], rest: Iterator[dict]) -> Iterator[dict]:
+    yield from first
+    yield from rest
+
+
+def _take(rows: Iterator[dict], count: int) -> list[dict]:
+    return [row for row, _ in zip(rows, range(count))]
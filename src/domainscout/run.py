@@ -51,6 +51,18 @@ def _render_user_report(result: dict, theme: str, tlds: list[str]) -> str:
     lines.append(f"Theme: {theme}")
     lines.append(f"TLD preference: {', '.join(tlds)}")
     lines.append(f"Candidates checked: {len(ts1_output['results'])}")
+    precheck = result.get("precheck")
+    if precheck:
+        lines.append(
+            f"Pre-check: pruned {precheck['pruned']} of {precheck['scored']} SLDs "
+            f"({precheck['lookups_saved']} lookups saved)"
+        )
+    ms2_payload = result.get("ms2_payload")
+    if ms2_payload:
+        lines.append(
+            f"MS2 request: compact, {ms2_payload['bytes'] / 1024:.1f} KB instead of "
+            f"{ms2_payload['full_bytes'] / 1024:.1f} KB ({ms2_payload['reduction']:.0%} smaller)"
+        )
     lines.append(
         "Status counts: "
         + ", ".join(
@@ -129,12 +141,25 @@ def main() -> int:
         default=DEFAULT_CANDIDATE_COUNT,
         help="Candidate count (default: 10%% of max supported, currently %(default)s)",
     )
+    parser.add_argument(
+        "--prune-percent",
+        type=float,
+        default=0.0,
+        help="Drop this share of the lowest-scoring SLDs (local naming score) before TS1 (default: 0, keep all)",
+    )
+    parser.add_argument(
+        "--compact-ms2",
+        action="store_true",
+        help="Send MS2 per-TLD status counts and the top available/unknown candidates instead of every TS1 result",
+    )
     parser.add_argument("--ms1", required=True, help="Path to MS1 JSON output")
     parser.add_argument("--ms2", required=True, help="Path to MS2 JSON output")
     parser.add_argument("--out", required=True, help="Path to write workflow result")
     args = parser.parse_args()
     if not (1 <= len(args.tlds) <= 3):
         parser.error("--tlds expects between 1 and 3 values in preference order")
+    if not (0 <= args.prune_percent < 100):
+        parser.error("--prune-percent expects a value in [0, 100)")
 
     bridge = FileBridge(ms1_path=Path(args.ms1), ms2_path=Path(args.ms2))
     result = run_workflow(
@@ -144,7 +169,7 @@ def main() -> int:
             candidate_count=args.candidate_count,
         ),
         model_bridge=bridge,
-        options=HarnessOptions(),
+        options=HarnessOptions(precheck_prune_percent=args.prune_percent, ms2_compact=args.compact_ms2),
     )
 
     Path(args.out).write_text(
@@ -164,6 +189,8 @@ def main() -> int:
         "ts1_input": result.ts1_input,
         "ts1_output": result.ts1_output,
         "ms2_output": result.ms2_output,
+        "precheck": result.precheck,
+        "ms2_payload": result.ms2_payload,
     }
     sys.stdout.write(
         _render_user_report(
@@ -1,18 +1,56 @@
 from __future__ import annotations
 
 import json
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
 
-import jsonschema
+if TYPE_CHECKING:
+    import jsonschema
 
 
 ROOT = Path(__file__).resolve().parents[2]
 SCHEMAS_DIR = ROOT / "schemas"
 
 
+@lru_cache(maxsize=None)
 def load_schema(name: str) -> dict:
+    """Parsed schema, read from disk once per process. Treat it as read-only."""
     return json.loads((SCHEMAS_DIR / name).read_text())
 
 
-def validate_payload(payload: dict, schema_name: str) -> None:
-    jsonschema.validate(payload, load_schema(schema_name))
+@lru_cache(maxsize=None)
+def schema_validator(name: str) -> jsonschema.protocols.Validator:
+    """Validator compiled once per schema; the meta-schema check runs here, not per payload."""
+    # Imported on first validation, not when the harness module loads.
+    import jsonschema
+
+    schema = load_schema(name)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def validate_payload(payload: dict, schema_name: str, trusted: Iterable[str] = ()) -> float:
+    """Validate ``payload`` against a schema and return the seconds it took.
+
+    ``trusted`` names top-level arrays whose items, size and uniqueness are already
+    guaranteed by whoever built them (a pydantic model, or an earlier check of the same
+    list). Only their first item is checked, so the envelope and the item shape are still
+    enforced without walking thousands of rows. Raises ``jsonschema.ValidationError``.
+    """
+    started = time.perf_counter()
+    instance = payload
+    for key in trusted:
+        items = payload.get(key)
+        if isinstance(items, list) and len(items) > 1:
+            if instance is payload:
+                instance = dict(payload)
+            instance[key] = items[:1]
+    from jsonschema.exceptions import best_match
+
+    error = best_match(schema_validator(schema_name).iter_errors(instance))
+    if error is not None:
+        raise error
+    return time.perf_counter() - started
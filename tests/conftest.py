@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pytest
+
+from domainscout_check.models import CACHE_MODE_ENV
+
+
+@pytest.fixture(autouse=True)
+def _no_verdict_cache(monkeypatch) -> None:
+    """Runs default to cache_mode="bypass"; tests of the cache ask for it explicitly."""
+    monkeypatch.setenv(CACHE_MODE_ENV, "bypass")
+
+
+@pytest.fixture(autouse=True)
+def _no_detached_bootstrap_refresh(monkeypatch) -> None:
+    """One-shot runs past the bootstrap TTL spawn a refetch; tests of it ask for it explicitly."""
+    monkeypatch.setattr("domainscout_check.rdap._spawn_detached_refresh", lambda *_args: None)
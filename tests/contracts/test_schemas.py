@@ -6,6 +6,8 @@ from pathlib import Path
 import jsonschema
 import pytest
 
+from domainscout.schema_utils import schema_validator, validate_payload
+
 
 ROOT = Path(__file__).resolve().parents[2]
 SCHEMAS = ROOT / "schemas"
@@ -107,3 +109,27 @@ def test_ms2_schema_allows_null_best_domain() -> None:
         "next_actions": ["Try more SLDs"],
     }
     jsonschema.validate(payload, schema)
+
+
+def test_validate_payload_reuses_one_compiled_validator() -> None:
+    assert schema_validator("ms1_generate_slds.schema.json") is schema_validator("ms1_generate_slds.schema.json")
+    elapsed = validate_payload({"slds": ["pixelforge"]}, "ms1_generate_slds.schema.json")
+    assert elapsed >= 0
+    with pytest.raises(jsonschema.ValidationError):
+        validate_payload({"slds": ["pixelforge", "pixelforge"]}, "ms1_generate_slds.schema.json")
+
+
+def test_trusted_arrays_skip_their_rows_but_not_the_envelope() -> None:
+    rows = [{"domain": f"brand{i}.com", "status": "taken", "confidence": 0.98, "method": "rdap"} for i in range(3)]
+    rows[2]["status"] = "gone"
+    payload = {"checked_at": "2026-02-16T14:02:11Z", "results": rows}
+
+    with pytest.raises(jsonschema.ValidationError):
+        validate_payload(payload, "ts1_check_domains_out.schema.json")
+    validate_payload(payload, "ts1_check_domains_out.schema.json", trusted=("results",))
+    assert payload["results"] is rows and len(rows) == 3
+
+    with pytest.raises(jsonschema.ValidationError):
+        validate_payload({**payload, "extra": 1}, "ts1_check_domains_out.schema.json", trusted=("results",))
+    with pytest.raises(jsonschema.ValidationError):
+        validate_payload({"slds": []}, "ms1_generate_slds.schema.json", trusted=("slds",))
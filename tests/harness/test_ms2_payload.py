@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from domainscout.ms2_payload import CANDIDATE_COLUMNS, candidate_columns, compact_request, payload_bytes, status_counts
+
+
+def _row(domain: str, status: str, confidence: float = 0.9) -> dict:
+    return {"domain": domain, "status": status, "confidence": confidence, "method": "rdap", "http_status": 404}
+
+
+RESULTS = [
+    _row("pixelforge.com", "taken"),
+    _row("pixelforge.io", "available"),
+    _row("moonbeam.com", "available", 0.8),
+    _row("moonbeam.io", "unknown", 0.4),
+    _row("bad-.com", "invalid", 1.0),
+    _row("moonbeam.dev", "available"),
+]
+
+
+def test_status_counts_cover_every_tld_and_status() -> None:
+    counts = status_counts(RESULTS, [".com", ".io", ".ai"])
+
+    assert list(counts) == [".com", ".io", ".ai", ".dev"]
+    assert counts[".com"] == {"available": 1, "unknown": 0, "taken": 1, "invalid": 1}
+    assert counts[".io"] == {"available": 1, "unknown": 1, "taken": 0, "invalid": 0}
+    assert sum(counts[".ai"].values()) == 0
+
+
+def test_candidates_are_columnar_and_exclude_taken_and_invalid() -> None:
+    columns = candidate_columns(RESULTS, [".com", ".io"], limit=3)
+
+    assert tuple(columns) == CANDIDATE_COLUMNS
+    assert columns["domain"] == ["moonbeam.com", "pixelforge.io", "moonbeam.io"]
+    assert columns["status"] == ["available", "available", "unknown"]
+    assert columns["tld_preference_rank"] == [0, 1, 1]
+
+
+def test_compact_request_is_smaller_and_counts_what_it_left_out() -> None:
+    results = [_row(f"brand{i}.com", "taken" if i % 3 else "available") for i in range(3000)]
+    base = {"theme": "t", "tld_preference": [".com"], "ranked_target_count": 10}
+
+    request = compact_request(base, results, [".com"], limit=30)
+
+    assert "results" not in request and request["theme"] == "t"
+    assert len(request["candidates"]["domain"]) == 30
+    assert request["candidates_omitted"] == 1000 - 30
+    assert request["counts"][".com"]["taken"] == 2000
+    assert payload_bytes(request) * 20 < payload_bytes({**base, "results": results})
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from domainscout.naming_score import prune_lowest, score_slds
+
+
+def test_clean_brandable_names_outscore_filler_and_messy_patterns() -> None:
+    clean, long_name, filler, hyphenated, clusters, look_alike = score_slds(
+        ["pixelforge", "minimalistindiegameportfolio", "pixelforge12", "pixel-forge-hq", "xkcdqwrtz", "brnrnrnvv"]
+    )
+    assert clean > max(long_name, filler, hyphenated, clusters, look_alike)
+    assert all(0.0 <= score <= 1.0 for score in (clean, long_name, filler, hyphenated, clusters, look_alike))
+    assert score_slds([]) == []
+
+
+def test_numbered_and_generic_filler_ranks_below_genuine_names() -> None:
+    filler = score_slds(["theme123", "brand7", "pixelforge12", "mysite", "bestapp"])
+    genuine = score_slds(["pixelforge", "moonbeam", "swiftly", "gopher"])
+    (random_letters,) = score_slds(["xkcdqwrt"])
+
+    assert max(filler) < min(genuine)
+    # Padded theme+number filler must not outrank even a random string.
+    assert max(filler[:3]) < random_letters
+
+
+def test_batch_scores_match_single_scores() -> None:
+    slds = ["moonbeam", "aaa-bbb", "go", "swiftly", "l1ghthouse", "theme123"]
+    assert score_slds(slds) == [score_slds([sld])[0] for sld in slds]
+
+
+def test_prune_lowest_drops_the_weakest_share_and_keeps_order() -> None:
+    slds = ["pixelforge", "xkcdqwrtz", "moonbeam", "swiftly", "pixelforge3", "pixelforge4"]
+    kept, dropped = prune_lowest(slds, 50)
+    assert kept == ["pixelforge", "moonbeam", "swiftly"]
+    assert sorted(dropped) == ["pixelforge3", "pixelforge4", "xkcdqwrtz"]
+    assert prune_lowest(["solo"], 90) == (["solo"], [])
+    assert prune_lowest(slds, 0) == (slds, [])
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import random
+
+from domainscout.naming_score import score_domains
+from domainscout.ranking import extract_tld, select_ranked
+
+
+# The sort-everything implementation select_ranked replaced, kept as the reference ordering.
+def _legacy_fallback_ranked(results: list[dict], tlds: list[str]) -> list[dict]:
+    tld_order = {tld.lower(): idx for idx, tld in enumerate(tlds)}
+    status_order = {"available": 0, "unknown": 1, "taken": 2, "invalid": 3}
+    brand = dict(zip((row["domain"] for row in results), score_domains([row["domain"] for row in results])))
+
+    def sort_key(row: dict) -> tuple[int, int, float, float, int, str]:
+        domain = row["domain"]
+        tld = extract_tld(domain)
+        return (
+            status_order.get(row["status"], 99),
+            tld_order.get(tld, len(tlds) + 1),
+            -float(row["confidence"]),
+            -brand[domain],
+            len(domain),
+            domain,
+        )
+
+    ranked: list[dict] = []
+    for row in sorted(results, key=sort_key):
+        tld = extract_tld(row["domain"])
+        ranked.append(
+            {
+                "domain": row["domain"],
+                "status": row["status"],
+                "confidence": row["confidence"],
+                "tld_preference_rank": tld_order.get(tld, len(tlds)),
+                "summary": "autofilled_from_ts1_fallback",
+            }
+        )
+    return ranked
+
+
+def _legacy_rebalance(ranked: list[dict], tlds: list[str], max_count: int) -> list[dict]:
+    if max_count <= 0:
+        return []
+    if not ranked:
+        return []
+    if not tlds:
+        return ranked[:max_count]
+
+    requested_tlds: list[str] = []
+    seen_tlds: set[str] = set()
+    for tld in tlds:
+        normalized = tld.lower()
+        if normalized in seen_tlds:
+            continue
+        requested_tlds.append(normalized)
+        seen_tlds.add(normalized)
+
+    buckets: dict[str, list[dict]] = {tld: [] for tld in requested_tlds}
+    for row in ranked:
+        bucket_tld = extract_tld(row["domain"])
+        if bucket_tld in buckets:
+            buckets[bucket_tld].append(row)
+
+    selected: list[dict] = []
+    seen_domains: set[str] = set()
+    progress = True
+    while len(selected) < max_count and progress:
+        progress = False
+        for tld in requested_tlds:
+            bucket = buckets[tld]
+            if not bucket:
+                continue
+            row = bucket.pop(0)
+            domain = row["domain"]
+            if domain in seen_domains:
+                continue
+            selected.append(row)
+            seen_domains.add(domain)
+            progress = True
+            if len(selected) >= max_count:
+                break
+
+    if len(selected) < max_count:
+        for row in ranked:
+            domain = row["domain"]
+            if domain in seen_domains:
+                continue
+            selected.append(row)
+            seen_domains.add(domain)
+            if len(selected) >= max_count:
+                break
+
+    return selected[:max_count]
+
+
+def _legacy_select(model_ranked: list[dict], results: list[dict], tlds: list[str], max_count: int) -> list[dict]:
+    deduped: list[dict] = []
+    seen: set[str] = set()
+    for row in [*model_ranked, *_legacy_fallback_ranked(results, tlds)]:
+        if row["domain"] not in seen:
+            seen.add(row["domain"])
+            deduped.append(row)
+    return _legacy_rebalance(deduped, tlds, max_count)
+
+
+def _random_case(rng: random.Random) -> tuple[list[dict], list[dict], list[str]]:
+    pool = [".com", ".io", ".de", ".ai", ".net"]
+    tlds = rng.sample(pool, rng.randint(0, 3))
+    results = []
+    for _ in range(rng.randint(0, 80)):
+        domain = f"{rng.choice(['ab', 'brand', 'pixel', 'x'])}{rng.randint(0, 30)}{rng.choice(pool)}"
+        results.append(
+            {
+                "domain": domain,
+                "status": rng.choice(["available", "unknown", "taken", "invalid"]),
+                "confidence": rng.choice([0.2, 0.65, 0.8, 0.98]),
+                "method": "rdap",
+            }
+        )
+    picks = rng.sample(results, min(len(results), rng.randint(0, 6)))
+    model_ranked = [{"domain": row["domain"], "status": row["status"], "confidence": 0.9} for row in picks * 2]
+    model_ranked.append({"domain": "invented.ai", "status": "available", "confidence": 0.5})
+    return model_ranked, results, tlds
+
+
+def test_select_ranked_matches_the_full_sort_ordering() -> None:
+    rng = random.Random(11)
+    for _ in range(400):
+        model_ranked, results, tlds = _random_case(rng)
+        for max_count in (0, 1, 3, 7, len(results)):
+            assert select_ranked(model_ranked, results, tlds, max_count) == _legacy_select(model_ranked, results, tlds, max_count)
+
+
+def test_select_ranked_takes_the_head_of_a_large_bucket() -> None:
+    results = [{"domain": f"brand{i}.com", "status": "available", "confidence": 0.8, "method": "rdap"} for i in range(1000)]
+    ranked = select_ranked([], results, [".com"], 5)
+    assert [row["domain"] for row in ranked] == ["brand0.com", "brand1.com", "brand2.com", "brand3.com", "brand4.com"]
+    assert {row["summary"] for row in ranked} == {"autofilled_from_ts1_fallback"}
+    assert extract_tld("brand0.COM") == ".com"
@@ -4,6 +4,8 @@ from collections import Counter
 from math import ceil
 
 from domainscout_check.models import CheckDomainsOutput, DomainResult
+from domainscout_check.result_table import ResultTable
+from domainscout_check.summary import RunSummary
 from domainscout.harness import (
     DEFAULT_CANDIDATE_COUNT,
     DEFAULT_MS2_RANKED_RATIO,
@@ -13,6 +15,23 @@ from domainscout.harness import (
 )
 
 
+def _use_fake_checker(fake_check_domains) -> None:
+    """Route the harness's TS1 call to a fake returning CheckDomainsOutput, via the table entry point."""
+    import domainscout.harness as harness_module
+
+    async def fake_check_domains_table(payload):
+        output = await fake_check_domains(payload)
+        table = ResultTable()
+        summary = RunSummary(tlds=payload.tlds, allow_unknown=True, checked_at=output.checked_at)
+        for result in output.results:
+            table.append(result)
+            summary.add(result)
+        assert summary.suggested_best == output.suggested_best
+        return table, summary
+
+    harness_module.check_domains_table = fake_check_domains_table
+
+
 class FakeBridge:
     def generate_slds(self, ms1_request_json: dict) -> dict:
         assert ms1_request_json["theme"]
@@ -53,9 +72,7 @@ def test_workflow_happy_path() -> None:
             suggested_best="pixelforge.de",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(theme="minimalist indie game portfolio", tlds=[".com", ".de", ".io"]),
@@ -65,6 +82,7 @@ def test_workflow_happy_path() -> None:
 
     assert result.ms2_output["best_domain"]
     assert result.ts1_output["results"]
+    assert set(result.validation_ms) == {"ms1_output", "ts1_input", "ts1_output", "ms2_output", "ms2_ranked"}
 
 
 def test_workflow_candidate_count_trims_ms1_output() -> None:
@@ -91,9 +109,7 @@ def test_workflow_candidate_count_trims_ms1_output() -> None:
             suggested_best="brand0.com",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -143,9 +159,7 @@ def test_workflow_enforces_ranked_target_with_autofill() -> None:
             suggested_best="brand0.com",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -193,9 +207,7 @@ def test_workflow_trims_ranked_to_target() -> None:
             suggested_best="brand0.com",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -238,9 +250,7 @@ def test_workflow_pads_ms1_underflow_to_candidate_count() -> None:
             suggested_best=None,
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -280,9 +290,7 @@ def test_workflow_returns_50_ranked_for_candidate_count_500() -> None:
             suggested_best="brand0.com",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -337,9 +345,7 @@ def test_workflow_balances_ranked_output_across_requested_tlds() -> None:
             suggested_best="brand0.com",
         )
 
-    import domainscout.harness as harness_module
-
-    harness_module.check_domains = fake_check_domains
+    _use_fake_checker(fake_check_domains)
 
     result = run_workflow(
         user_input=UserInput(
@@ -357,3 +363,73 @@ def test_workflow_balances_ranked_output_across_requested_tlds() -> None:
     assert tld_counts["com"] == 2
     assert tld_counts["ai"] == 2
     assert tld_counts["io"] == 2
+
+
+def test_workflow_precheck_prunes_weak_slds_before_ts1() -> None:
+    class FillerBridge:
+        def generate_slds(self, _ms1_request_json: dict) -> dict:
+            return {"slds": ["pixelforge", "moonbeam", "xkcdqwrtz"]}
+
+        def pick_best(self, _ms2_request_json: dict) -> dict:
+            return {"best_domain": None, "rationale": "ok", "ranked": []}
+
+    checked: list[str] = []
+
+    async def fake_check_domains(payload):
+        checked.extend(payload.slds)
+        return CheckDomainsOutput(
+            checked_at="2026-02-16T14:02:11Z",
+            results=[DomainResult(domain=f"{sld}.com", status="taken", confidence=0.98, method="rdap") for sld in payload.slds],
+            suggested_best=None,
+        )
+
+    _use_fake_checker(fake_check_domains)
+
+    result = run_workflow(
+        user_input=UserInput(theme="tiny arcade", tlds=[".com", ".io"], candidate_count=10),
+        model_bridge=FillerBridge(),
+        options=HarnessOptions(precheck_prune_percent=50),
+    )
+
+    assert len(result.ms1_output["slds"]) == 10
+    assert checked == result.ts1_input["slds"]
+    assert checked[:2] == ["pixelforge", "moonbeam"]
+    assert len(checked) == 5 and "xkcdqwrtz" not in checked
+    assert result.precheck is not None
+    assert (result.precheck["scored"], result.precheck["pruned"], result.precheck["lookups_saved"]) == (10, 5, 10)
+
+
+def test_workflow_compact_ms2_request_keeps_full_results_in_the_workflow_result() -> None:
+    seen: dict = {}
+
+    class CompactBridge:
+        def generate_slds(self, _ms1_request_json: dict) -> dict:
+            return {"slds": [f"brand{i}" for i in range(40)]}
+
+        def pick_best(self, ms2_request_json: dict) -> dict:
+            seen.update(ms2_request_json)
+            return {"best_domain": ms2_request_json["candidates"]["domain"][0], "rationale": "ok", "ranked": []}
+
+    async def fake_check_domains(payload):
+        results = [
+            DomainResult(domain=f"{sld}.com", status="available" if idx % 4 == 0 else "taken", confidence=0.9, method="rdap")
+            for idx, sld in enumerate(payload.slds)
+        ]
+        return CheckDomainsOutput(checked_at="2026-02-16T14:02:11Z", results=results, suggested_best="brand0.com")
+
+    _use_fake_checker(fake_check_domains)
+
+    result = run_workflow(
+        user_input=UserInput(theme="tiny arcade", tlds=[".com"], candidate_count=40),
+        model_bridge=CompactBridge(),
+        options=HarnessOptions(ms2_compact=True, ms2_candidate_limit=5),
+    )
+
+    assert "results" not in seen
+    assert len(seen["candidates"]["domain"]) == 5 and seen["candidates_omitted"] == 5
+    assert seen["counts"][".com"] == {"available": 10, "unknown": 0, "taken": 30, "invalid": 0}
+    assert len(result.ts1_output["results"]) == 40
+    assert len(result.ms2_output["ranked"]) == 4
+    assert result.ms2_payload is not None
+    assert result.ms2_payload["bytes"] < result.ms2_payload["full_bytes"]
+    assert 0 < result.ms2_payload["reduction"] < 1
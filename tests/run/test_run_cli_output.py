@@ -11,7 +11,9 @@ def test_run_cli_prints_human_report_and_displays_ten_percent(
 ) -> None:
     import domainscout.harness as harness_module
     import domainscout.run as run_module
-    from domainscout_check.models import CheckDomainsOutput, DomainResult
+    from domainscout_check.models import DomainResult
+    from domainscout_check.result_table import ResultTable
+    from domainscout_check.summary import RunSummary
 
     ms1_path = tmp_path / "ms1.json"
     ms2_path = tmp_path / "ms2.json"
@@ -22,17 +24,16 @@ def test_run_cli_prints_human_report_and_displays_ten_percent(
     ms1_path.write_text(json.dumps(ms1_payload))
     ms2_path.write_text(json.dumps(ms2_payload))
 
-    async def fake_check_domains(_payload):
-        return CheckDomainsOutput(
-            checked_at="2026-02-16T14:02:11Z",
-            results=[
-                DomainResult(domain=f"brand{i}.com", status="available", confidence=0.8, method="rdap")
-                for i in range(500)
-            ],
-            suggested_best="brand0.com",
-        )
+    async def fake_check_domains_table(payload):
+        table = ResultTable()
+        summary = RunSummary(tlds=payload.tlds, allow_unknown=True, checked_at="2026-02-16T14:02:11Z")
+        for i in range(500):
+            result = DomainResult(domain=f"brand{i}.com", status="available", confidence=0.8, method="rdap")
+            table.append(result)
+            summary.add(result)
+        return table, summary
 
-    monkeypatch.setattr(harness_module, "check_domains", fake_check_domains)
+    monkeypatch.setattr(harness_module, "check_domains_table", fake_check_domains_table)
     monkeypatch.setattr(run_module, "require_uv_project_env", lambda: None)
     monkeypatch.setattr(run_module, "_supports_color", lambda: False)
     monkeypatch.setattr(
@@ -99,6 +100,8 @@ def test_run_cli_default_candidate_count_uses_ten_percent_of_max(
                     {"domain": "brand0.com", "status": "available", "confidence": 0.8}
                 ],
             },
+            precheck=None,
+            ms2_payload=None,
         )
 
     monkeypatch.setattr(harness_module, "run_workflow", fake_run_workflow)
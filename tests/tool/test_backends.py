@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from domainscout_check.backends import SimulatedRegistry, lookup_chain
+from domainscout_check.cache import VerdictCache, cache_scope
+from domainscout_check.checker import check_domains, iter_check_domains
+from domainscout_check.dns_probe import DNSProbeEvidence
+from domainscout_check.models import CheckDomainsInput, DomainResult, SimulatedBackendOptions, ToolOptions
+from domainscout_check.summary import RunSummary
+
+
+def _payload(tmp_path: Path, slds: list[str], **options) -> CheckDomainsInput:
+    return CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".net"],
+            "slds": slds,
+            "options": {
+                "cache_path": str(tmp_path / "verdicts.sqlite3"),
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                **options,
+            },
+        }
+    )
+
+
+@pytest.fixture
+def offline(monkeypatch) -> None:
+    async def no_network(*_args, **_kwargs):
+        raise AssertionError("a simulated run must not touch the network")
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", no_network)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", no_network)
+    monkeypatch.setattr("domainscout_check.checker.append_run_log", lambda *_args, **_kwargs: None)
+
+
+def test_lookup_chain_defaults_to_rdap_then_dns() -> None:
+    assert lookup_chain(ToolOptions()) == ["rdap", "dns"]
+    assert lookup_chain(ToolOptions(prefer_rdap=False)) == ["dns"]
+    assert lookup_chain(ToolOptions(lookup_backends=["simulated", "dns"])) == ["simulated", "dns"]
+
+
+def test_lookup_backends_rejects_a_repeated_backend() -> None:
+    with pytest.raises(ValidationError, match="must not repeat"):
+        ToolOptions(lookup_backends=["simulated", "dns", "simulated"])
+
+
+@pytest.mark.asyncio
+async def test_simulated_chain_answers_without_bootstrap_or_network(tmp_path: Path, offline) -> None:
+    slds = [f"name{i}" for i in range(40)]
+    simulated = {"latency_ms_median": 0, "latency_ms_p99": 0, "available_rate": 0.5, "seed": 3}
+    payload = _payload(tmp_path, slds, lookup_backends=["simulated"], simulated=simulated)
+
+    first = await check_domains(payload)
+    second = await check_domains(payload)
+
+    assert len(first.results) == 80
+    assert {(r.method, r.backend) for r in first.results} == {("simulated", "simulated")}
+    assert {r.rdap_server for r in first.results} == {"simulated://com", "simulated://net"}
+    assert {r.status for r in first.results} == {"taken", "available"}
+    assert [(r.domain, r.status) for r in first.results] == [(r.domain, r.status) for r in second.results]
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_through_to_dns_when_the_simulated_registry_errors(tmp_path: Path, offline, monkeypatch) -> None:
+    async def fake_dns(_domain, _timeout_ms, engine=None, nameservers=None):
+        return DNSProbeEvidence(dns_ns=True)
+
+    monkeypatch.setattr("domainscout_check.checker.probe_domain_dns", fake_dns)
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com"],
+            "slds": ["pixelforge"],
+            "options": {
+                "dns_engine": "thread",
+                "lookup_backends": ["simulated", "dns"],
+                "simulated": {"latency_ms_median": 0, "latency_ms_p99": 0, "error_rate": 1.0},
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            },
+        }
+    )
+    summary = RunSummary(tlds=[".com"], allow_unknown=True)
+
+    [result] = [result async for result in iter_check_domains(payload, summary)]
+
+    assert (result.status, result.method, result.backend) == ("taken", "dns", "dns")
+    assert result.rdap_http == 503
+    # The first request and both retries reached the simulated server before DNS was asked.
+    assert summary.rdap_servers["simulated://com"]["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_simulated_registry_throttles_beyond_its_throughput_cap() -> None:
+    registry = SimulatedRegistry(
+        SimulatedBackendOptions(latency_ms_median=0, latency_ms_p99=0, max_lookups_per_second=2), timeout_seconds=1.0
+    )
+
+    answers = [await registry.query(None, "simulated://com", f"name{i}.com") for i in range(3)]
+
+    assert all(answer[2] in {200, 404} for answer in answers[:2])
+    assert answers[2] == ("unknown", 0.25, 429, None, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_results_record_the_backend_that_answered(tmp_path: Path, offline) -> None:
+    payload = _payload(
+        tmp_path,
+        ["alpha"],
+        cache_mode="use",
+        lookup_backends=["simulated"],
+        simulated={"latency_ms_median": 0, "latency_ms_p99": 0},
+    )
+    cache = VerdictCache(tmp_path / "verdicts.sqlite3")
+    result = DomainResult(domain="alpha.com", status="taken", confidence=0.98, method="rdap", rdap_http=200)
+    cache.put(result, 3600, cache_scope(payload.options))
+    cache.flush()
+    cache.close()
+
+    output = await check_domains(payload)
+
+    assert {r.domain: r.backend for r in output.results} == {"alpha.com": "cache", "alpha.net": "simulated"}
+    assert output.cache is not None and output.cache.stored == 0
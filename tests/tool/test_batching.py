@@ -8,39 +8,71 @@ from domainscout_check.checker import check_domains
 from domainscout_check.models import CheckDomainsInput, DomainResult
 
 
-@pytest.mark.asyncio
-async def test_check_domains_batches_large_inputs_internally(monkeypatch) -> None:
+def _patch_network(monkeypatch, fake_check_one_domain) -> None:
     async def fake_bootstrap(*_args, **_kwargs):
         return {"com": "https://rdap.example", "net": "https://rdap.example", "io": "https://rdap.example"}
 
-    async def fake_check_one_domain(domain, tld, rdap_base_map, payload, client, semaphore):
-        _ = (tld, rdap_base_map, payload, client, semaphore)
-        return DomainResult(domain=domain, status="taken", confidence=0.98, method="rdap")
-
-    async def tracking_gather(*tasks):
-        batch_sizes.append(len(tasks))
-        return await real_gather(*tasks)
-
     def fake_append_log(*_args, **_kwargs):
         return None
 
-    real_gather = asyncio.gather
-    batch_sizes: list[int] = []
-
     monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
     monkeypatch.setattr("domainscout_check.checker._check_one_domain", fake_check_one_domain)
     monkeypatch.setattr("domainscout_check.checker.append_run_log", fake_append_log)
-    monkeypatch.setattr("domainscout_check.checker.asyncio.gather", tracking_gather)
+
+
+@pytest.mark.asyncio
+async def test_check_domains_handles_large_inputs_with_bounded_concurrency(monkeypatch) -> None:
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def fake_check_one_domain(domain, tld, payload, ctx):
+        nonlocal in_flight, peak_in_flight
+        _ = (tld, payload, ctx)
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return DomainResult(domain=domain, status="taken", confidence=0.98, method="rdap")
+
+    _patch_network(monkeypatch, fake_check_one_domain)
 
     payload = CheckDomainsInput.model_validate(
         {
             "tlds": [".com", ".net", ".io"],
             "slds": [f"brand{i}" for i in range(95)],
-            "options": {"batch_size": 40},
+            "options": {"batch_size": 40, "max_concurrency": 8, "prewarm_connections": False},
         }
     )
 
     output = await check_domains(payload)
 
     assert len(output.results) == 285
-    assert batch_sizes == [120, 120, 45]
+    assert len({r.domain for r in output.results}) == 285
+    assert peak_in_flight == 8
+
+
+@pytest.mark.asyncio
+async def test_slow_domain_does_not_stall_later_batches(monkeypatch) -> None:
+    completed: list[str] = []
+
+    async def fake_check_one_domain(domain, tld, payload, ctx):
+        _ = (tld, payload, ctx)
+        await asyncio.sleep(0.3 if domain == "brand0.com" else 0.001)
+        completed.append(domain)
+        return DomainResult(domain=domain, status="taken", confidence=0.98, method="rdap")
+
+    _patch_network(monkeypatch, fake_check_one_domain)
+
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com"],
+            "slds": [f"brand{i}" for i in range(60)],
+            "options": {"batch_size": 5, "max_concurrency": 4, "prewarm_connections": False},
+        }
+    )
+
+    output = await check_domains(payload)
+
+    assert len(output.results) == 60
+    assert completed[-1] == "brand0.com"
+    assert [r.domain for r in output.results] == sorted(f"brand{i}.com" for i in range(60))
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from domainscout_check import rdap
+from domainscout_check.checker import check_domains
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.rdap import (
+    _spawn_detached_refresh,
+    load_bootstrap_map,
+    load_bundled_bootstrap_map,
+    wait_bootstrap_refreshes,
+)
+
+IANA_DOC = {
+    "publication": "2024-06-01T00:00:00Z",
+    "services": [
+        [["com", "net"], ["https://rdap.example/v1/"]],
+        [["dev"], ["https://rdap.other/"]],
+    ],
+}
+
+
+def _serve_iana(monkeypatch, calls: list[str], status: int = 200) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(status, json=IANA_DOC)
+
+    monkeypatch.setattr(rdap, "_new_bootstrap_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _age(path: Path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.mark.asyncio
+async def test_fetch_writes_compact_cache_and_fresh_cache_skips_network(tmp_path: Path, monkeypatch) -> None:
+    cache_path = tmp_path / "rdap_dns.json"
+    calls: list[str] = []
+    _serve_iana(monkeypatch, calls)
+
+    # ".nosuchtld" is missing from the bundled snapshot, so this call waits for the fetch.
+    mapping = await load_bootstrap_map(cache_path, ttl_seconds=3600, required_tlds=[".com", ".nosuchtld"])
+    assert mapping == {"com": "https://rdap.example/v1", "net": "https://rdap.example/v1", "dev": "https://rdap.other"}
+    stored = json.loads(cache_path.read_text())
+    assert stored["servers"] == ["https://rdap.example/v1", "https://rdap.other"]
+    assert stored["tlds"] == {"com": 0, "dev": 1, "net": 0}
+
+    assert await load_bootstrap_map(cache_path, ttl_seconds=3600, required_tlds=[".com"]) == mapping
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_cache_is_served_while_refreshing_in_background(tmp_path: Path, monkeypatch) -> None:
+    cache_path = tmp_path / "rdap_dns.json"
+    cache_path.write_text(json.dumps({"services": [[["com"], ["https://rdap.old/"]]]}))
+    _age(cache_path, 7200)
+    calls: list[str] = []
+    _serve_iana(monkeypatch, calls)
+
+    stale = await load_bootstrap_map(cache_path, ttl_seconds=3600, required_tlds=[".com"])
+    assert stale == {"com": "https://rdap.old"}
+
+    await wait_bootstrap_refreshes()
+    assert len(calls) == 1
+    fresh = await load_bootstrap_map(cache_path, ttl_seconds=3600, required_tlds=[".com"])
+    assert fresh["com"] == "https://rdap.example/v1"
+
+
+@pytest.mark.asyncio
+async def test_cold_start_without_network_uses_bundled_snapshot(tmp_path: Path, monkeypatch) -> None:
+    cache_path = tmp_path / "rdap_dns.json"
+    calls: list[str] = []
+    _serve_iana(monkeypatch, calls, status=503)
+
+    mapping = await load_bootstrap_map(cache_path, ttl_seconds=3600, required_tlds=[".com"])
+    await wait_bootstrap_refreshes()
+
+    assert mapping == load_bundled_bootstrap_map()
+    assert mapping["com"] == "https://rdap.verisign.com/com/v1"
+    assert len(calls) == 1
+    assert not cache_path.exists()
+
+
+def test_short_check_domains_run_refreshes_out_of_process_without_waiting(tmp_path: Path, monkeypatch) -> None:
+    cache_path = tmp_path / "rdap_dns.json"
+    spawned: list[list[str]] = []
+
+    async def slow_iana(_request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=IANA_DOC)
+
+    monkeypatch.setattr(rdap, "_new_bootstrap_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(slow_iana)))
+    monkeypatch.setattr(rdap, "_spawn_detached_refresh", _spawn_detached_refresh)
+    monkeypatch.setattr(rdap.subprocess, "Popen", lambda argv, **_kwargs: spawned.append(argv))
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com"],
+            "slds": ["pixelforge"],
+            "options": {
+                "prefer_rdap": False,
+                "enable_dns_fallback": False,
+                "bootstrap_cache_path": str(cache_path),
+            },
+        }
+    )
+
+    # asyncio.run() is how the CLI and harness call it: the loop closes right after the run.
+    started = time.monotonic()
+    output = asyncio.run(check_domains(payload))
+    asyncio.run(check_domains(payload))
+
+    assert time.monotonic() - started < 2
+    assert output.results[0].status == "unknown"
+    # One child for back-to-back runs; it writes the cache the next run reads.
+    assert spawned == [[sys.executable, "-m", "domainscout_check.rdap", "--output", str(cache_path), "--url", rdap.IANA_DNS_BOOTSTRAP_URL]]
+
+
+def test_rdap_module_main_writes_the_compact_snapshot(tmp_path: Path, monkeypatch) -> None:
+    calls: list[str] = []
+    _serve_iana(monkeypatch, calls)
+    output = tmp_path / "rdap_bootstrap.json"
+
+    assert rdap.main(["--output", str(output)]) == 0
+
+    assert calls == [rdap.IANA_DNS_BOOTSTRAP_URL]
+    stored = json.loads(output.read_text())
+    assert (stored["format"], stored["publication"]) == (rdap.BOOTSTRAP_FORMAT, IANA_DOC["publication"])
+    assert stored["tlds"] == {"com": 0, "dev": 1, "net": 0}
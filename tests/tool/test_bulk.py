@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from domainscout_check import bulk
+from domainscout_check.bulk import JournalMismatch, read_journal, run_bulk_job
+from domainscout_check.checker import iter_check_domains
+from domainscout_check.models import CheckDomainsInput
+
+
+def _template(tmp_path: Path, tlds: list[str] | None = None) -> dict:
+    return {
+        "tlds": tlds or [".com", ".io"],
+        "options": {
+            "deterministic_mode": True,
+            "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+        },
+    }
+
+
+def _simulated_template(tmp_path: Path, **options) -> dict:
+    return {
+        "tlds": [".com", ".io"],
+        "options": {
+            "lookup_backends": ["simulated"],
+            "simulated": {"latency_ms_median": 0, "latency_ms_p99": 0, "available_rate": 1.0},
+            "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            **options,
+        },
+    }
+
+
+def _sld_file(tmp_path: Path, count: int) -> Path:
+    path = tmp_path / "slds.txt"
+    path.write_text("# portfolio sweep\n" + "".join(f"name{i}\n" for i in range(count)) + "\nbad.name\n")
+    return path
+
+
+def _journal_domains(path: Path) -> Counter[str]:
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    return Counter(entry["domain"] for entry in entries if "domain" in entry)
+
+
+@pytest.mark.asyncio
+async def test_bulk_job_journals_every_domain_with_checkpoints(tmp_path: Path) -> None:
+    sld_path = _sld_file(tmp_path, 25)
+    journal = tmp_path / "job.ndjson"
+
+    report = await run_bulk_job(_template(tmp_path), sld_path, journal, chunk_size=10)
+
+    assert report["slds"] == 26 and report["domains"] == 52 == report["checked_this_run"]
+    assert report["counts"]["invalid"] == 2
+    assert set(_journal_domains(journal).values()) == {1}
+    lines = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert lines[0] == {"job": {"input": str(sld_path.resolve()), "tlds": [".com", ".io"]}}
+    assert [line["checkpoint"]["slds"] for line in lines if "checkpoint" in line] == [10, 20, 26]
+    assert lines[-1] == {"done": {"slds": 26, "domains": 52}}
+
+    again = await run_bulk_job(_template(tmp_path), sld_path, journal, chunk_size=10)
+    assert again["checked_this_run"] == 0
+    assert again["counts"] == report["counts"] and again["suggested_best"] == report["suggested_best"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_job_resumes_after_a_crash_without_rechecking(tmp_path: Path) -> None:
+    sld_path = _sld_file(tmp_path, 25)
+    journal = tmp_path / "job.ndjson"
+    full = await run_bulk_job(_template(tmp_path), sld_path, journal, chunk_size=10)
+
+    # Crash mid-chunk 2: keep the first checkpoint, 5 results after it and a torn line.
+    lines = journal.read_text().splitlines(keepends=True)
+    first_checkpoint = next(idx for idx, line in enumerate(lines) if "checkpoint" in line)
+    journal.write_text("".join(lines[: first_checkpoint + 6]) + lines[first_checkpoint + 6][:15])
+    state = read_journal(journal, allow_unknown=False)
+    assert state.slds == 10 and len(state.pending) == 5 and not state.finished
+
+    resumed = await run_bulk_job(_template(tmp_path), sld_path, journal, chunk_size=10)
+
+    assert resumed["checked_this_run"] == 52 - 20 - 5
+    assert resumed["counts"] == full["counts"]
+    assert resumed["suggested_best"] == full["suggested_best"]
+    assert set(_journal_domains(journal).values()) == {1} and len(_journal_domains(journal)) == 52
+
+
+@pytest.mark.asyncio
+async def test_bulk_job_refuses_a_journal_from_another_job(tmp_path: Path) -> None:
+    sld_path = _sld_file(tmp_path, 3)
+    journal = tmp_path / "job.ndjson"
+    await run_bulk_job(_template(tmp_path), sld_path, journal)
+
+    with pytest.raises(JournalMismatch):
+        await run_bulk_job(_template(tmp_path, [".net"]), sld_path, journal)
+
+
+@pytest.mark.asyncio
+async def test_bulk_job_checks_every_domain_with_find_best_fast_on_one_set_of_resources(tmp_path: Path, monkeypatch) -> None:
+    opened = []
+
+    class CountingResources(bulk.CheckerResources):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(bulk, "CheckerResources", CountingResources)
+    sld_path = _sld_file(tmp_path, 25)
+    journal = tmp_path / "job.ndjson"
+
+    # Every name is available, so an early stop would end each chunk after its first hit.
+    report = await run_bulk_job(_simulated_template(tmp_path, find_best_fast=True), sld_path, journal, chunk_size=10)
+
+    assert report["domains"] == 52 == report["checked_this_run"]
+    assert report["counts"]["available"] == 50
+    assert set(_journal_domains(journal).values()) == {1} and len(_journal_domains(journal)) == 52
+    assert len(opened) == 1
+
+
+@pytest.mark.asyncio
+async def test_resumed_chunk_looks_up_what_is_left_when_done_holds_invalid_domains(tmp_path: Path) -> None:
+    payload = CheckDomainsInput.model_validate({**_simulated_template(tmp_path), "slds": ["alpha", "beta", "bad.name"]})
+    done = {"bad.name.com", "bad.name.io", "alpha.com", "alpha.io", "beta.com", "elsewhere.com"}
+
+    results = [result async for result in iter_check_domains(payload, done=done)]
+
+    assert [result.domain for result in results] == ["beta.io"]
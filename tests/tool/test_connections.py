@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import importlib.util
+import shutil
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from domainscout_check.checker import iter_check_domains
+from domainscout_check.connections import PREWARM_MAX_CONNECTIONS, build_transport, http2_supported, prewarm_host
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.scheduler import ServerLane
+from domainscout_check.summary import RunSummary
+
+from standins import StandinRDAPServer, fixed_latency, self_signed_tls
+
+
+def _payload(tmp_path: Path, slds: list[str], **options) -> CheckDomainsInput:
+    return CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com"],
+            "slds": slds,
+            "options": {
+                "enable_dns_fallback": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                **options,
+            },
+        }
+    )
+
+
+async def _run(payload: CheckDomainsInput) -> tuple[list, RunSummary]:
+    summary = RunSummary(tlds=payload.tlds, allow_unknown=False)
+    results = [result async for result in iter_check_domains(payload, summary)]
+    return results, summary
+
+
+@pytest.mark.asyncio
+async def test_prewarmed_http11_lane_reuses_its_connections(tmp_path: Path, monkeypatch) -> None:
+    slds = [f"name{i}" for i in range(40)]
+    async with StandinRDAPServer(registered=["name0.com"], latency=fixed_latency(0.01), handshake_latency=0.02) as server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": server.base_url}
+
+        monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+        results, summary = await _run(_payload(tmp_path, slds, max_concurrency=4))
+
+    assert {r.domain: r.status for r in results}["name0.com"] == "taken"
+    assert sum(r.status == "available" for r in results) == 39
+    (stats,) = summary.connections.values()
+    assert stats["requests"] == 40
+    assert stats["connections"] <= 4
+    assert stats["reused"] == 40
+    assert stats["prewarmed"] == 4
+    assert server.connections <= 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not http2_supported() or shutil.which("openssl") is None, reason="needs h2 and openssl")
+async def test_http2_multiplexes_a_lane_over_one_connection(tmp_path: Path, monkeypatch) -> None:
+    ssl_context, ca_file = self_signed_tls(tmp_path)
+    monkeypatch.setenv("SSL_CERT_FILE", str(ca_file))
+    slds = [f"name{i}" for i in range(40)]
+    async with StandinRDAPServer(latency=fixed_latency(0.01), ssl_context=ssl_context) as server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": server.base_url}
+
+        monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+        results, summary = await _run(_payload(tmp_path, slds, max_concurrency=20))
+
+    assert [r.status for r in results] == ["available"] * 40
+    (stats,) = summary.connections.values()
+    assert stats["http_versions"] == {"HTTP/2": 40}
+    assert stats["connections"] == 1
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_http2_option_falls_back_to_http11_without_h2(tmp_path: Path, monkeypatch) -> None:
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name, *args: None if name == "h2" else real_find_spec(name, *args))
+    http2_supported.cache_clear()
+    try:
+        # httpx itself raises ImportError for http2=True without h2; the option must not.
+        assert build_transport(4, http2=True)._pool._http2 is False
+        async with StandinRDAPServer(registered=["name0.com"]) as server:
+
+            async def fake_bootstrap(*_args, **_kwargs):
+                return {"com": server.base_url}
+
+            monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+            results, summary = await _run(_payload(tmp_path, ["name0", "name1"], http2=True))
+    finally:
+        http2_supported.cache_clear()
+
+    assert [r.status for r in results] == ["taken", "available"]
+    (stats,) = summary.connections.values()
+    assert stats["http_versions"] == {"HTTP/1.1": 2}
+
+
+@pytest.mark.asyncio
+async def test_prewarm_is_capped_and_paced_by_the_lane() -> None:
+    async with StandinRDAPServer() as server:
+        lane = ServerLane(server.base_url, 200, None, 1)
+        async with httpx.AsyncClient() as client:
+            lane.defer(0.2)
+            await prewarm_host(client, server.base_url, 200, lane=lane)
+            paused_for = time.monotonic() - (lane.paused_until - 0.2)
+
+    assert paused_for >= 0.2
+    assert server.requests == 1 + PREWARM_MAX_CONNECTIONS
+    assert lane.requests == 0
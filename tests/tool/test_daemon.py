@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.daemon import CheckerDaemon, DaemonError
+from domainscout_check.daemon_client import DaemonRequestError, daemon_request, forward_check
+from domainscout_check.resources import CheckerResources
+
+
+@pytest.mark.asyncio
+async def test_daemon_serves_checks_and_keeps_bootstrap_warm(tmp_path: Path, monkeypatch) -> None:
+    bootstrap_loads = 0
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        nonlocal bootstrap_loads
+        bootstrap_loads += 1
+        return {"com": "https://rdap.example"}
+
+    async def fake_query(_client, _base, domain):
+        status = "available" if domain.startswith("free") else "taken"
+        return status, 0.98, 404 if status == "available" else 200, None, None
+
+    monkeypatch.setattr("domainscout_check.resources.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+
+    socket_path = str(tmp_path / "check.sock")
+    payload = {
+        "tlds": [".com"],
+        "slds": ["freebird", "acme"],
+        "options": {"prewarm_connections": False, "bootstrap_cache_path": str(tmp_path / "rdap_dns.json")},
+    }
+
+    async with CheckerResources() as resources:
+        daemon = CheckerDaemon(resources, socket_path=socket_path)
+        await daemon.start()
+        try:
+            health = await asyncio.to_thread(daemon_request, "GET", "/health", socket_path=socket_path)
+            assert health is not None and health[0] == 200 and health[1]["status"] == "ok"
+
+            first = await asyncio.to_thread(forward_check, payload, socket_path)
+            second = await asyncio.to_thread(forward_check, payload, socket_path)
+            invalid = await asyncio.to_thread(forward_check, {"tlds": []}, socket_path)
+
+            with pytest.raises(DaemonError):
+                await CheckerDaemon(resources, socket_path=socket_path).start()
+        finally:
+            await daemon.close()
+
+    assert first is not None and first[0] == 200
+    assert first[1]["suggested_best"] == "freebird.com"
+    assert second is not None and second[1]["results"] == first[1]["results"]
+    assert invalid is not None and invalid[0] == 400
+    assert bootstrap_loads == 1
+    assert daemon.requests == 3
+    assert not Path(socket_path).exists()
+    assert (tmp_path / "results.jsonl").exists()
+
+
+def test_forward_check_returns_none_without_a_daemon(tmp_path: Path) -> None:
+    assert forward_check({"tlds": [".com"], "slds": ["acme"]}, socket_path=str(tmp_path / "missing.sock")) is None
+
+
+async def _raw_request(port: int, head: str, body: bytes = b"") -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode("latin-1") + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+@pytest.mark.asyncio
+async def test_tcp_daemon_refuses_foreign_hosts_origins_and_non_json_bodies(monkeypatch) -> None:
+    async def fake_check(*_args, **_kwargs):
+        raise AssertionError("refused requests must not reach the checker")
+
+    monkeypatch.setattr("domainscout_check.daemon.check_domains_table", fake_check)
+    body = b'{"tlds": [".com"], "slds": ["acme"], "options": {"cache_path": "/tmp/elsewhere.jsonl"}}'
+
+    async with CheckerResources() as resources:
+        daemon = CheckerDaemon(resources, port=0)
+        await daemon.start()
+        port = daemon.port
+        try:
+            rebound = await _raw_request(port, "POST /check HTTP/1.1\r\nHost: attacker.example:8080\r\nContent-Type: application/json\r\n", body)
+            cross_site = await _raw_request(
+                port,
+                f"POST /check HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nOrigin: https://attacker.example\r\nContent-Type: application/json\r\n",
+                body,
+            )
+            form_post = await _raw_request(port, f"POST /check HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nContent-Type: text/plain\r\n", body)
+            local_origin = await _raw_request(port, f"GET /health HTTP/1.1\r\nHost: [::1]:{port}\r\nOrigin: http://localhost:{port}\r\n")
+            health = await asyncio.to_thread(daemon_request, "GET", "/health", port=port)
+        finally:
+            await daemon.close()
+
+    assert (rebound, cross_site, form_post) == (403, 403, 415)
+    assert local_origin == 200
+    assert health is not None and health[0] == 200
+
+
+@pytest.mark.asyncio
+async def test_daemon_request_times_out_on_a_silent_daemon(tmp_path: Path) -> None:
+    async def never_answer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await asyncio.sleep(30)
+
+    socket_path = str(tmp_path / "silent.sock")
+    server = await asyncio.start_unix_server(never_answer, path=socket_path)
+    try:
+        # The daemon was reached, so the client reports the failure instead of rerunning locally.
+        with pytest.raises(DaemonRequestError):
+            await asyncio.to_thread(forward_check, {"tlds": [".com"], "slds": ["acme"]}, socket_path, None, 0.2)
+    finally:
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_tcp_daemon_ignores_the_cwd_header_and_the_client_sends_absolute_paths(tmp_path: Path, monkeypatch) -> None:
+    seen: list[str | None] = []
+
+    async def fake_check(payload, **_kwargs):
+        seen.append(payload.options.cache_path)
+        raise RuntimeError("stop here")
+
+    monkeypatch.setattr("domainscout_check.daemon.check_domains_table", fake_check)
+    monkeypatch.chdir(tmp_path)
+    body = b'{"tlds": [".com"], "slds": ["acme"], "options": {"cache_path": "verdicts.sqlite3"}}'
+
+    async with CheckerResources() as resources:
+        daemon = CheckerDaemon(resources, port=0)
+        await daemon.start()
+        port = daemon.port
+        try:
+            await _raw_request(
+                port,
+                f"POST /check HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nContent-Type: application/json\r\n"
+                "X-Domainscout-Cwd: /etc\r\n",
+                body,
+            )
+            await asyncio.to_thread(
+                forward_check, {"tlds": [".com"], "slds": ["acme"], "options": {"cache_path": "verdicts.sqlite3"}}, port=port
+            )
+        finally:
+            await daemon.close()
+
+    assert seen == ["verdicts.sqlite3", str(tmp_path / "verdicts.sqlite3")]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import check_domains
+from domainscout_check.dns_engine import AsyncDNSEngine, open_dns_engine, parse_nameserver
+from domainscout_check.models import CheckDomainsInput, DNSProbeEvidence
+
+from standins import StandinDNSServer, fixed_latency
+
+
+def test_parse_nameserver_specs() -> None:
+    assert parse_nameserver("10.0.0.1") == ("10.0.0.1", 53)
+    assert parse_nameserver("127.0.0.1:5353") == ("127.0.0.1", 5353)
+    assert parse_nameserver("[::1]:5353") == ("::1", 5353)
+    assert parse_nameserver("::1") == ("::1", 53)
+    with pytest.raises(ValueError):
+        parse_nameserver("127.0.0.1:70000")
+
+
+@pytest.mark.asyncio
+async def test_open_dns_engine_resolves_hostnames_and_drops_bad_specs() -> None:
+    engine = await open_dns_engine(["localhost:5353", "127.0.0.1:dns"])
+    assert engine is not None
+    try:
+        assert engine.nameservers in ([("127.0.0.1", 5353)], [("::1", 5353)])
+    finally:
+        await engine.close()
+
+    assert await open_dns_engine(["127.0.0.1:dns"]) is None
+
+
+@pytest.mark.asyncio
+async def test_engine_maps_ns_and_nxdomain_replies() -> None:
+    async with StandinDNSServer(registered=["taken.com"]) as server:
+        async with AsyncDNSEngine([("127.0.0.1", server.port)]) as engine:
+            assert await engine.probe("taken.com", 1.0) == DNSProbeEvidence(dns_ns=True)
+            assert await engine.probe("free.com", 1.0) == DNSProbeEvidence(dns_nxdomain=True)
+
+
+@pytest.mark.asyncio
+async def test_engine_multiplexes_many_queries_over_few_sockets() -> None:
+    registered = {f"name{i}.com" for i in range(0, 1000, 2)}
+    async with StandinDNSServer(registered=registered, latency=fixed_latency(0.05)) as server:
+        async with AsyncDNSEngine([("127.0.0.1", server.port)], sockets_per_family=2) as engine:
+            # Stand-in and engine share this loop's CPU, so the deadline leaves room for the burst.
+            evidence = await asyncio.gather(*(engine.probe(f"name{i}.com", 10.0) for i in range(1000)))
+            sockets = sum(len(protocols) for protocols in engine._sockets.values())
+
+    assert all(e.dns_ns for e in evidence[0::2])
+    assert all(e.dns_nxdomain for e in evidence[1::2])
+    assert engine.queries == 2000
+    assert sockets == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_times_out_without_reply() -> None:
+    async with StandinDNSServer(drop_rate=1.0) as server:
+        async with AsyncDNSEngine([("127.0.0.1", server.port)]) as engine:
+            assert await engine.probe("silent.com", 0.2) == DNSProbeEvidence()
+            assert engine.timeouts == 2
+
+
+@pytest.mark.asyncio
+async def test_check_domains_uses_async_engine_for_dns_fallback(tmp_path: Path, monkeypatch) -> None:
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {}
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+
+    async with StandinDNSServer(registered=["taken.com"]) as server:
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": [".com"],
+                "slds": ["taken", "free"],
+                "options": {
+                    "prefer_rdap": False,
+                    "dns_nameservers": [server.address],
+                    "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                },
+            }
+        )
+        output = await check_domains(payload)
+
+    by_domain = {r.domain: r for r in output.results}
+    assert by_domain["taken.com"].status == "taken"
+    assert by_domain["taken.com"].dns_ns is True
+    assert by_domain["free.com"].status == "available"
+    assert by_domain["free.com"].method == "dns"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine", ["thread", "async-unavailable"])
+async def test_dns_nameservers_are_honoured_without_the_async_engine(tmp_path: Path, monkeypatch, engine: str) -> None:
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {}
+
+    async def no_engine(_specs):
+        return None
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.open_dns_engine", no_engine)
+
+    async with StandinDNSServer(registered=["taken.com"]) as server:
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": [".com"],
+                "slds": ["taken", "free"],
+                "options": {
+                    "prefer_rdap": False,
+                    "dns_engine": "thread" if engine == "thread" else "async",
+                    "dns_nameservers": [server.address],
+                    "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                },
+            }
+        )
+        output = await check_domains(payload)
+
+    # Only the stand-in knows taken.com; the system resolver would not answer either way.
+    by_domain = {r.domain: r for r in output.results}
+    assert (by_domain["taken.com"].status, by_domain["taken.com"].dns_ns) == ("taken", True)
+    assert (by_domain["free.com"].status, by_domain["free.com"].dns_nxdomain) == ("available", True)
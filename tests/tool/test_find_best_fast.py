@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import check_domains
+from domainscout_check.models import CheckDomainsInput, DomainResult
+from domainscout_check.summary import PreferenceTarget
+
+
+def _result(domain: str, status: str) -> DomainResult:
+    return DomainResult(domain=domain, status=status, confidence=0.8, method="rdap")
+
+
+def test_preference_target_waits_for_the_preferred_tld_to_finish() -> None:
+    target = PreferenceTarget([".com", ".net"], slds_per_tld=2, target=1)
+
+    assert target.add(_result("alpha.net", "available")) is False
+    assert target.add(_result("alpha.com", "taken")) is False
+    assert target.add(_result("beta.com", "taken")) is True
+    assert target.stats.checked == 3
+    assert target.stats.skipped == 1
+
+
+def test_preference_target_accumulates_across_checked_tlds() -> None:
+    target = PreferenceTarget([".com", ".net"], slds_per_tld=2, target=2)
+
+    assert target.add(_result("alpha.com", "available")) is False
+    assert target.add(_result("beta.com", "taken")) is False
+    assert target.add(_result("alpha.net", "available")) is True
+
+
+@pytest.mark.asyncio
+async def test_find_best_fast_checks_the_first_tld_first_and_stops_early(tmp_path: Path, monkeypatch) -> None:
+    queried: list[str] = []
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.com.example", "net": "https://rdap.net.example", "io": "https://rdap.io.example"}
+
+    async def fake_query(_client, _base, domain):
+        queried.append(domain)
+        await asyncio.sleep(0.001)
+        if domain in {"name7.com", "name9.com"}:
+            return "available", 0.80, 404, None, None
+        return "taken", 0.98, 200, None, None
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".net", ".io"],
+            "slds": [f"name{idx}" for idx in range(200)],
+            "options": {
+                "find_best_fast": True,
+                "find_best_target": 2,
+                "max_concurrency": 4,
+                "prewarm_connections": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            },
+        }
+    )
+    output = await check_domains(payload)
+
+    assert output.suggested_best == "name7.com"
+    assert all(domain.endswith(".com") for domain in queried)
+    assert len(queried) < 20
+    assert output.early_stop is not None and output.early_stop.triggered
+    assert output.early_stop.checked == len(output.results)
+    assert output.early_stop.skipped == 600 - len(output.results)
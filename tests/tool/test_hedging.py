@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from domainscout_check.hedging import LatencyWindow, RDAPHedger
+from domainscout_check.scheduler import ServerLane
+
+
+def test_latency_window_needs_samples_before_reporting_a_percentile() -> None:
+    window = LatencyWindow()
+    for idx in range(19):
+        window.add(idx / 100)
+    assert window.percentile(95) is None
+
+    for idx in range(19, 100):
+        window.add(idx / 100)
+    assert window.percentile(50) == pytest.approx(0.50)
+    assert window.percentile(95) == pytest.approx(0.95)
+
+
+async def _prime(hedger: RDAPHedger, base: str, count: int = 30) -> None:
+    async def fast(_base: str):
+        await asyncio.sleep(0.005)
+        return "taken", 0.98, 200, None, None
+
+    for _ in range(count):
+        await hedger.query(fast, base, base)
+
+
+@pytest.mark.asyncio
+async def test_hedge_answers_a_stalled_request_and_reports_latency_saved() -> None:
+    hedger = RDAPHedger(percentile=90, budget_percent=10)
+    calls: list[str] = []
+    await _prime(hedger, "https://primary.example")
+
+    async def stalled_primary(base: str):
+        calls.append(base)
+        await asyncio.sleep(0.3 if base == "https://primary.example" else 0.005)
+        return "available", 0.80, 404, None, None
+
+    answer = await asyncio.wait_for(
+        hedger.query(stalled_primary, "https://primary.example", "https://fallback.example"),
+        timeout=0.2,
+    )
+    assert answer[2] == 404
+    assert calls[-1] == "https://fallback.example"
+    assert hedger.hedges == 1 and hedger.hedge_wins == 1
+
+    await asyncio.sleep(0.35)
+    assert hedger.latency_saved_s > 0.2
+    await hedger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedges_stay_within_the_budget() -> None:
+    hedger = RDAPHedger(percentile=50, budget_percent=5)
+    await _prime(hedger, "https://rdap.example")
+
+    async def jittery(_base: str):
+        await asyncio.sleep(0.005 if hedger.requests % 2 else 0.05)
+        return "taken", 0.98, 200, None, None
+
+    await asyncio.gather(*(hedger.query(jittery, "https://rdap.example", "https://rdap.example") for _ in range(200)))
+
+    assert hedger.hedges > 0
+    assert hedger.hedges <= 0.05 * hedger.requests
+    assert hedger.budget_denied > 0
+    await hedger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_definitive_hedge_answer_beats_a_failed_primary() -> None:
+    hedger = RDAPHedger(percentile=50, budget_percent=50)
+    await _prime(hedger, "https://rdap.example")
+
+    async def flaky(base: str):
+        if base == "https://rdap.example":
+            await asyncio.sleep(0.02)
+            return "unknown", 0.25, 503, None, None
+        await asyncio.sleep(0.05)
+        return "taken", 0.98, 200, None, None
+
+    answer = await hedger.query(flaky, "https://rdap.example", "https://fallback.example")
+    assert answer[2] == 200
+    assert hedger.hedge_wins == 1
+    await hedger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedges_take_a_lane_slot_and_stragglers_keep_it() -> None:
+    hedger = RDAPHedger(percentile=50, budget_percent=100)
+    await _prime(hedger, "https://rdap.example")
+    lane = ServerLane("https://rdap.example", 2, None, 1)
+
+    async def stalled(base: str):
+        await asyncio.sleep(0.2 if hedger.hedges == 0 else 0.01)
+        return "available", 0.80, 404, None, None
+
+    # The lookup itself holds one of the two slots, as _lookup_domain would.
+    async with lane.slots:
+        answer = await hedger.query(stalled, "https://rdap.example", "https://rdap.example", lane=lane)
+    assert answer[2] == 404 and hedger.hedge_wins == 1
+    assert lane.requests == 1
+    # The primary is still running: it keeps the hedge's slot after the lookup let go of its own.
+    async with lane.slots:
+        assert lane.slots.locked()
+    await asyncio.sleep(0.25)
+    async with lane.slots:
+        assert not lane.slots.locked()
+
+    async with lane.slots, lane.slots:
+        await hedger.query(stalled, "https://rdap.example", "https://rdap.example", lane=lane)
+    assert hedger.lane_denied == 1
+    await hedger.aclose()
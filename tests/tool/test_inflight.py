@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import check_domains
+from domainscout_check.inflight import InflightTable
+from domainscout_check.models import CheckDomainsInput
+
+
+@pytest.mark.asyncio
+async def test_inflight_table_shares_one_call_between_concurrent_callers() -> None:
+    table: InflightTable[str] = InflightTable()
+    calls = 0
+
+    async def lookup() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "taken"
+
+    outcomes = await asyncio.gather(*(table.run("alpha.com", lookup) for _ in range(3)))
+
+    assert calls == 1
+    assert sorted(shared for _, shared in outcomes) == [False, True, True]
+    assert all(result == "taken" for result, _ in outcomes)
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_inflight_table_recovers_when_leader_is_cancelled() -> None:
+    table: InflightTable[str] = InflightTable()
+    started = asyncio.Event()
+
+    async def hanging() -> str:
+        started.set()
+        await asyncio.sleep(10)
+        return "never"
+
+    async def quick() -> str:
+        return "available"
+
+    leader = asyncio.create_task(table.run("alpha.com", hanging))
+    await started.wait()
+    follower = asyncio.create_task(table.run("alpha.com", quick))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("available", False)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_check_domains_calls_share_rdap_requests(tmp_path: Path, monkeypatch) -> None:
+    queried: Counter[str] = Counter()
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.example"}
+
+    async def fake_query(_client, _base, domain):
+        queried[domain] += 1
+        await asyncio.sleep(0.05)
+        return "taken", 0.98, 200, None, None
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+
+    def payload(slds: list[str]) -> CheckDomainsInput:
+        return CheckDomainsInput.model_validate(
+            {
+                "tlds": [".com"],
+                "slds": slds,
+                "options": {
+                    "prewarm_connections": False,
+                    "dns_engine": "thread",
+                    "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                },
+            }
+        )
+
+    first, second = await asyncio.gather(
+        check_domains(payload(["alpha", "beta", "gamma"])),
+        check_domains(payload(["beta", "gamma", "delta"])),
+    )
+
+    assert queried == Counter({"alpha.com": 1, "beta.com": 1, "gamma.com": 1, "delta.com": 1})
+    assert [r.status for r in first.results + second.results] == ["taken"] * 6
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import check_domains
+from domainscout_check.daemon import CheckerDaemon
+from domainscout_check.metrics import Histogram, MetricsRegistry, RunMetrics
+from domainscout_check.models import CheckDomainsInput, DomainResult
+from domainscout_check.resources import CheckerResources
+
+from standins import StandinDNSServer, StandinRDAPServer
+
+
+def test_histogram_quantiles_and_openmetrics_rendering() -> None:
+    histogram = Histogram()
+    for value in [0.004] * 90 + [0.3] * 9 + [20.0]:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.95) == 0.5
+    assert histogram.quantile(1.0) == 10.0
+
+    run = RunMetrics()
+    run.record_rdap('https://rdap.ex"ample', 0.02, 200, None)
+    run.record_rdap('https://rdap.ex"ample', 2.5, None, "timeout")
+    run.record_lookup(".com", 0.03, DomainResult(domain="a.com", status="taken", confidence=0.7, method="rdap+dns"))
+    run.finish()
+    registry = MetricsRegistry()
+    registry.add_run(run)
+    registry.add_run(run)
+    text = registry.render_openmetrics()
+
+    assert 'domainscout_rdap_responses_total{server="https://rdap.ex\\"ample",code="200"} 2' in text
+    assert 'domainscout_rdap_timeouts_total{server="https://rdap.ex\\"ample"} 2' in text
+    assert 'domainscout_dns_fallbacks_total{tld=".com"} 2' in text
+    assert 'domainscout_lookup_seconds_bucket{tld=".com",le="0.05"} 2' in text
+    assert "domainscout_runs_total 2" in text
+    assert text.endswith("# EOF\n")
+
+
+@pytest.mark.asyncio
+async def test_stats_block_reports_codes_retries_and_fallbacks(tmp_path: Path, monkeypatch) -> None:
+    slds = [f"name{i}" for i in range(40)]
+    async with StandinDNSServer() as dns_server, StandinRDAPServer(registered={"name0.com"}, error_rate=0.2, seed=1) as rdap_server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": rdap_server.base_url}
+
+        monkeypatch.setattr("domainscout_check.resources.load_bootstrap_map", fake_bootstrap)
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": [".com"],
+                "slds": slds,
+                "options": {
+                    "include_stats": True,
+                    "prewarm_connections": False,
+                    "max_concurrency": 4,
+                    "rdap_breaker_threshold": 100,
+                    "http2": False,
+                    "dns_nameservers": [dns_server.address],
+                    "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                },
+            }
+        )
+        async with CheckerResources() as resources:
+            output = await check_domains(payload, resources=resources)
+            metrics_text = (await CheckerDaemon(resources, port=0).dispatch("GET", "/metrics", b"", {}))[1]
+
+    assert output.stats is not None
+    server = output.stats["rdap_servers"][rdap_server.base_url]
+    assert server["requests"] == rdap_server.requests
+    assert server["http_codes"]["503"] == rdap_server.statuses[503]
+    assert server["retries"] > 0
+    assert server["slot_wait"]["count"] == 40
+    tld = output.stats["tlds"][".com"]
+    assert tld["lookups"] == 40
+    fallbacks = sum(r.method in {"dns", "rdap+dns"} for r in output.results)
+    assert tld["dns_fallbacks"] == fallbacks
+    assert output.stats["first_result_s"] <= output.stats["wall_s"]
+
+    assert 'domainscout_lookup_seconds_count{tld=".com"} 40' in metrics_text
+    logged = json.loads((tmp_path / "results.jsonl").read_text().splitlines()[-1])
+    assert logged["stats"]["tlds"][".com"]["lookups"] == 40
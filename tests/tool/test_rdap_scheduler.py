@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import _rdap_with_retry, check_domains
+from domainscout_check.models import CheckDomainsInput, DNSProbeEvidence, ToolOptions
+from domainscout_check.rdap import parse_retry_after
+from domainscout_check.scheduler import CircuitBreaker, RDAPScheduler, RetryBudget, ServerLane, TokenBucket
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412500.0) == 10.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412500.0) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_burst() -> None:
+    bucket = TokenBucket(rate=100.0, burst=1)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_saturated_lane_does_not_block_other_servers() -> None:
+    scheduler = RDAPScheduler(
+        ToolOptions(max_concurrency=4),
+        ["https://slow.example", "https://fast.example"],
+    )
+    assert scheduler.lane("https://slow.example").concurrency == 2
+
+    release = asyncio.Event()
+
+    async def hold_slow_slot() -> None:
+        async with scheduler.slot("https://slow.example"):
+            await release.wait()
+
+    holders = [asyncio.create_task(hold_slow_slot()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    async with scheduler.slot("https://fast.example") as lane:
+        assert lane.base == "https://fast.example"
+
+    release.set()
+    await asyncio.gather(*holders)
+
+
+@pytest.mark.asyncio
+async def test_rdap_retry_honors_retry_after_for_the_whole_lane(monkeypatch) -> None:
+    responses = [
+        ("unknown", 0.25, 429, None, 0.2),
+        ("taken", 0.98, 200, None, None),
+    ]
+    call_times: list[float] = []
+
+    async def fake_query(_client, _base, _domain):
+        call_times.append(time.monotonic())
+        return responses.pop(0)
+
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+    scheduler = RDAPScheduler(ToolOptions(), ["https://rdap.example"])
+    lane = scheduler.lane("https://rdap.example")
+
+    result = await _rdap_with_retry(None, "https://rdap.example", "alpha.com", lane=lane)
+
+    assert result == ("taken", 0.98, 200, None)
+    assert call_times[1] - call_times[0] >= 0.19
+    assert lane.snapshot()["throttled"] == 1
+    assert lane.snapshot()["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rdap_retry_caps_retry_after(monkeypatch) -> None:
+    responses = [
+        ("unknown", 0.25, 503, None, 3600.0),
+        ("available", 0.80, 404, None, None),
+    ]
+
+    async def fake_query(_client, _base, _domain):
+        return responses.pop(0)
+
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+    scheduler = RDAPScheduler(ToolOptions(), ["https://rdap.example"])
+    lane = scheduler.lane("https://rdap.example")
+
+    started = time.monotonic()
+    result = await _rdap_with_retry(None, "https://rdap.example", "alpha.com", lane=lane, max_retry_after=0.05)
+
+    assert result[0] == "available"
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_final_throttled_attempt_still_pauses_the_lane(monkeypatch) -> None:
+    async def fake_query(_client, _base, _domain):
+        return "unknown", 0.25, 429, None, 0.2
+
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+    scheduler = RDAPScheduler(ToolOptions(), ["https://rdap.example"])
+    lane = scheduler.lane("https://rdap.example")
+
+    result = await _rdap_with_retry(None, "https://rdap.example", "alpha.com", retries=0, lane=lane)
+
+    assert result[2] == 429
+    assert lane.paused_until - time.monotonic() > 0.1
+    assert lane.snapshot()["throttled"] == 1
+
+
+def test_circuit_breaker_opens_half_opens_and_recovers() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=3, cooldown=10.0, clock=lambda: now[0])
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    assert [(t["from"], t["to"]) for t in breaker.transitions] == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+    assert breaker.rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_throttled_or_cancelled_probe_hands_the_probe_back(monkeypatch) -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=1, cooldown=10.0, clock=lambda: now[0])
+    lane = ServerLane("https://rdap.example", 4, None, 1, clock=lambda: now[0], breaker=breaker)
+    breaker.allow()
+    breaker.record_failure()
+    now[0] = 10.0
+    replies = [("unknown", 0.25, 429, None, 0.0), ("unknown", 0.25, 503, None, 0.0)]
+    hang = asyncio.Event()
+
+    async def fake_query(_client, _base, _domain):
+        if not replies:
+            await hang.wait()
+        return replies.pop(0)
+
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+
+    # 429, then 503 with Retry-After: throttling, neither closes nor re-opens the breaker.
+    for _ in range(2):
+        result = await _rdap_with_retry(None, "https://rdap.example", "alpha.com", retries=0, lane=lane)
+        assert result[1:3] != (None, "circuit_open")
+        assert breaker.state == "half_open"
+
+    probe = asyncio.create_task(_rdap_with_retry(None, "https://rdap.example", "alpha.com", retries=0, lane=lane))
+    await asyncio.sleep(0)
+    assert not breaker.allow()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    now[0] = 1000.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retry_budget_caps_retries_to_a_fraction_of_requests() -> None:
+    budget = RetryBudget(percent=10, floor=0)
+    for _ in range(50):
+        budget.record_request()
+
+    granted = sum(budget.try_spend() for _ in range(20))
+
+    assert granted == 5
+    assert budget.snapshot() == {"requests": 50, "retries": 5, "denied": 15}
+
+
+@pytest.mark.asyncio
+async def test_dead_rdap_server_trips_the_breaker_and_falls_back_to_dns(tmp_path: Path, monkeypatch) -> None:
+    attempts: list[str] = []
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.com.example", "io": "https://rdap.io.example"}
+
+    async def fake_query(_client, base, domain):
+        attempts.append(domain)
+        if base == "https://rdap.io.example":
+            return "unknown", 0.25, None, "timeout", None
+        return "taken", 0.98, 200, None, None
+
+    async def fake_dns(_domain, _timeout_ms, engine=None, nameservers=None):
+        return DNSProbeEvidence(dns_nxdomain=True)
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+    monkeypatch.setattr("domainscout_check.checker.probe_domain_dns", fake_dns)
+
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".io"],
+            "slds": [f"name{idx}" for idx in range(40)],
+            "options": {
+                "max_concurrency": 2,
+                "rdap_breaker_threshold": 3,
+                "prewarm_connections": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            },
+        }
+    )
+    output = await check_domains(payload)
+
+    io_results = [r for r in output.results if r.domain.endswith(".io")]
+    assert all(r.status == "available" and r.method == "rdap+dns" for r in io_results)
+    assert sum(r.error == "circuit_open" for r in io_results) >= 35
+    assert sum(domain.endswith(".io") for domain in attempts) < 10
+    assert all(r.status == "taken" for r in output.results if r.domain.endswith(".com"))
+
+    run_log = json.loads((tmp_path / "results.jsonl").read_text().splitlines()[-1])
+    breaker = run_log["rdap_servers"]["https://rdap.io.example"]["breaker"]
+    assert breaker["transitions"][0]["to"] == "open"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from domainscout_check.checker import check_domains, check_domains_table, output_document, output_json
+from domainscout_check.models import CheckDomainsInput, CheckDomainsOutput, DomainResult
+from domainscout_check.result_table import ResultTable
+
+RESULTS = [
+    DomainResult(domain="beta.io", status="available", confidence=0.8, method="rdap", rdap_server="https://rdap.io/", rdap_http=404),
+    DomainResult(domain="alpha.io", status="taken", confidence=0.98, method="rdap", rdap_server="https://rdap.io/", rdap_http=200),
+    DomainResult(
+        domain="alpha.com",
+        status="unknown",
+        confidence=0.2,
+        method="rdap+dns",
+        rdap_server="https://rdap.verisign.com/com/v1/",
+        dns_nxdomain=False,
+        dns_ns=None,
+        dns_soa=True,
+        error="timeout",
+    ),
+    DomainResult(domain="gamma.de", status="available", confidence=0.65, method="dns", dns_nxdomain=True, dns_ns=False, dns_soa=False),
+    DomainResult(domain="zeta.com", status="taken", confidence=0.95, method="zone"),
+    DomainResult(domain="-bad.com", status="invalid", confidence=1.0, method="rdap", error="invalid_sld"),
+    DomainResult(domain="omega.io", status="unknown", confidence=0.25, method="rdap", error='HTTP 503 "busy"\nnaïve', backend="rdap"),
+]
+
+
+def test_rows_round_trip_model_dump_in_tld_order() -> None:
+    table = ResultTable()
+    for result in RESULTS:
+        table.append(result)
+    table.sort_by_tld()
+
+    expected = sorted(RESULTS, key=lambda r: (r.domain.rsplit(".", 1)[1], r.domain))
+    assert [row["domain"] for row in table.iter_rows()] == [
+        "-bad.com",
+        "alpha.com",
+        "zeta.com",
+        "gamma.de",
+        "alpha.io",
+        "beta.io",
+        "omega.io",
+    ]
+    assert list(table.iter_rows()) == [result.model_dump(mode="json") for result in expected]
+    assert list(table.iter_results()) == expected
+    assert table.errors == {0: "invalid_sld", 1: "timeout", 6: 'HTTP 503 "busy"\nnaïve'}
+    assert table.row(1)["dns_ns"] is None
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"status": "maybe"},
+        {"confidence": 1.5},
+        {"method": "whois"},
+        {"backend": "carrier-pigeon"},
+        {"domain": "a."},
+        {"rdap_http": "404"},
+        {"dns_ns": "yes"},
+    ],
+)
+def test_append_rejects_rows_that_skipped_model_validation(fields) -> None:
+    base = {"domain": "alpha.com", "status": "taken", "confidence": 0.98, "method": "rdap"}
+    table = ResultTable()
+
+    with pytest.raises(ValueError, match="row schema"):
+        table.append(DomainResult.model_construct(**{**base, **fields}))
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_output_document_matches_check_domains(tmp_path) -> None:
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".io", ".com", ".de"],
+            "slds": ["pixelforge", "tinyarcade", "-bad"],
+            "options": {"deterministic_mode": True, "bootstrap_cache_path": str(tmp_path / "rdap_dns.json")},
+        }
+    )
+    table, summary = await check_domains_table(payload)
+    document = output_document(table, summary)
+
+    assert document == (await check_domains(payload)).model_dump(mode="json")
+    CheckDomainsOutput.model_validate(document)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_results_json_renders_exactly_what_json_dumps_would(indent) -> None:
+    table = ResultTable()
+    assert table.results_json(indent) == "[]"
+    for result in RESULTS:
+        table.append(result)
+    table.sort_by_tld()
+
+    assert table.results_json(indent, depth=0) == json.dumps(list(table.iter_rows()), indent=indent)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("indent", [None, 2])
+async def test_output_json_matches_output_document(tmp_path, indent) -> None:
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".io", ".com"],
+            "slds": ["pixelforge", "-bad"],
+            "options": {"deterministic_mode": True, "bootstrap_cache_path": str(tmp_path / "rdap_dns.json")},
+        }
+    )
+    table, summary = await check_domains_table(payload)
+
+    assert output_json(table, summary, include_stats=True, indent=indent) == json.dumps(
+        output_document(table, summary, include_stats=True), indent=indent
+    )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import itertools
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import iter_check_domains
+from domainscout_check.models import CheckDomainsInput, ToolOptions
+from domainscout_check.scheduler import ServerLane, SharedPauses
+from domainscout_check.sharding import shard_count, shard_options
+from domainscout_check.summary import RunSummary
+
+from standins import StandinRDAPServer, fixed_latency
+
+
+def _payload(tmp_path: Path, slds: list[str], **options) -> CheckDomainsInput:
+    return CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".net"],
+            "slds": slds,
+            "options": {
+                "enable_dns_fallback": False,
+                "prewarm_connections": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                **options,
+            },
+        }
+    )
+
+
+def test_shard_options_add_up_to_the_run_limits() -> None:
+    options = ToolOptions(
+        shards=4,
+        max_concurrency=10,
+        rdap_server_concurrency=6,
+        rdap_rate_limit_per_server=8.0,
+        rdap_rate_burst=5,
+        rdap_breaker_threshold=5,
+        zone_index_dir="zones",
+    )
+    n = shard_count(options, 1000)
+    parts = [shard_options(options, n, idx) for idx in range(n)]
+
+    assert n == 4
+    assert sum(p.max_concurrency for p in parts) == 10
+    assert sum(p.rdap_server_concurrency for p in parts) == 6
+    assert sum(p.rdap_rate_limit_per_server for p in parts) == pytest.approx(8.0)
+    assert sum(p.rdap_rate_burst for p in parts) == 5
+    assert all(p.rdap_breaker_threshold == 2 for p in parts)
+    assert all(p.shards == 1 and p.cache_mode == "bypass" and p.zone_index_dir is None for p in parts)
+
+
+def test_shard_count_never_leaves_a_shard_without_a_slot_or_token() -> None:
+    assert shard_count(ToolOptions(shards=8, max_concurrency=3), 1000) == 3
+    assert shard_count(ToolOptions(shards=8, rdap_server_concurrency=2), 1000) == 2
+    assert shard_count(ToolOptions(shards=8, rdap_rate_limit_per_server=5.0, rdap_rate_burst=3), 1000) == 3
+    assert shard_count(ToolOptions(shards=8), 2) == 2
+
+
+@pytest.mark.asyncio
+async def test_sharded_run_matches_a_single_process_run(tmp_path: Path, monkeypatch) -> None:
+    slds = [f"name{i}" for i in range(30)]
+    registered = [f"name{i}.com" for i in range(0, 30, 3)] + ["name1.net"]
+    async with StandinRDAPServer(registered=registered, latency=fixed_latency(0.005)) as server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": server.base_url, "net": server.base_url}
+
+        monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+        monkeypatch.setattr("domainscout_check.sharding.load_bootstrap_map", fake_bootstrap)
+
+        runs = {}
+        for shards in (1, 2):
+            summary = RunSummary(tlds=[".com", ".net"], allow_unknown=False)
+            payload = _payload(tmp_path, slds, shards=shards, max_concurrency=8)
+            results = [result async for result in iter_check_domains(payload, summary)]
+            runs[shards] = ({r.domain: r.status for r in results}, summary)
+
+    single, sharded = runs[1], runs[2]
+    assert sharded[0] == single[0]
+    assert len(sharded[0]) == 60 and sum(s == "taken" for s in sharded[0].values()) == 11
+    assert sharded[1].suggested_best == single[1].suggested_best
+    (lane,) = sharded[1].rdap_servers.values()
+    (single_lane,) = single[1].rdap_servers.values()
+    assert lane["requests"] == single_lane["requests"] == 60
+    assert server.requests == 120
+
+
+@pytest.mark.asyncio
+async def test_a_retry_after_pause_holds_the_lane_in_every_shard() -> None:
+    shared = SharedPauses(["https://rdap.example"], get_context("spawn"))
+    throttled = ServerLane("https://rdap.example", 4, None, 1, shared=shared)
+    other_shard = ServerLane("https://rdap.example", 4, None, 1, shared=shared)
+
+    throttled.defer(0.3)
+    started = time.monotonic()
+    await other_shard.pace()
+
+    assert time.monotonic() - started >= 0.25
+    assert shared.until("https://unknown.example") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_sharded_results_stream_before_the_shards_finish(tmp_path: Path, monkeypatch) -> None:
+    calls = itertools.count()
+    requested_at: list[float] = []
+
+    def stalling(_rng) -> float:
+        # Every tenth request stalls for a second, so no shard can finish in under a second.
+        requested_at.append(time.monotonic())
+        return 1.0 if next(calls) % 10 == 0 else 0.0
+
+    async with StandinRDAPServer(latency=stalling) as server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": server.base_url, "net": server.base_url}
+
+        monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+        monkeypatch.setattr("domainscout_check.sharding.load_bootstrap_map", fake_bootstrap)
+        summary = RunSummary(tlds=[".com", ".net"], allow_unknown=False)
+        payload = _payload(tmp_path, [f"name{i}" for i in range(40)], shards=2, max_concurrency=8)
+
+        arrivals = [time.monotonic() async for _result in iter_check_domains(payload, summary)]
+
+    assert len(arrivals) == 80
+    assert arrivals[0] - requested_at[0] < 0.5
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from domainscout_check.checker import check_domains
+from domainscout_check.models import CheckDomainsInput
+
+from standins import StandinDNSServer, StandinRDAPServer
+
+
+@pytest.mark.asyncio
+async def test_real_checker_rides_out_injected_throttling_errors_and_hangs(tmp_path: Path, monkeypatch) -> None:
+    slds = [f"name{i}" for i in range(60)]
+    registered = {f"name{i}.com" for i in range(0, 60, 3)}
+    async with StandinDNSServer(registered=registered) as dns_server, StandinRDAPServer(
+        registered=registered,
+        throttle_rate=0.05,
+        retry_after=0,
+        error_rate=0.05,
+        hang_rate=0.02,
+        hang_seconds=1.0,
+        seed=3,
+    ) as rdap_server:
+
+        async def fake_bootstrap(*_args, **_kwargs):
+            return {"com": rdap_server.base_url}
+
+        monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+        payload = CheckDomainsInput.model_validate(
+            {
+                "tlds": [".com"],
+                "slds": slds,
+                "options": {
+                    "timeout_ms": 200,
+                    "max_concurrency": 8,
+                    "http2": False,
+                    "dns_nameservers": [dns_server.address],
+                    "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                },
+            }
+        )
+        output = await check_domains(payload)
+
+    by_domain = {r.domain: r.status for r in output.results}
+    assert len(by_domain) == 60
+    assert all(by_domain[domain] == "taken" for domain in registered)
+    assert sum(status == "available" for status in by_domain.values()) == 40
+    assert rdap_server.statuses[429] > 0 and rdap_server.statuses[503] > 0
+    assert rdap_server.requests > 60
+
+
+@pytest.mark.asyncio
+async def test_rdap_standin_closes_connections_over_its_limit() -> None:
+    async with StandinRDAPServer(max_connections=1, hang_rate=1.0, hang_seconds=0.3) as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as first, httpx.AsyncClient(base_url=server.base_url) as second:
+            held = asyncio.create_task(first.get("/domain/a.com"))
+            while server.connections == 0:
+                await asyncio.sleep(0.01)
+            with pytest.raises(httpx.TransportError):
+                await second.get("/help")
+            assert (await held).status_code == 404
+
+    assert server.refused == 1
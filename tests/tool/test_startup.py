@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+# Cumulative import time of everything the command loads after interpreter start-up
+# (``site`` excluded), as reported by ``python -X importtime``.
+HELP_IMPORT_BUDGET_MS = 75
+DETERMINISTIC_IMPORT_BUDGET_MS = 450
+
+
+def _import_profile(tmp_path: Path, *argv: str) -> tuple[float, set[str]]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT / "tools" / "check_domains" / "src")]),
+        "UV": "uv",
+        "VIRTUAL_ENV": str(ROOT / ".venv"),
+    }
+    code = f"import sys; sys.argv = ['domainscout-check', *{list(argv)!r}]; from domainscout_check.cli import main; main()"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    total_us = 0
+    modules: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.add(name.strip())
+        if not name.startswith(" ") or name[1:2] != " ":
+            top_level = name.strip()
+            if top_level != "site":
+                total_us += int(cumulative_us)
+    return total_us / 1000, modules
+
+
+def test_help_starts_without_heavy_imports(tmp_path: Path) -> None:
+    elapsed_ms, modules = _import_profile(tmp_path, "--help")
+
+    assert not modules & {"asyncio", "pydantic", "httpx", "dns.resolver", "jsonschema", "http.client"}
+    assert elapsed_ms < HELP_IMPORT_BUDGET_MS
+
+
+def test_deterministic_run_skips_the_network_stack(tmp_path: Path) -> None:
+    payload = {"tlds": [".com"], "slds": ["pixelforge"], "options": {"deterministic_mode": True}}
+    (tmp_path / "in.json").write_text(json.dumps(payload))
+
+    elapsed_ms, modules = _import_profile(tmp_path, "--input", "in.json", "--output", "out.json")
+
+    assert json.loads((tmp_path / "out.json").read_text())["results"]
+    assert not modules & {"httpx", "dns.resolver", "sqlite3", "jsonschema", "mmap"}
+    assert elapsed_ms < DETERMINISTIC_IMPORT_BUDGET_MS
+
+
+
+def test_lazily_bound_names_survive_mock_patch() -> None:
+    # A fresh process, so the patch is the first touch: mock.patch deletes a lazily bound
+    # name on exit instead of restoring it, and the checker must bind it again.
+    code = (
+        "from unittest import mock\n"
+        "from domainscout_check import checker, rdap\n"
+        "with mock.patch.object(checker, 'load_bootstrap_map', None):\n"
+        "    pass\n"
+        "assert checker.__dict__['load_bootstrap_map'] is rdap.load_bootstrap_map\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT / "tools" / "check_domains" / "src")])}
+    proc = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr[-2000:]
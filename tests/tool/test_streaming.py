@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.checker import check_domains, iter_check_domains
+from domainscout_check.models import CheckDomainsInput, DomainResult
+from domainscout_check.summary import RunSummary
+
+
+@pytest.mark.asyncio
+async def test_iter_check_domains_yields_results_as_they_complete(tmp_path: Path, monkeypatch) -> None:
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.example"}
+
+    async def fake_check_one_domain(domain, tld, payload, ctx):
+        _ = (tld, payload, ctx)
+        await asyncio.sleep(0.5 if domain == "slow.com" else 0.0)
+        status = "available" if domain == "fast.com" else "taken"
+        return DomainResult(domain=domain, status=status, confidence=0.8, method="rdap")
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker._check_one_domain", fake_check_one_domain)
+
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com"],
+            "slds": ["slow", "fast", "bad.name"],
+            "options": {
+                "prewarm_connections": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            },
+        }
+    )
+    summary = RunSummary(tlds=[".com"], allow_unknown=False)
+
+    started = time.monotonic()
+    arrivals: list[tuple[str, float]] = []
+    async for result in iter_check_domains(payload, summary):
+        arrivals.append((result.domain, time.monotonic() - started))
+
+    assert [domain for domain, _ in arrivals] == ["bad.name.com", "fast.com", "slow.com"]
+    assert arrivals[1][1] < 0.25
+    assert summary.suggested_best == "fast.com"
+    assert summary.counts == {"available": 1, "taken": 1, "unknown": 0, "invalid": 1}
+    assert summary.checked_at is not None
+
+    output = await check_domains(payload)
+    assert output.suggested_best == summary.suggested_best
+    assert [r.domain for r in output.results] == ["bad.name.com", "fast.com", "slow.com"]
+
+
+def test_cli_ndjson_streams_one_line_per_result_and_a_summary(tmp_path: Path, monkeypatch, capsys) -> None:
+    import domainscout_check.cli as cli_module
+
+    input_path = tmp_path / "in.json"
+    input_path.write_text(
+        json.dumps(
+            {
+                "tlds": [".com", ".io"],
+                "slds": ["agentforge", "codepilot", "devmesh"],
+                "options": {"deterministic_mode": True, "treat_unknown_as_available": True},
+            }
+        )
+    )
+    monkeypatch.setattr(cli_module, "require_uv_project_env", lambda: None)
+    monkeypatch.setattr(sys, "argv", ["domainscout-check", "--input", str(input_path), "--format", "ndjson"])
+
+    assert cli_module.main() == 0
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(lines) == 7
+    assert all("domain" in line for line in lines[:-1])
+
+    payload = CheckDomainsInput.model_validate(json.loads(input_path.read_text()))
+    expected = asyncio.run(check_domains(payload))
+    assert lines[-1]["summary"]["suggested_best"] == expected.suggested_best
+    assert lines[-1]["summary"]["checked_at"] == "1970-01-01T00:00:00Z"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from domainscout_check.cache import VerdictCache, verdict_cache_path, verdict_ttl_seconds
+from domainscout_check.checker import check_domains
+from domainscout_check.models import CACHE_MODE_ENV, CheckDomainsInput, DomainResult, ToolOptions
+
+
+def test_verdict_ttl_depends_on_status_and_method() -> None:
+    options = ToolOptions(cache_ttl_taken_seconds=3600 * 72, cache_ttl_available_seconds=3600 * 4)
+
+    taken = DomainResult(domain="a.com", status="taken", confidence=0.98, method="rdap", rdap_http=200)
+    available = DomainResult(domain="b.com", status="available", confidence=0.8, method="rdap", rdap_http=404)
+    dns_taken = DomainResult(domain="c.com", status="taken", confidence=0.7, method="rdap+dns", dns_ns=True)
+    unknown = DomainResult(domain="d.com", status="unknown", confidence=0.25, method="rdap", error="timeout")
+
+    assert verdict_ttl_seconds(taken, options) == 3600 * 72
+    assert verdict_ttl_seconds(available, options) == 3600 * 4
+    assert verdict_ttl_seconds(dns_taken, options) == 3600 * 4
+    assert verdict_ttl_seconds(unknown, options) is None
+
+
+def test_verdict_cache_expires_entries(tmp_path: Path) -> None:
+    cache = VerdictCache(tmp_path / "verdicts.sqlite3")
+    result = DomainResult(domain="a.com", status="taken", confidence=0.98, method="rdap", rdap_http=200)
+    cache.put(result, ttl_seconds=60, now=1000.0)
+    assert cache.flush() == 1
+
+    assert cache.get_many(["a.com", "b.com"], now=1030.0) == {"a.com": result}
+    assert cache.get_many(["a.com"], now=1061.0) == {}
+    assert cache.purge_expired(now=1061.0) == 1
+    cache.close()
+
+
+def test_verdict_cache_lives_next_to_the_bootstrap_cache(monkeypatch) -> None:
+    assert verdict_cache_path(ToolOptions(bootstrap_cache_path="state/rdap_dns.json")) == Path("state/verdicts.sqlite3")
+    assert verdict_cache_path(ToolOptions(cache_path="elsewhere.sqlite3")) == Path("elsewhere.sqlite3")
+
+    monkeypatch.delenv(CACHE_MODE_ENV)
+    assert ToolOptions().cache_mode == "use"
+    monkeypatch.setenv(CACHE_MODE_ENV, "refresh")
+    assert ToolOptions().cache_mode == "refresh"
+    assert ToolOptions(cache_mode="use").cache_mode == "use"
+
+
+def _payload(tmp_path: Path, cache_mode: str, **options) -> CheckDomainsInput:
+    return CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".io"],
+            "slds": ["alpha", "beta"],
+            "options": {
+                "cache_mode": cache_mode,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+                **options,
+            },
+        }
+    )
+
+
+@pytest.fixture
+def counting_checker(monkeypatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.example", "io": "https://rdap.example"}
+
+    async def fake_check_one_domain(domain, tld, payload, ctx):
+        _ = (tld, payload, ctx)
+        calls.append(domain)
+        if domain.endswith(".io"):
+            return DomainResult(domain=domain, status="unknown", confidence=0.25, method="rdap", error="timeout")
+        return DomainResult(domain=domain, status="taken", confidence=0.98, method="rdap", rdap_http=200)
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker._check_one_domain", fake_check_one_domain)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_check_domains_serves_repeat_lookups_from_cache(tmp_path: Path, counting_checker: list[str]) -> None:
+    first = await check_domains(_payload(tmp_path, "use"))
+    assert sorted(counting_checker) == ["alpha.com", "alpha.io", "beta.com", "beta.io"]
+    assert first.cache is not None
+    assert (first.cache.hits, first.cache.misses, first.cache.stored) == (0, 4, 2)
+
+    counting_checker.clear()
+    second = await check_domains(_payload(tmp_path, "use"))
+    assert sorted(counting_checker) == ["alpha.io", "beta.io"]
+    assert second.cache is not None
+    assert (second.cache.hits, second.cache.misses) == (2, 2)
+    assert [r.domain for r in second.results] == [r.domain for r in first.results]
+
+    log_lines = (tmp_path / "results.jsonl").read_text().splitlines()
+    assert '"hits": 2' in log_lines[-1]
+
+
+@pytest.mark.asyncio
+async def test_check_domains_cache_bypass_and_refresh(tmp_path: Path, counting_checker: list[str]) -> None:
+    await check_domains(_payload(tmp_path, "use"))
+
+    counting_checker.clear()
+    refreshed = await check_domains(_payload(tmp_path, "refresh"))
+    assert len(counting_checker) == 4
+    assert refreshed.cache is not None
+    assert (refreshed.cache.hits, refreshed.cache.stored) == (0, 2)
+
+    counting_checker.clear()
+    bypassed = await check_domains(_payload(tmp_path, "bypass"))
+    assert len(counting_checker) == 4
+    assert bypassed.cache is not None
+    assert (bypassed.cache.hits, bypassed.cache.stored) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_not_replayed_across_lookup_sources(tmp_path: Path, counting_checker: list[str]) -> None:
+    await check_domains(_payload(tmp_path, "use"))
+
+    counting_checker.clear()
+    other_fallback = await check_domains(_payload(tmp_path, "use", rdap_fallback_base="https://rdap.other.example"))
+    assert len(counting_checker) == 4
+    assert other_fallback.cache is not None and other_fallback.cache.hits == 0
+
+    counting_checker.clear()
+    dns_only = await check_domains(_payload(tmp_path, "use", prefer_rdap=False))
+    assert len(counting_checker) == 4
+    assert dns_only.cache is not None and dns_only.cache.hits == 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from domainscout_check import zone_index
+from domainscout_check.checker import check_domains
+from domainscout_check.models import CheckDomainsInput
+from domainscout_check.zone_index import (
+    ZoneIndex,
+    apply_zone_diff,
+    build_zone_index,
+    index_path_for,
+    iter_zone_slds,
+    read_zone_diff,
+)
+
+ZONE = """\
+$ORIGIN com.
+$TTL 900
+@ 900 IN SOA a.gtld-servers.net. nstld.verisign-grs.com. 1700000123 1800 900 604800 86400
+com. 172800 IN NS a.gtld-servers.net.
+example 172800 IN NS ns1.example.com.
+Example.com. 172800 IN NS ns2.example.com.
+ns1.example.com. 172800 IN A 192.0.2.1
+acme.com. 86400 IN NS ns.acme.net.
+        86400 IN DS 12345 8 2 ABCDEF ; same owner as the line above
+; a comment line
+zeta.com. 86400 IN NS ns.zeta.net.
+"""
+
+
+def test_iter_zone_slds_extracts_second_level_owners_and_serial() -> None:
+    serial: list[int] = []
+    labels = list(iter_zone_slds(ZONE.splitlines(), ".com", serial))
+
+    assert set(labels) == {"example", "acme", "zeta"}
+    assert serial == [1700000123]
+
+
+def test_build_lookup_and_incremental_diff(tmp_path: Path) -> None:
+    zone_path = tmp_path / "com.txt.gz"
+    with gzip.open(zone_path, "wt") as fh:
+        fh.write(ZONE)
+    index_path = index_path_for(tmp_path / "zones", ".com")
+
+    header = build_zone_index(zone_path, ".com", index_path)
+    assert header["count"] == 3 and header["serial"] == 1700000123
+
+    with ZoneIndex(index_path) as index:
+        assert "acme" in index and "example" in index and "zeta" in index
+        assert "acm" not in index and "nope" not in index and "" not in index
+
+    added, removed = read_zone_diff(["+fresh.com.", "+aaa", "-acme.com", "# ignored"], ".com")
+    header = apply_zone_diff(index_path, added, removed, serial=1700000200)
+
+    assert header["count"] == 4 and header["diffs_applied"] == 1 and header["serial"] == 1700000200
+    with ZoneIndex(index_path) as index:
+        assert list(index.iter_labels()) == [b"aaa", b"example", b"fresh", b"zeta"]
+
+
+def test_build_and_diff_stream_through_spilled_sorted_runs(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(zone_index, "_RUN_LABELS", 2)
+    zone_path = tmp_path / "com.zone"
+    zone_path.write_text(ZONE + "".join(f"n{idx % 7}.com. 86400 IN NS ns.example.net.\n" for idx in range(20)))
+    index_path = index_path_for(tmp_path / "zones", ".com")
+
+    header = build_zone_index(zone_path, ".com", index_path)
+
+    expected = sorted({b"example", b"acme", b"zeta"} | {f"n{idx}".encode() for idx in range(7)})
+    assert header["count"] == len(expected) and header["serial"] == 1700000123
+    with ZoneIndex(index_path) as index:
+        assert list(index.iter_labels()) == expected
+        assert all(label.decode() in index for label in expected)
+
+    apply_zone_diff(index_path, {"a0", "n3"}, {"n0", "zeta", "missing"})
+    with ZoneIndex(index_path) as index:
+        assert list(index.iter_labels()) == sorted(set(expected) - {b"n0", b"zeta"} | {b"a0"})
+    assert [path.name for path in index_path.parent.iterdir()] == [index_path.name]
+
+
+@pytest.mark.asyncio
+async def test_zone_hits_are_taken_without_rdap_lookups(tmp_path: Path, monkeypatch) -> None:
+    zone_path = tmp_path / "com.txt"
+    zone_path.write_text(ZONE)
+    build_zone_index(zone_path, "com", index_path_for(tmp_path / "zones", "com"))
+    queried: list[str] = []
+
+    async def fake_bootstrap(*_args, **_kwargs):
+        return {"com": "https://rdap.example", "net": "https://rdap.example"}
+
+    async def fake_query(_client, _base, domain):
+        queried.append(domain)
+        return "available", 0.80, 404, None, None
+
+    monkeypatch.setattr("domainscout_check.checker.load_bootstrap_map", fake_bootstrap)
+    monkeypatch.setattr("domainscout_check.checker.query_rdap_domain", fake_query)
+
+    payload = CheckDomainsInput.model_validate(
+        {
+            "tlds": [".com", ".net"],
+            "slds": ["acme", "zeta", "freshidea"],
+            "options": {
+                "zone_index_dir": str(tmp_path / "zones"),
+                "prewarm_connections": False,
+                "bootstrap_cache_path": str(tmp_path / "rdap_dns.json"),
+            },
+        }
+    )
+    output = await check_domains(payload)
+
+    by_domain = {r.domain: r for r in output.results}
+    assert by_domain["acme.com"].status == "taken" and by_domain["acme.com"].method == "zone"
+    assert by_domain["zeta.com"].method == "zone"
+    assert sorted(queried) == ["acme.net", "freshidea.com", "freshidea.net", "zeta.net"]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-__all__ = ["check_domains", "choose_suggested_best"]
+__all__ = ["check_domains", "check_domains_table", "choose_suggested_best", "iter_check_domains"]
 
 
 def __getattr__(name: str):
-    if name in {"check_domains", "choose_suggested_best"}:
-        from .checker import check_domains, choose_suggested_best
+    if name in __all__:
+        from .checker import check_domains, check_domains_table, choose_suggested_best, iter_check_domains
 
-        return {"check_domains": check_domains, "choose_suggested_best": choose_suggested_best}[name]
+        return {
+            "check_domains": check_domains,
+            "check_domains_table": check_domains_table,
+            "choose_suggested_best": choose_suggested_best,
+            "iter_check_domains": iter_check_domains,
+        }[name]
     raise AttributeError(name)
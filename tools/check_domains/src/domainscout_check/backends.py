@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import random
+from typing import TYPE_CHECKING, Protocol
+
+from .models import DomainResult, SimulatedBackendOptions, ToolOptions
+from .rdap import map_rdap_http_status
+from .scheduler import TokenBucket
+
+if TYPE_CHECKING:
+    import httpx
+
+SIMULATED_SCHEME = "simulated://"
+# Statuses that end the chain; anything else (unknown) is handed to the next backend.
+CONCLUSIVE = frozenset({"taken", "available", "invalid"})
+# z-score of the 99th percentile, for fitting a log-normal to a median and a p99.
+_Z_P99 = 2.3263
+
+
+def lookup_chain(options: ToolOptions) -> list[str]:
+    """Per-domain backends in the order they are asked.
+
+    ``lookup_backends`` when set; otherwise RDAP then DNS, as ``prefer_rdap`` and
+    ``enable_dns_fallback`` allow.
+    """
+    if options.lookup_backends is not None:
+        return list(options.lookup_backends)
+    chain = []
+    if options.prefer_rdap:
+        chain.append("rdap")
+    if options.enable_dns_fallback:
+        chain.append("dns")
+    return chain
+
+
+def needs_bootstrap(chain: list[str]) -> bool:
+    """Whether the run needs the RDAP bootstrap map.
+
+    DNS results also name the TLD's RDAP server, so only a chain that swaps RDAP for
+    the simulated registry runs without it.
+    """
+    return "rdap" in chain or "simulated" not in chain
+
+
+def simulated_base(tld: str) -> str:
+    """The simulated registry for ``tld``; one per TLD, so each gets its own scheduler lane."""
+    return f"{SIMULATED_SCHEME}{tld.lstrip('.')}"
+
+
+class LookupBackend(Protocol):
+    """One step of the per-domain lookup chain.
+
+    ``lookup`` returns a result, or None when the backend has nothing to ask for this
+    TLD (no RDAP server known). ``prior`` is the previous backend's inconclusive result.
+    """
+
+    name: str
+
+    async def lookup(
+        self, domain: str, tld: str, rdap_base: str | None, prior: DomainResult | None
+    ) -> DomainResult | None: ...
+
+
+class SimulatedRegistry:
+    """An in-process stand-in for RDAP servers, answering like ``rdap.query_rdap_domain``.
+
+    Latency is log-normal, fitted to the configured median and p99. Verdicts are a hash
+    of ``seed`` and the domain, so the same domain always gets the same answer; errors
+    and timeouts are drawn from a seeded RNG. ``max_lookups_per_second`` caps what the
+    registry as a whole accepts, answering 429 with ``Retry-After: 1`` beyond it, the way
+    a throttling server would. Nothing touches the network, so scheduler and concurrency
+    changes can be load-tested at millions of lookups.
+    """
+
+    def __init__(self, options: SimulatedBackendOptions, timeout_seconds: float) -> None:
+        self.options = options
+        self.timeout_seconds = timeout_seconds
+        median = options.latency_ms_median / 1000
+        p99 = max(options.latency_ms_p99 / 1000, median)
+        self._mu = math.log(median) if median > 0 else None
+        self._sigma = math.log(p99 / median) / _Z_P99 if median > 0 else 0.0
+        self._rng = random.Random(options.seed)
+        rate = options.max_lookups_per_second
+        self._capacity = TokenBucket(rate, max(1, math.ceil(rate)) if rate is not None else 1)
+        self.queries = 0
+
+    def _latency(self) -> float:
+        if self._mu is None:
+            return 0.0
+        return min(self._rng.lognormvariate(self._mu, self._sigma), self.timeout_seconds)
+
+    def _registered(self, domain: str) -> bool:
+        digest = hashlib.blake2b(f"{self.options.seed}:{domain}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64 >= self.options.available_rate
+
+    async def query(
+        self, _client: httpx.AsyncClient | None, _base: str, domain: str
+    ) -> tuple[str, float, int | None, str | None, float | None]:
+        self.queries += 1
+        if not self._capacity.try_acquire():
+            return "unknown", 0.25, 429, None, 1.0
+        if self._rng.random() < self.options.timeout_rate:
+            await asyncio.sleep(self.timeout_seconds)
+            return "unknown", 0.25, None, "timeout", None
+        await asyncio.sleep(self._latency())
+        if self._rng.random() < self.options.error_rate:
+            return "unknown", 0.25, 503, None, None
+        http_code = 200 if self._registered(domain) else 404
+        status, confidence = map_rdap_http_status(http_code)
+        return status, confidence, http_code, None, None
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterator
+
+from .checker import iter_check_domains
+from .models import CheckDomainsInput, DomainResult, ToolOptions
+from .resources import CheckerResources
+from .summary import BestTracker, RunSummary
+
+DEFAULT_CHUNK_SIZE = 1000
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+class JournalMismatch(ValueError):
+    """The journal was written for a different SLD file or TLD list."""
+
+
+@dataclass
+class JournalState:
+    """What a journal says about a job: where to resume and what it has found so far.
+
+    Only the results after the last checkpoint are held (at most one chunk), so reading
+    a journal of any size takes constant memory.
+    """
+
+    header: dict | None = None
+    offset: int = 0
+    slds: int = 0
+    counts: dict[str, int] = field(default_factory=lambda: {"available": 0, "taken": 0, "unknown": 0, "invalid": 0})
+    tracker: BestTracker | None = None
+    pending: set[str] = field(default_factory=set)
+    finished: bool = False
+    good_bytes: int = 0
+
+    @property
+    def domains(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, result: DomainResult) -> None:
+        self.counts[result.status] = self.counts.get(result.status, 0) + 1
+        if self.tracker is not None:
+            self.tracker.add(result)
+
+
+def read_journal(path: Path, allow_unknown: bool) -> JournalState:
+    """Replay a journal. A torn last line (crash mid-write) is left out of ``good_bytes``."""
+    state = JournalState()
+    if not path.exists():
+        return state
+    with path.open("rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            state.good_bytes += len(line)
+            if "job" in entry:
+                state.header = entry["job"]
+                state.tracker = BestTracker(state.header["tlds"], allow_unknown)
+            elif "checkpoint" in entry:
+                state.offset = entry["checkpoint"]["offset"]
+                state.slds = entry["checkpoint"]["slds"]
+                state.pending.clear()
+            elif "done" in entry:
+                state.finished = True
+            else:
+                result = DomainResult.model_validate(entry)
+                state.add(result)
+                state.pending.add(result.domain)
+    return state
+
+
+def iter_sld_chunks(path: Path, offset: int, chunk_size: int) -> Iterator[tuple[list[str], int]]:
+    """Chunks of SLDs from a newline-delimited file, starting at byte ``offset``.
+
+    Yields ``(slds, end_offset)``; blank lines and ``#`` comments are skipped.
+    """
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        chunk: list[str] = []
+        for line in fh:
+            offset += len(line)
+            sld = line.strip().decode("utf-8", errors="replace")
+            if sld and not sld.startswith("#"):
+                chunk.append(sld)
+            if len(chunk) >= chunk_size:
+                yield chunk, offset
+                chunk = []
+        if chunk:
+            yield chunk, offset
+
+
+def _append(fh: IO[str], entry: dict) -> None:
+    fh.write(json.dumps(entry) + "\n")
+
+
+def _checkpoint(fh: IO[str], offset: int, slds: int) -> None:
+    _append(fh, {"checkpoint": {"offset": offset, "slds": slds}})
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def _report_progress(out: IO[str], state: JournalState, total_bytes: int, session_domains: int, started: float) -> None:
+    elapsed = max(time.monotonic() - started, 1e-9)
+    share = 100 * state.offset / total_bytes if total_bytes else 100.0
+    out.write(
+        f"bulk: {state.slds} SLDs / {state.domains} domains checked ({share:.1f}% of input), "
+        f"{session_domains / elapsed:.0f} domains/s, available={state.counts['available']}\n"
+    )
+    out.flush()
+
+
+async def run_bulk_job(
+    template: dict,
+    sld_path: Path,
+    journal_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: IO[str] | None = None,
+) -> dict:
+    """Check every SLD in ``sld_path`` against ``template``'s TLDs, journaling as it goes.
+
+    ``template`` is a ``CheckDomainsInput`` body whose ``slds`` are ignored. SLDs are
+    read ``chunk_size`` at a time; each result is appended to the journal (NDJSON) as it
+    completes and a checkpoint line with the input byte offset follows each chunk. Run
+    again with the same arguments to resume: checking restarts at the last checkpoint,
+    and domains already journaled after it are not looked up again.
+
+    ``find_best_fast`` is switched off: a job checks every domain, and an early stop
+    would end each chunk short of its checkpoint. One ``CheckerResources`` serves every
+    chunk, so the connection pool, DNS engine and verdict cache stay warm.
+    """
+    tlds = [t.lower() for t in template.get("tlds", [])]
+    options = ToolOptions.model_validate(template.get("options", {})).model_copy(update={"find_best_fast": False})
+    allow_unknown = options.treat_unknown_as_available
+    state = read_journal(journal_path, allow_unknown)
+    job = {"input": str(sld_path.resolve()), "tlds": tlds}
+    if state.header is not None and state.header != job:
+        raise JournalMismatch(f"{journal_path} belongs to a job over {state.header}, not {job}")
+    if state.tracker is None:
+        state.tracker = BestTracker(tlds, allow_unknown)
+
+    total_bytes = sld_path.stat().st_size
+    started = last_report = time.monotonic()
+    session_domains = 0
+    if journal_path.exists():
+        # Drop a torn last line before appending after it.
+        os.truncate(journal_path, state.good_bytes)
+    with journal_path.open("a", encoding="utf-8") as fh:
+        if state.header is None:
+            _append(fh, {"job": job})
+            state.header = job
+        if not state.finished:
+            async with CheckerResources(options.max_concurrency, options.http2) as resources:
+                for slds, end_offset in iter_sld_chunks(sld_path, state.offset, chunk_size):
+                    payload = CheckDomainsInput.model_validate({**template, "slds": slds, "options": options})
+                    summary = RunSummary(tlds=tlds, allow_unknown=allow_unknown)
+                    async for result in iter_check_domains(payload, summary, resources, done=state.pending):
+                        fh.write(result.model_dump_json() + "\n")
+                        fh.flush()
+                        state.add(result)
+                        session_domains += 1
+                    state.offset, state.slds = end_offset, state.slds + len(slds)
+                    state.pending.clear()
+                    _checkpoint(fh, state.offset, state.slds)
+                    if progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                        _report_progress(progress, state, total_bytes, session_domains, started)
+                        last_report = time.monotonic()
+            _append(fh, {"done": {"slds": state.slds, "domains": state.domains}})
+            state.finished = True
+    if progress is not None:
+        _report_progress(progress, state, total_bytes, session_domains, started)
+
+    return {
+        "journal": str(journal_path),
+        "slds": state.slds,
+        "domains": state.domains,
+        "counts": dict(state.counts),
+        "suggested_best": state.tracker.best,
+        "checked_this_run": session_domains,
+        "wall_s": round(time.monotonic() - started, 3),
+    }
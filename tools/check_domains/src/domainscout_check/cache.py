@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+from .backends import lookup_chain
+from .models import DomainResult, ToolOptions
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    domain TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    status TEXT NOT NULL,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (domain, scope)
+)
+"""
+_LOOKUP_CHUNK = 500
+VERDICT_CACHE_FILENAME = "verdicts.sqlite3"
+
+
+def verdict_cache_path(options: ToolOptions) -> Path:
+    """``cache_path``, or the verdict cache next to the bootstrap cache (and run log)."""
+    if options.cache_path:
+        return Path(options.cache_path)
+    return Path(options.bootstrap_cache_path).parent / VERDICT_CACHE_FILENAME
+
+
+def cache_scope(options: ToolOptions) -> str:
+    """What a verdict was looked up through: the backend chain and the RDAP fallback server.
+
+    Verdicts are only replayed to runs with the same scope.
+    """
+    return f"{'>'.join(lookup_chain(options))}|{options.rdap_fallback_base or ''}"
+
+
+def verdict_ttl_seconds(result: DomainResult, options: ToolOptions) -> int | None:
+    # Zone hits come from the local index on every run; simulated verdicts are made up.
+    if result.status not in {"taken", "available"} or result.method in {"zone", "simulated"}:
+        return None
+    if result.method == "rdap":
+        if result.status == "taken" and result.rdap_http == 200:
+            return options.cache_ttl_taken_seconds
+        if result.status == "available" and result.rdap_http == 404:
+            return options.cache_ttl_available_seconds
+        return None
+    # DNS-derived verdicts are weaker evidence, so they never outlive an RDAP "available".
+    return options.cache_ttl_available_seconds
+
+
+class VerdictCache:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(verdicts)")}
+        if columns and "scope" not in columns:
+            # Written before verdicts were scoped; nothing says what they were looked up through.
+            with self._conn:
+                self._conn.execute("DROP TABLE verdicts")
+        self._conn.execute(_SCHEMA)
+        self._pending: list[tuple[str, str, str, str, str, float, float]] = []
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def get_many(self, domains: Iterable[str], scope: str = "", now: float | None = None) -> dict[str, DomainResult]:
+        now = time.time() if now is None else now
+        wanted = list(domains)
+        found: dict[str, DomainResult] = {}
+        for idx in range(0, len(wanted), _LOOKUP_CHUNK):
+            chunk = wanted[idx : idx + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT domain, payload FROM verdicts WHERE scope = ? AND expires_at > ? AND domain IN ({placeholders})",
+                (scope, now, *chunk),
+            )
+            for domain, payload in rows:
+                found[domain] = DomainResult.model_validate_json(payload)
+        return found
+
+    def put(self, result: DomainResult, ttl_seconds: int, scope: str = "", now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self._pending.append(
+            (result.domain, scope, result.status, result.method, result.model_dump_json(), now, now + ttl_seconds)
+        )
+
+    def flush(self) -> int:
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, []
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts (domain, scope, status, method, payload, checked_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                pending,
+            )
+        return len(pending)
+
+    def purge_expired(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM verdicts WHERE expires_at <= ?", (now,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
@@ -2,48 +2,106 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import importlib
+import json
 import random
 import re
+import time
+from contextlib import AsyncExitStack, aclosing
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Collection, Container
 
-import httpx
-
-from .dns_probe import map_dns_probe_to_status, probe_domain_dns
 from .logging import append_run_log
-from .models import CheckDomainsInput, CheckDomainsOutput, DomainResult
-from .rdap import is_retryable_http_status, load_bootstrap_map, query_rdap_domain
+from .metrics import RunMetrics
+from .models import CacheStats, CheckDomainsInput, CheckDomainsOutput, DomainResult, ToolOptions
+from .result_table import ResultTable
+from .summary import BestTracker, PreferenceTarget, RunSummary
+from .summary import extract_tld as _extract_tld
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .backends import LookupBackend
+    from .dns_engine import AsyncDNSEngine
+    from .hedging import RDAPHedger
+    from .inflight import InflightTable
+    from .resources import CheckerResources
+    from .scheduler import RDAPScheduler, RetryBudget, ServerLane, SharedPauses
+
+# The network stack (httpx, dnspython, sqlite, zone files) is bound into this module on
+# first use, so deterministic runs never import it. The names are still module
+# attributes (``checker.load_bootstrap_map`` and so on) for callers and monkeypatching.
+_NETWORK_NAMES = {
+    "httpx": ("httpx", None),
+    "CONCLUSIVE": (".backends", "CONCLUSIVE"),
+    "SIMULATED_SCHEME": (".backends", "SIMULATED_SCHEME"),
+    "SimulatedRegistry": (".backends", "SimulatedRegistry"),
+    "lookup_chain": (".backends", "lookup_chain"),
+    "needs_bootstrap": (".backends", "needs_bootstrap"),
+    "simulated_base": (".backends", "simulated_base"),
+    "VerdictCache": (".cache", "VerdictCache"),
+    "cache_scope": (".cache", "cache_scope"),
+    "verdict_cache_path": (".cache", "verdict_cache_path"),
+    "verdict_ttl_seconds": (".cache", "verdict_ttl_seconds"),
+    "ConnectionStats": (".connections", "ConnectionStats"),
+    "InstrumentedTransport": (".connections", "InstrumentedTransport"),
+    "build_transport": (".connections", "build_transport"),
+    "prewarm_host": (".connections", "prewarm_host"),
+    "open_dns_engine": (".dns_engine", "open_dns_engine"),
+    "resolve_nameservers": (".dns_engine", "resolve_nameservers"),
+    "map_dns_probe_to_status": (".dns_probe", "map_dns_probe_to_status"),
+    "probe_domain_dns": (".dns_probe", "probe_domain_dns"),
+    "RDAPHedger": (".hedging", "RDAPHedger"),
+    "shared_inflight_table": (".inflight", "shared_inflight_table"),
+    "is_retryable_http_status": (".rdap", "is_retryable_http_status"),
+    "load_bootstrap_map": (".rdap", "load_bootstrap_map"),
+    "query_rdap_domain": (".rdap", "query_rdap_domain"),
+    "RDAPScheduler": (".scheduler", "RDAPScheduler"),
+    "RetryBudget": (".scheduler", "RetryBudget"),
+    "open_zone_indexes": (".zone_index", "open_zone_indexes"),
+}
+_network_bound = False
+
+
+def _bind_network() -> None:
+    """Import the network stack once; names already set (e.g. monkeypatched) are kept."""
+    global _network_bound
+    if _network_bound:
+        return
+    namespace = globals()
+    for name in _NETWORK_NAMES:
+        if name not in namespace:
+            _bind_network_name(name)
+    _network_bound = True
+
+
+def _bind_network_name(name: str) -> object:
+    module_name, attr = _NETWORK_NAMES[name]
+    module = importlib.import_module(module_name, __package__)
+    globals()[name] = module if attr is None else getattr(module, attr)
+    return globals()[name]
+
+
+def __getattr__(name: str):
+    if name in _NETWORK_NAMES:
+        _bind_network()
+        # A name bound earlier and then deleted (mock.patch undoing a patch) is bound again.
+        namespace = globals()
+        return namespace[name] if name in namespace else _bind_network_name(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 SLD_RE = re.compile(r"^(?!-)[a-z0-9-]{2,63}(?<!-)$")
 TLD_RE = re.compile(r"^\.[a-z0-9-]{2,63}$")
 
 
-def _extract_tld(domain: str) -> str:
-    parts = domain.rsplit(".", maxsplit=1)
-    if len(parts) != 2:
-        return ""
-    return f".{parts[1].lower()}"
-
-
 def choose_suggested_best(results: list[DomainResult], tlds: list[str], allow_unknown: bool) -> str | None:
-    tld_order = {t.lower(): idx for idx, t in enumerate(tlds)}
-
-    def sort_key(result: DomainResult) -> tuple[int, float, int, str]:
-        tld_idx = tld_order.get(_extract_tld(result.domain), len(tlds) + 1)
-        return (tld_idx, -result.confidence, len(result.domain), result.domain)
-
-    available = sorted((r for r in results if r.status == "available"), key=sort_key)
-    if available:
-        return available[0].domain
-
-    if allow_unknown:
-        unknown = sorted((r for r in results if r.status == "unknown"), key=sort_key)
-        if unknown:
-            return unknown[0].domain
-
-    return None
+    tracker = BestTracker(tlds, allow_unknown)
+    for result in results:
+        tracker.add(result)
+    return tracker.best
 
 
 async def _rdap_with_retry(
@@ -51,12 +109,63 @@ async def _rdap_with_retry(
     rdap_base: str,
     domain: str,
     retries: int = 2,
+    lane: ServerLane | None = None,
+    max_retry_after: float = 30.0,
+    hedger: RDAPHedger | None = None,
+    hedge_base: str | None = None,
+    hedge_lane: ServerLane | None = None,
+    retry_budget: RetryBudget | None = None,
+    metrics: RunMetrics | None = None,
+    query: Callable[..., Awaitable[tuple]] | None = None,
 ) -> tuple[str, float, int | None, str | None]:
+    _bind_network()
+    query = query or query_rdap_domain
+    breaker = lane.breaker if lane is not None else None
     for attempt in range(retries + 1):
-        status, confidence, http_code, error = await query_rdap_domain(client, rdap_base, domain)
+        if breaker is not None and not breaker.allow():
+            return "unknown", 0.25, None, "circuit_open"
+        # Only a half-open breaker's probe may hand the probe back; other in-flight requests must not.
+        probe = breaker is not None and breaker.probing
+        try:
+            if lane is not None:
+                await lane.wait_turn()
+            if retry_budget is not None and attempt == 0:
+                retry_budget.record_request()
+            started = time.perf_counter()
+            if hedger is not None:
+                answer = await hedger.query(
+                    lambda base: query(client, base, domain),
+                    rdap_base,
+                    hedge_base or rdap_base,
+                    lane=hedge_lane or lane,
+                )
+            else:
+                answer = await query(client, rdap_base, domain)
+            status, confidence, http_code, error, retry_after = answer
+            if metrics is not None:
+                metrics.record_rdap(rdap_base, time.perf_counter() - started, http_code, error)
+            # 429 and 5xx-with-Retry-After are throttling, handled by the lane pause, not outages.
+            throttled = http_code == 429 or (http_code in {500, 502, 503, 504} and retry_after is not None)
+            if breaker is not None and not throttled:
+                if error is not None or http_code in {500, 502, 503, 504}:
+                    breaker.record_failure()
+                elif http_code is not None:
+                    breaker.record_success()
+        finally:
+            if probe:
+                breaker.release_probe()
         retryable = (http_code is not None and is_retryable_http_status(http_code)) or (error is not None)
-        if retryable and attempt < retries:
-            await asyncio.sleep((0.05 * (2**attempt)) + random.uniform(0.0, 0.03))
+        backoff = (0.05 * (2**attempt)) + random.uniform(0.0, 0.03)
+        deferred = lane is not None and http_code in {429, 503}
+        if deferred:
+            # Throttling is a property of the server, so pause its whole lane rather than this request,
+            # even when this request is out of retries.
+            lane.defer(min(retry_after if retry_after is not None else backoff, max_retry_after))
+        if retryable and attempt < retries and (retry_budget is None or retry_budget.try_spend()):
+            if metrics is not None:
+                metrics.record_retry(rdap_base)
+            if not deferred:
+                await asyncio.sleep(backoff)
             continue
         return status, confidence, http_code, error
 
@@ -69,11 +178,6 @@ def _validate_tlds(tlds: list[str]) -> None:
             raise ValueError(f"Invalid TLD: {tld}")
 
 
-def _chunk_slds(slds: list[str], batch_size: int) -> Iterator[list[str]]:
-    for idx in range(0, len(slds), batch_size):
-        yield slds[idx : idx + batch_size]
-
-
 def _deterministic_result_for_domain(domain: str, seed: int) -> DomainResult:
     digest = hashlib.sha256(f"{seed}:{domain}".encode("utf-8")).digest()
     bucket = digest[0]
@@ -93,7 +197,8 @@ def _deterministic_result_for_domain(domain: str, seed: int) -> DomainResult:
         rdap_http = 503
         error = "deterministic_unknown"
 
-    return DomainResult(
+    # Every field comes from the table above, so skip validation (a measurable share of an offline run).
+    return DomainResult.model_construct(
         domain=domain,
         status=status,
         confidence=confidence,
@@ -101,91 +206,238 @@ def _deterministic_result_for_domain(domain: str, seed: int) -> DomainResult:
         rdap_server="deterministic://offline",
         rdap_http=rdap_http,
         error=error,
+        backend="deterministic",
     )
 
 
-async def _check_one_domain(
-    domain: str,
-    tld: str,
-    rdap_base_map: dict[str, str],
-    payload: CheckDomainsInput,
-    client: httpx.AsyncClient,
-    semaphore: asyncio.Semaphore,
-) -> DomainResult:
-    async with semaphore:
-        options = payload.options
-        rdap_base = rdap_base_map.get(tld.lstrip("."))
-        if not rdap_base and options.rdap_fallback_base:
-            rdap_base = options.rdap_fallback_base.rstrip("/")
-
-        rdap_status = "unknown"
-        rdap_confidence = 0.25
-        rdap_http: int | None = None
-        rdap_error: str | None = None
-        used_rdap = False
-
-        if options.prefer_rdap and rdap_base:
-            used_rdap = True
-            rdap_status, rdap_confidence, rdap_http, rdap_error = await _rdap_with_retry(client, rdap_base, domain)
-            if rdap_status in {"taken", "available", "invalid"}:
-                return DomainResult(
-                    domain=domain,
-                    status=rdap_status,
-                    confidence=rdap_confidence,
-                    method="rdap",
-                    rdap_server=rdap_base,
-                    rdap_http=rdap_http,
-                    error=rdap_error,
-                )
+def _resolve_rdap_base(tld: str, rdap_base_map: dict[str, str], payload: CheckDomainsInput) -> str | None:
+    rdap_base = rdap_base_map.get(tld.lstrip("."))
+    if not rdap_base and payload.options.rdap_fallback_base:
+        rdap_base = payload.options.rdap_fallback_base.rstrip("/")
+    return rdap_base
+
+
+@dataclass
+class LookupContext:
+    rdap_base_map: dict[str, str]
+    client: httpx.AsyncClient
+    scheduler: RDAPScheduler
+    dns_engine: AsyncDNSEngine | None = None
+    # options.dns_nameservers, resolved, for the threaded resolver when there is no engine.
+    dns_nameservers: list[tuple[str, int]] | None = None
+    inflight: InflightTable[DomainResult] | None = None
+    hedger: RDAPHedger | None = None
+    metrics: RunMetrics | None = None
+    backends: tuple[LookupBackend, ...] = ()
+    coalesced: int = 0
+
+    @property
+    def chain(self) -> tuple[str, ...]:
+        return tuple(backend.name for backend in self.backends)
+
+
+class _RDAPBackend:
+    """RDAP, or the simulated registry, which speaks the same protocol through its own ``query``."""
+
+    def __init__(self, name: str, ctx: LookupContext, options: ToolOptions, query: Callable[..., Awaitable[tuple]] | None = None):
+        self.name = name
+        self._ctx = ctx
+        self._options = options
+        self._query = query
+
+    async def lookup(self, domain: str, tld: str, rdap_base: str | None, prior: DomainResult | None) -> DomainResult | None:
+        ctx, options = self._ctx, self._options
+        base = rdap_base if self.name == "rdap" else simulated_base(tld)
+        if not base:
+            return None
+        hedger = ctx.hedger if self.name == "rdap" else None
+        hedge_base = options.rdap_fallback_base.rstrip("/") if options.rdap_fallback_base else None
+        status, confidence, rdap_http, error = await _rdap_with_retry(
+            ctx.client,
+            base,
+            domain,
+            lane=ctx.scheduler.lane(base),
+            max_retry_after=options.rdap_retry_after_max_seconds,
+            hedger=hedger,
+            retry_budget=ctx.scheduler.retry_budget,
+            metrics=ctx.metrics,
+            hedge_base=hedge_base,
+            hedge_lane=ctx.scheduler.lane(hedge_base) if hedger is not None and hedge_base else None,
+            query=self._query,
+        )
+        # Every field is already a valid value, so skip validation (it shows at simulated-load volumes).
+        return DomainResult.model_construct(
+            domain=domain,
+            status=status,
+            confidence=confidence,
+            method=self.name,
+            rdap_server=base,
+            rdap_http=rdap_http,
+            error=error,
+            backend=self.name,
+        )
 
-        if options.enable_dns_fallback:
-            dns_evidence = await probe_domain_dns(domain, options.timeout_ms)
-            dns_status, dns_confidence = map_dns_probe_to_status(dns_evidence)
-            return DomainResult(
-                domain=domain,
-                status=dns_status,
-                confidence=dns_confidence,
-                method="rdap+dns" if used_rdap else "dns",
-                rdap_server=rdap_base,
-                rdap_http=rdap_http,
-                dns_nxdomain=dns_evidence.dns_nxdomain,
-                dns_ns=dns_evidence.dns_ns,
-                dns_soa=dns_evidence.dns_soa,
-                error=rdap_error,
-            )
 
+class _DNSBackend:
+    name = "dns"
+
+    def __init__(self, ctx: LookupContext, options: ToolOptions):
+        self._ctx = ctx
+        self._options = options
+
+    async def lookup(self, domain: str, tld: str, rdap_base: str | None, prior: DomainResult | None) -> DomainResult | None:
+        dns_evidence = await probe_domain_dns(
+            domain, self._options.timeout_ms, engine=self._ctx.dns_engine, nameservers=self._ctx.dns_nameservers
+        )
+        dns_status, dns_confidence = map_dns_probe_to_status(dns_evidence)
         return DomainResult(
             domain=domain,
-            status=rdap_status,
-            confidence=rdap_confidence,
-            method="rdap" if used_rdap else "dns",
+            status=dns_status,
+            confidence=dns_confidence,
+            method="rdap+dns" if prior is not None and prior.method == "rdap" else "dns",
             rdap_server=rdap_base,
-            rdap_http=rdap_http,
-            error=rdap_error,
+            rdap_http=prior.rdap_http if prior is not None else None,
+            dns_nxdomain=dns_evidence.dns_nxdomain,
+            dns_ns=dns_evidence.dns_ns,
+            dns_soa=dns_evidence.dns_soa,
+            error=prior.error if prior is not None else None,
+            backend="dns",
         )
 
 
-async def check_domains(payload: CheckDomainsInput) -> CheckDomainsOutput:
-    normalized_tlds = [t.lower() for t in payload.tlds]
-    normalized_slds = [s.lower() for s in payload.slds]
-    _validate_tlds(normalized_tlds)
+def build_lookup_backends(ctx: LookupContext, options: ToolOptions) -> tuple[LookupBackend, ...]:
+    """The backends of ``lookup_chain(options)``, bound to ``ctx``."""
+    _bind_network()
+    backends: list[LookupBackend] = []
+    for name in lookup_chain(options):
+        if name == "dns":
+            backends.append(_DNSBackend(ctx, options))
+        elif name == "simulated":
+            registry = SimulatedRegistry(options.simulated, options.timeout_ms / 1000)
+            backends.append(_RDAPBackend(name, ctx, options, registry.query))
+        else:
+            backends.append(_RDAPBackend(name, ctx, options))
+    return tuple(backends)
+
+
+def _lane_base(chain: Collection[str], tld: str, rdap_base: str | None) -> str | None:
+    """The lane a lookup takes its concurrency slot on: the first backend's server, or the DNS lane."""
+    for name in chain:
+        if name == "rdap":
+            return rdap_base
+        if name == "simulated":
+            return simulated_base(tld)
+        return None
+    return None
 
-    timeout_seconds = payload.options.timeout_ms / 1000
-    timeout = httpx.Timeout(timeout_seconds, connect=timeout_seconds, read=timeout_seconds, write=timeout_seconds, pool=timeout_seconds)
-    limits = httpx.Limits(
-        max_connections=payload.options.max_concurrency,
-        max_keepalive_connections=payload.options.max_concurrency,
-    )
-    semaphore = asyncio.Semaphore(payload.options.max_concurrency)
 
-    cache_path = Path(payload.options.bootstrap_cache_path)
+async def _check_one_domain(
+    domain: str,
+    tld: str,
+    payload: CheckDomainsInput,
+    ctx: LookupContext,
+) -> DomainResult:
+    rdap_base = _resolve_rdap_base(tld, ctx.rdap_base_map, payload)
+    started = time.perf_counter()
+    if ctx.inflight is None:
+        result = await _lookup_domain(domain, tld, rdap_base, ctx)
+    else:
+        chain = ctx.chain
+        key = (domain, _lane_base(chain, tld, rdap_base), chain)
+        result, shared = await ctx.inflight.run(key, lambda: _lookup_domain(domain, tld, rdap_base, ctx))
+        if shared:
+            ctx.coalesced += 1
+    if ctx.metrics is not None:
+        ctx.metrics.record_lookup(tld, time.perf_counter() - started, result)
+    return result
+
 
-    immediate_results: list[DomainResult] = []
+async def _lookup_domain(
+    domain: str,
+    tld: str,
+    rdap_base: str | None,
+    ctx: LookupContext,
+) -> DomainResult:
+    """Ask each backend of the chain in turn until one gives a conclusive verdict.
+
+    The concurrency slot is held on the first backend's lane for the whole chain. With no
+    conclusive answer the last backend's result stands.
+    """
+    waiting_since = time.perf_counter()
+    async with ctx.scheduler.slot(_lane_base(ctx.chain, tld, rdap_base)) as lane:
+        if ctx.metrics is not None:
+            ctx.metrics.record_slot_wait(lane.base, time.perf_counter() - waiting_since)
+        result: DomainResult | None = None
+        for backend in ctx.backends:
+            answer = await backend.lookup(domain, tld, rdap_base, result)
+            if answer is None:
+                continue
+            result = answer
+            if result.status in CONCLUSIVE:
+                break
+        if result is not None:
+            return result
+        return DomainResult(domain=domain, status="unknown", confidence=0.25, method="dns", rdap_server=rdap_base)
+
+
+async def _run_lookup_pipeline(
+    valid_slds: list[str],
+    tlds: list[str],
+    skip: Container[str],
+    payload: CheckDomainsInput,
+    ctx: LookupContext,
+    on_result: Callable[[DomainResult], Awaitable[None]],
+) -> None:
+    scheduler = ctx.scheduler
+    chain = ctx.chain
+    lane_tlds: dict[str, list[str]] = {}
+    for tld in tlds:
+        lane_base = _lane_base(chain, tld, _resolve_rdap_base(tld, ctx.rdap_base_map, payload))
+        lane_tlds.setdefault(scheduler.lane(lane_base).base, []).append(tld)
+
+    async def run_lane(lane_base: str, lane_tld_list: list[str]) -> None:
+        # batch_size only bounds how far the producer runs ahead; workers never wait on each other.
+        queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(maxsize=payload.options.batch_size)
+        worker_count = min(scheduler.lane(lane_base).concurrency, len(valid_slds) * len(lane_tld_list))
+
+        async def produce() -> None:
+            for sld in valid_slds:
+                for tld in lane_tld_list:
+                    domain = f"{sld}{tld}"
+                    if domain not in skip:
+                        await queue.put((domain, tld))
+            for _ in range(worker_count):
+                await queue.put(None)
+
+        async def work() -> None:
+            while (item := await queue.get()) is not None:
+                domain, tld = item
+                await on_result(await _check_one_domain(domain=domain, tld=tld, payload=payload, ctx=ctx))
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce())
+            for _ in range(worker_count):
+                group.create_task(work())
+
+    if payload.options.find_best_fast:
+        # One TLD at a time in preference order, so the first choice gets every worker.
+        for tld in tlds:
+            lane_base = _lane_base(chain, tld, _resolve_rdap_base(tld, ctx.rdap_base_map, payload))
+            await run_lane(scheduler.lane(lane_base).base, [tld])
+        return
+
+    async with asyncio.TaskGroup() as group:
+        for lane_base, lane_tld_list in lane_tlds.items():
+            group.create_task(run_lane(lane_base, lane_tld_list))
+
+
+def _split_valid_slds(slds: list[str], tlds: list[str]) -> tuple[list[str], list[DomainResult]]:
+    invalid_results: list[DomainResult] = []
     valid_slds: list[str] = []
-    for sld in normalized_slds:
+    for sld in slds:
         if not SLD_RE.match(sld):
-            for tld in normalized_tlds:
-                immediate_results.append(
+            for tld in tlds:
+                invalid_results.append(
                     DomainResult(
                         domain=f"{sld}{tld}",
                         status="invalid",
@@ -196,65 +448,337 @@ async def check_domains(payload: CheckDomainsInput) -> CheckDomainsOutput:
                 )
             continue
         valid_slds.append(sld)
-
-    results = list(immediate_results)
-    if valid_slds and payload.options.deterministic_mode:
-        for sld in valid_slds:
-            for tld in normalized_tlds:
+    return valid_slds, invalid_results
+
+
+def _zone_index_hits(
+    options: ToolOptions,
+    valid_slds: list[str],
+    tlds: list[str],
+    skip: Container[str],
+) -> dict[str, DomainResult]:
+    if not options.zone_index_dir:
+        return {}
+    hits: dict[str, DomainResult] = {}
+    for tld, index in open_zone_indexes(Path(options.zone_index_dir), tlds).items():
+        with index:
+            for sld in valid_slds:
                 domain = f"{sld}{tld}"
-                results.append(_deterministic_result_for_domain(domain, payload.options.deterministic_seed))
+                if domain not in skip and sld in index:
+                    # Present in the TLD zone means delegated, hence registered; absence proves
+                    # nothing (held or undelegated names), so misses still go to RDAP.
+                    hits[domain] = DomainResult(domain=domain, status="taken", confidence=0.95, method="zone", backend="zone")
+    return hits
+
+
+async def _cancel_warmup(task: asyncio.Future[None]) -> None:
+    if not task.done():
+        task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
 
-        results_sorted = sorted(results, key=lambda r: (_extract_tld(r.domain), r.domain))
-        suggested_best = choose_suggested_best(
-            results=results_sorted,
-            tlds=normalized_tlds,
-            allow_unknown=payload.options.treat_unknown_as_available,
+
+async def _iter_network_results(
+    payload: CheckDomainsInput,
+    valid_slds: list[str],
+    tlds: list[str],
+    summary: RunSummary,
+    resources: CheckerResources | None = None,
+    done: Collection[str] = (),
+) -> AsyncIterator[DomainResult]:
+    _bind_network()
+    options = payload.options
+    cache_stats = CacheStats(mode=options.cache_mode)
+    summary.cache = cache_stats
+    cached: dict[str, DomainResult] = {}
+    cache: VerdictCache | None = None
+    scope = cache_scope(options)
+    # ``done`` may also hold invalid domains and ones outside this payload; only the
+    # domains this run would look up count towards what is left to do.
+    done = {domain for sld in valid_slds for tld in tlds if (domain := f"{sld}{tld}") in done} if done else set()
+    if options.cache_mode != "bypass":
+        if resources is not None:
+            cache = resources.verdict_cache(verdict_cache_path(options))
+        else:
+            cache = VerdictCache(verdict_cache_path(options))
+        if options.cache_mode == "use":
+            cached = cache.get_many(
+                (domain for sld in valid_slds for tld in tlds if (domain := f"{sld}{tld}") not in done), scope
+            )
+    for result in cached.values():
+        result.backend = "cache"
+    cache_stats.hits = len(cached)
+    zone_hits = _zone_index_hits(options, valid_slds, tlds, skip=cached.keys() | done)
+    summary.zone_hits = len(zone_hits) if options.zone_index_dir else None
+    skip = cached.keys() | zone_hits.keys() | done
+
+    try:
+        for result in cached.values():
+            yield result
+        for result in zone_hits.values():
+            yield result
+        if len(skip) >= len(valid_slds) * len(tlds):
+            return
+
+        if options.shards > 1 and not options.find_best_fast:
+            from .sharding import iter_sharded_lookups
+
+            lookups = iter_sharded_lookups(payload, valid_slds, tlds, skip, summary)
+        else:
+            lookups = iter_lookups(payload, valid_slds, tlds, skip, summary, resources)
+        async with aclosing(lookups) as stream:
+            async for result in stream:
+                summary.metrics.record_network_result()
+                cache_stats.misses += 1
+                if cache is not None:
+                    ttl = verdict_ttl_seconds(result, options)
+                    if ttl:
+                        cache.put(result, ttl, scope)
+                    if cache.pending_count >= options.batch_size:
+                        cache_stats.stored += cache.flush()
+                yield result
+    finally:
+        if cache is not None:
+            cache_stats.stored += cache.flush()
+            if resources is None:
+                cache.close()
+
+
+async def iter_lookups(
+    payload: CheckDomainsInput,
+    valid_slds: list[str],
+    tlds: list[str],
+    skip: Collection[str],
+    summary: RunSummary,
+    resources: CheckerResources | None = None,
+    rdap_base_map: dict[str, str] | None = None,
+    shared_pauses: SharedPauses | None = None,
+) -> AsyncIterator[DomainResult]:
+    """Lookups through the backend chain for every SLD x TLD not in ``skip``, yielded as they complete.
+
+    Fills the summary's per-run lookup state (lanes, retries, connections, hedging,
+    coalescing); the verdict cache and zone index are the caller's business. The RDAP
+    bootstrap (see ``backends.needs_bootstrap``) and the DNS engine are only loaded when
+    the chain needs them. ``shared_pauses`` links the lanes' Retry-After pauses with the
+    other shards of a sharded run.
+    """
+    _bind_network()
+    options = payload.options
+    chain = lookup_chain(options)
+    if rdap_base_map is None and not needs_bootstrap(chain):
+        rdap_base_map = {}
+    timeout_seconds = options.timeout_ms / 1000
+    timeout = httpx.Timeout(timeout_seconds, connect=timeout_seconds, read=timeout_seconds, write=timeout_seconds, pool=timeout_seconds)
+    connection_stats = ConnectionStats()
+
+    async with AsyncExitStack() as stack:
+        dns_engine = None
+        if resources is not None:
+            client = await stack.enter_async_context(resources.client(timeout, connection_stats))
+            if rdap_base_map is None:
+                rdap_base_map = await resources.bootstrap_map(
+                    Path(options.bootstrap_cache_path), options.bootstrap_ttl_seconds, client, tlds
+                )
+            if "dns" in chain and options.dns_engine == "async":
+                dns_engine = await resources.dns_engine(options.dns_nameservers)
+        else:
+            transport = build_transport(options.max_concurrency, options.http2)
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=InstrumentedTransport(transport, connection_stats), timeout=timeout)
+            )
+            if rdap_base_map is None:
+                rdap_base_map = await load_bootstrap_map(
+                    cache_path=Path(options.bootstrap_cache_path),
+                    ttl_seconds=options.bootstrap_ttl_seconds,
+                    client=client,
+                    required_tlds=tlds,
+                    # Nothing outlives this run's event loop, so a stale map is refetched out of process.
+                    detach_refresh=True,
+                )
+            if "dns" in chain and options.dns_engine == "async":
+                dns_engine = await open_dns_engine(options.dns_nameservers)
+                if dns_engine is not None:
+                    stack.push_async_callback(dns_engine.close)
+        dns_nameservers = None
+        if "dns" in chain and dns_engine is None and options.dns_nameservers:
+            # The threaded resolver (dns_engine="thread", or no usable engine) still asks these servers.
+            dns_nameservers = await resolve_nameservers(options.dns_nameservers)
+        scheduler = RDAPScheduler(
+            options,
+            (_lane_base(chain, tld, _resolve_rdap_base(tld, rdap_base_map, payload)) for tld in tlds),
+            shared_pauses,
         )
-        return CheckDomainsOutput(
-            checked_at="1970-01-01T00:00:00Z",
-            results=results_sorted,
-            suggested_best=suggested_best,
+        if options.prewarm_connections and chain[:1] == ["rdap"]:
+            lookups = len(valid_slds) * len(tlds) - len(skip)
+            for lane in scheduler.rdap_lanes():
+                lane.warmup = asyncio.get_running_loop().create_future()
+                warming = asyncio.create_task(
+                    prewarm_host(client, lane.base, min(lane.concurrency, lookups), lane.warmup, lane)
+                )
+                stack.push_async_callback(_cancel_warmup, warming)
+        hedger = None
+        if options.rdap_hedging:
+            hedger = RDAPHedger(options.rdap_hedge_percentile, options.rdap_hedge_budget_percent)
+            stack.push_async_callback(hedger.aclose)
+        ctx = LookupContext(
+            rdap_base_map=rdap_base_map,
+            client=client,
+            scheduler=scheduler,
+            dns_engine=dns_engine,
+            dns_nameservers=dns_nameservers,
+            inflight=shared_inflight_table() if options.coalesce_inflight else None,
+            hedger=hedger,
+            metrics=summary.metrics,
         )
+        ctx.backends = build_lookup_backends(ctx, options)
+        completed: asyncio.Queue[DomainResult | None] = asyncio.Queue(maxsize=options.batch_size)
+
+        async def publish(result: DomainResult) -> None:
+            await completed.put(result)
+
+        async def run_pipeline() -> None:
+            try:
+                await _run_lookup_pipeline(
+                    valid_slds=valid_slds,
+                    tlds=tlds,
+                    skip=skip,
+                    payload=payload,
+                    ctx=ctx,
+                    on_result=publish,
+                )
+            except asyncio.CancelledError:
+                raise
+            except BaseException:
+                await completed.put(None)
+                raise
+            await completed.put(None)
+
+        pipeline = asyncio.create_task(run_pipeline())
+        try:
+            while (result := await completed.get()) is not None:
+                yield result
+            await pipeline
+        finally:
+            if not pipeline.done():
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+            summary.rdap_servers = scheduler.snapshot()
+            summary.retries = scheduler.retry_budget.snapshot()
+            summary.connections = connection_stats.snapshot()
+            summary.hedging = hedger.snapshot() if hedger is not None else None
+            summary.coalesced = ctx.coalesced
+
+
+async def iter_check_domains(
+    payload: CheckDomainsInput,
+    summary: RunSummary | None = None,
+    resources: CheckerResources | None = None,
+    done: Collection[str] = (),
+) -> AsyncIterator[DomainResult]:
+    """Yield each ``DomainResult`` of ``payload`` as it completes.
+
+    Domains in ``done`` (ones the caller already holds a result for, e.g. a resumed bulk
+    job) are neither looked up nor yielded.
+    """
+    normalized_tlds = [t.lower() for t in payload.tlds]
+    normalized_slds = [s.lower() for s in payload.slds]
+    _validate_tlds(normalized_tlds)
+    if summary is None:
+        summary = RunSummary(tlds=normalized_tlds, allow_unknown=payload.options.treat_unknown_as_available)
 
-    if valid_slds:
-        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
-            rdap_base_map = await load_bootstrap_map(
-                cache_path=cache_path,
-                ttl_seconds=payload.options.bootstrap_ttl_seconds,
-                client=client,
-            )
+    valid_slds, invalid_results = _split_valid_slds(normalized_slds, normalized_tlds)
+    for result in invalid_results:
+        if result.domain in done:
+            continue
+        summary.add(result)
+        yield result
 
-            for sld_batch in _chunk_slds(valid_slds, payload.options.batch_size):
-                tasks: list[asyncio.Task[DomainResult]] = []
-                for sld in sld_batch:
-                    for tld in normalized_tlds:
-                        domain = f"{sld}{tld}"
-                        tasks.append(
-                            asyncio.create_task(
-                                _check_one_domain(
-                                    domain=domain,
-                                    tld=tld,
-                                    rdap_base_map=rdap_base_map,
-                                    payload=payload,
-                                    client=client,
-                                    semaphore=semaphore,
-                                )
-                            )
-                        )
-                results.extend(await asyncio.gather(*tasks))
-
-    results_sorted = sorted(results, key=lambda r: (_extract_tld(r.domain), r.domain))
-    suggested_best = choose_suggested_best(
-        results=results_sorted,
-        tlds=normalized_tlds,
+    if payload.options.deterministic_mode:
+        summary.checked_at = "1970-01-01T00:00:00Z"
+        for sld in valid_slds:
+            for tld in normalized_tlds:
+                if f"{sld}{tld}" in done:
+                    continue
+                result = _deterministic_result_for_domain(f"{sld}{tld}", payload.options.deterministic_seed)
+                summary.add(result)
+                yield result
+        return
+
+    if valid_slds:
+        early_stop = None
+        if payload.options.find_best_fast:
+            early_stop = PreferenceTarget(normalized_tlds, len(valid_slds), payload.options.find_best_target)
+            summary.early_stop = early_stop.stats
+        async with aclosing(_iter_network_results(payload, valid_slds, normalized_tlds, summary, resources, done)) as stream:
+            async for result in stream:
+                summary.add(result)
+                yield result
+                if early_stop is not None and early_stop.add(result):
+                    break
+
+    summary.checked_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    summary.metrics.finish()
+    if resources is not None:
+        resources.metrics.add_run(summary.metrics)
+    append_run_log(Path(payload.options.bootstrap_cache_path).parent, payload, summary)
+
+
+async def check_domains(payload: CheckDomainsInput, resources: CheckerResources | None = None) -> CheckDomainsOutput:
+    summary = RunSummary(
+        tlds=[t.lower() for t in payload.tlds],
         allow_unknown=payload.options.treat_unknown_as_available,
     )
+    results = [result async for result in iter_check_domains(payload, summary, resources)]
+    results.sort(key=lambda r: (_extract_tld(r.domain), r.domain))
+    return CheckDomainsOutput(
+        checked_at=summary.checked_at or "",
+        results=results,
+        suggested_best=summary.suggested_best,
+        cache=summary.cache,
+        early_stop=summary.early_stop,
+        stats=summary.metrics.snapshot() if payload.options.include_stats else None,
+    )
+
 
-    output = CheckDomainsOutput(
-        checked_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-        results=results_sorted,
-        suggested_best=suggested_best,
+async def check_domains_table(
+    payload: CheckDomainsInput,
+    resources: CheckerResources | None = None,
+) -> tuple[ResultTable, RunSummary]:
+    """check_domains for JSON consumers: results stay columnar until output_document renders them."""
+    summary = RunSummary(
+        tlds=[t.lower() for t in payload.tlds],
+        allow_unknown=payload.options.treat_unknown_as_available,
     )
+    table = ResultTable()
+    async for result in iter_check_domains(payload, summary, resources):
+        table.append(result)
+    table.sort_by_tld()
+    return table, summary
+
+
+def output_document(table: ResultTable, summary: RunSummary, include_stats: bool = False) -> dict:
+    """The CheckDomainsOutput JSON document, built straight from the table."""
+    return _output_fields(list(table.iter_rows()), summary, include_stats)
+
+
+# Stands in for the results array while json.dumps renders the rest of the document.
+_RESULTS_PLACEHOLDER = "\x00results\x00"
+
+
+def output_json(table: ResultTable, summary: RunSummary, include_stats: bool = False, indent: int | None = None) -> str:
+    """``json.dumps(output_document(...), indent=indent)``, with the results rendered from the columns.
+
+    For callers that only serialize the document (CLI, daemon): no row dicts are built.
+    """
+    rendered = json.dumps(_output_fields(_RESULTS_PLACEHOLDER, summary, include_stats), indent=indent)
+    return rendered.replace(json.dumps(_RESULTS_PLACEHOLDER), table.results_json(indent), 1)
+
 
-    append_run_log(cache_path.parent, payload, output)
-    return output
+def _output_fields(results: list[dict] | str, summary: RunSummary, include_stats: bool) -> dict:
+    return {
+        "checked_at": summary.checked_at or "",
+        "results": results,
+        "suggested_best": summary.suggested_best,
+        "cache": summary.cache.model_dump(mode="json") if summary.cache is not None else None,
+        "early_stop": summary.early_stop.model_dump(mode="json") if summary.early_stop is not None else None,
+        "stats": summary.metrics.snapshot() if include_stats else None,
+    }
@@ -1,28 +1,83 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 import json
 import sys
-from pathlib import Path
 
+# Heavy imports (asyncio, pydantic, the checker, the daemon client) happen on the code
+# path that needs them, so `--help` and argument errors return without loading them.
 from .env_guard import require_uv_project_env
 
 
 def _read_payload(input_path: str | None) -> dict:
     if input_path:
-        return json.loads(Path(input_path).read_text())
+        with open(input_path, encoding="utf-8") as fh:
+            return json.load(fh)
     return json.loads(sys.stdin.read())
 
 
-def _write_output(payload: dict, output_path: str | None) -> None:
-    rendered = json.dumps(payload, indent=2)
+def _write_output(payload: dict | str, output_path: str | None) -> None:
+    rendered = payload if isinstance(payload, str) else json.dumps(payload, indent=2)
     if output_path:
-        Path(output_path).write_text(rendered + "\n")
+        with open(output_path, "w", encoding="utf-8") as fh:
+            fh.write(rendered + "\n")
     else:
         sys.stdout.write(rendered + "\n")
 
 
+def _append_ndjson_line(payload: dict, output_path: str | None) -> None:
+    if output_path:
+        with open(output_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload) + "\n")
+    else:
+        sys.stdout.write(json.dumps(payload) + "\n")
+
+
+async def _stream_ndjson(payload, output_path: str | None) -> None:
+    from .checker import iter_check_domains
+    from .summary import RunSummary
+
+    summary = RunSummary(
+        tlds=[t.lower() for t in payload.tlds],
+        allow_unknown=payload.options.treat_unknown_as_available,
+    )
+    fh = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    try:
+        async for result in iter_check_domains(payload, summary):
+            fh.write(result.model_dump_json() + "\n")
+            fh.flush()
+        fh.write(json.dumps({"summary": summary.as_dict()}) + "\n")
+        fh.flush()
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+
+
+def _run_bulk(raw: dict, args: argparse.Namespace) -> int:
+    import asyncio
+    from pathlib import Path
+
+    from pydantic import ValidationError
+
+    from .bulk import JournalMismatch, run_bulk_job
+
+    if not isinstance(raw, dict):
+        sys.stderr.write("Input validation error: --bulk expects a JSON object with tlds and options\n")
+        return 2
+    sld_path = Path(args.bulk)
+    journal_path = Path(args.journal) if args.journal else sld_path.with_name(sld_path.name + ".journal.ndjson")
+    try:
+        report = asyncio.run(run_bulk_job(raw, sld_path, journal_path, args.chunk_size, progress=sys.stderr))
+    except (ValidationError, JournalMismatch, OSError) as exc:
+        sys.stderr.write(f"Input validation error: {exc}\n")
+        return 2
+    except KeyboardInterrupt:
+        sys.stderr.write(f"Interrupted; rerun the same command to resume from {journal_path}\n")
+        return 130
+    _write_output(report, args.output)
+    return 0
+
+
 def main() -> int:
     try:
         require_uv_project_env()
@@ -30,29 +85,109 @@ def main() -> int:
         sys.stderr.write(f"Environment error: {exc}\n")
         return 2
 
-    from pydantic import ValidationError
-
-    from .checker import check_domains
-    from .models import CheckDomainsInput
-
     parser = argparse.ArgumentParser(description="DomainScout domain checker")
     parser.add_argument("--input", help="Path to JSON input payload")
     parser.add_argument("--output", help="Path to JSON output payload")
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="json: one document after all lookups; ndjson: one line per result as it completes, then a summary line",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_const",
+        const="bypass",
+        dest="cache_mode",
+        help="Neither read nor write the verdict cache",
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_const",
+        const="refresh",
+        dest="cache_mode",
+        help="Ignore cached verdicts but store fresh results",
+    )
+    parser.add_argument("--stats", action="store_true", help="Include per-server and per-TLD lookup metrics in the output")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived daemon instead of checking one payload")
+    parser.add_argument("--socket", help="Unix socket the daemon listens on (default: .rig_cache/domainscout-check.sock)")
+    parser.add_argument("--port", type=int, help="Serve/forward over 127.0.0.1:<port> instead of the Unix socket")
+    parser.add_argument("--no-daemon", action="store_true", help="Always run in-process, even if a daemon is up")
+    parser.add_argument(
+        "--bulk",
+        metavar="SLD_FILE",
+        help="Bulk job: check every SLD in this newline-delimited file against the --input payload's TLDs and options",
+    )
+    parser.add_argument("--journal", help="Bulk job journal (default: SLD_FILE.journal.ndjson); rerun to resume")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Bulk job SLDs per checkpoint (default: %(default)s)")
     args = parser.parse_args()
+    if not (1 <= args.chunk_size <= 5000):
+        parser.error("--chunk-size expects a value in [1, 5000]")
+
+    if args.serve:
+        from .daemon import run_daemon
+        from .daemon_client import DEFAULT_SOCKET_PATH
+
+        return run_daemon(None if args.port is not None else args.socket or DEFAULT_SOCKET_PATH, args.port)
 
     try:
         raw = _read_payload(args.input)
+    except (json.JSONDecodeError, OSError) as exc:
+        sys.stderr.write(f"Input validation error: {exc}\n")
+        return 2
+    if args.cache_mode and isinstance(raw, dict):
+        raw.setdefault("options", {})["cache_mode"] = args.cache_mode
+    if args.stats and isinstance(raw, dict):
+        raw.setdefault("options", {})["include_stats"] = True
+
+    if args.bulk:
+        return _run_bulk(raw, args)
+
+    if args.format == "json" and not args.no_daemon:
+        from .daemon_client import DEFAULT_SOCKET_PATH, DaemonRequestError, forward_check
+
+        try:
+            forwarded = forward_check(raw, socket_path=args.socket or DEFAULT_SOCKET_PATH, port=args.port)
+        except DaemonRequestError as exc:
+            _write_output({"error": str(exc)}, args.output)
+            return 3
+        if forwarded is not None:
+            status, body = forwarded
+            if status == 200:
+                _write_output(body, args.output)
+                return 0
+            if status == 400:
+                sys.stderr.write(f"Input validation error: {body.get('error')}\n")
+                return 2
+            _write_output({"error": body.get("error", f"daemon returned HTTP {status}")}, args.output)
+            return 3
+
+    import asyncio
+
+    from pydantic import ValidationError
+
+    from .checker import check_domains_table, output_json
+    from .models import CheckDomainsInput
+
+    try:
         payload = CheckDomainsInput.model_validate(raw)
-    except (json.JSONDecodeError, OSError, ValidationError) as exc:
+    except ValidationError as exc:
         sys.stderr.write(f"Input validation error: {exc}\n")
         return 2
 
     try:
-        output = asyncio.run(check_domains(payload))
-        _write_output(output.model_dump(mode="json"), args.output)
+        if args.format == "ndjson":
+            asyncio.run(_stream_ndjson(payload, args.output))
+        else:
+            table, summary = asyncio.run(check_domains_table(payload))
+            _write_output(output_json(table, summary, payload.options.include_stats, indent=2), args.output)
     except Exception as exc:  # pragma: no cover - defensive fallback for CLI consumers
         error_payload = {"error": str(exc)}
-        _write_output(error_payload, args.output)
+        if args.format == "ndjson":
+            _append_ndjson_line(error_payload, args.output)
+        else:
+            _write_output(error_payload, args.output)
         return 3
 
     return 0
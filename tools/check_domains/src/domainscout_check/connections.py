@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from collections import Counter
+from functools import lru_cache
+
+import httpx
+
+from .scheduler import ServerLane
+
+PREWARM_PATH = "/help"
+PREWARM_EXTENSION = "domainscout_prewarm"
+# Extra HTTP/1.1 connections opened up front; the rest of the pool opens on demand.
+PREWARM_MAX_CONNECTIONS = 8
+
+
+@lru_cache(maxsize=1)
+def http2_supported() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_transport(max_connections: int, http2: bool) -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(
+        http2=http2 and http2_supported(),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+class ConnectionStats:
+    def __init__(self) -> None:
+        self.requests: Counter[str] = Counter()
+        self.connections: Counter[str] = Counter()
+        self.reused: Counter[str] = Counter()
+        self.prewarmed: Counter[str] = Counter()
+        self.versions: dict[str, Counter[str]] = {}
+
+    def record_response(self, host: str, http_version: str, reused: bool) -> None:
+        self.requests[host] += 1
+        self.reused[host] += int(reused)
+        self.versions.setdefault(host, Counter())[http_version] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            host: {
+                "requests": self.requests[host],
+                "connections": self.connections[host],
+                "reused": self.reused[host],
+                "prewarmed": self.prewarmed[host],
+                "http_versions": dict(self.versions.get(host, {})),
+            }
+            for host in sorted(set(self.requests) | set(self.connections))
+        }
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Counts new sockets and negotiated HTTP versions per host via httpcore trace events."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: ConnectionStats) -> None:
+        self._transport = transport
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.netloc.decode("ascii")
+        downstream = request.extensions.get("trace")
+        prewarm = bool(request.extensions.get(PREWARM_EXTENSION))
+        opened = False
+
+        async def trace(event: str, info: dict) -> None:
+            nonlocal opened
+            if event == "connection.connect_tcp.complete":
+                self.stats.connections[host] += 1
+                self.stats.prewarmed[host] += int(prewarm)
+                opened = True
+            if downstream is not None:
+                await downstream(event, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        response = await self._transport.handle_async_request(request)
+        if not prewarm:
+            version = response.extensions.get("http_version", b"HTTP/1.1")
+            self.stats.record_response(host, version.decode("ascii"), reused=not opened)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+async def _warm_one(client: httpx.AsyncClient, url: str, lane: ServerLane | None) -> str | None:
+    if lane is not None:
+        # Probes are requests to the server too: same rate limit and Retry-After pause, none once it trips.
+        if lane.breaker is not None and lane.breaker.state != "closed":
+            return None
+        await lane.pace()
+    try:
+        response = await client.head(url, extensions={PREWARM_EXTENSION: True})
+    except (httpx.HTTPError, httpx.InvalidURL):
+        return None
+    return response.http_version
+
+
+async def prewarm_host(
+    client: httpx.AsyncClient,
+    rdap_base: str,
+    connections: int,
+    ready: asyncio.Future[None] | None = None,
+    lane: ServerLane | None = None,
+) -> None:
+    """Resolve, connect and handshake ahead of the first lookup.
+
+    One probe first, then ``ready`` resolves: if the server negotiated HTTP/2 every lookup
+    multiplexes over that connection. Otherwise open up to ``PREWARM_MAX_CONNECTIONS`` more
+    of the lane's HTTP/1.1 pool with parallel probes (one of them lands on the idle first
+    connection) while lookups start. With a ``lane``, probes honor its pacing and breaker.
+    """
+    url = f"{rdap_base.rstrip('/')}{PREWARM_PATH}"
+    try:
+        version = await _warm_one(client, url, lane)
+    finally:
+        if ready is not None and not ready.done():
+            ready.set_result(None)
+    connections = min(connections, PREWARM_MAX_CONNECTIONS)
+    if version is None or version == "HTTP/2" or connections <= 1:
+        return
+    await asyncio.gather(*(_warm_one(client, url, lane) for _ in range(connections)))
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import socket
+import time
+from http import HTTPStatus
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from .checker import check_domains_table, output_json
+from .daemon_client import CWD_HEADER, PATH_OPTIONS
+from .metrics import OPENMETRICS_CONTENT_TYPE
+from .models import CheckDomainsInput
+from .resources import CheckerResources
+
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+_LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "[::1]"})
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def _host_name(value: str) -> str:
+    value = value.lower()
+    if value.startswith("["):
+        return value.split("]", 1)[0] + "]"
+    return value.rsplit(":", 1)[0] if value.count(":") == 1 else value
+
+
+def _foreign_origin(headers: dict[str, str]) -> str | None:
+    """Name the header that shows a request did not come from a local client.
+
+    A browser page on any site can reach 127.0.0.1, and DNS rebinding lets it do so under
+    its own host name; both show up in ``Host`` or ``Origin``. Local clients send
+    ``Host: localhost`` or ``127.0.0.1`` and no ``Origin``.
+    """
+    if _host_name(headers.get("host", "localhost")) not in _LOOPBACK_HOSTS:
+        return "Host"
+    origin = headers.get("origin")
+    if origin is not None:
+        _scheme, _, authority = origin.partition("://")
+        if _host_name(authority.split("/", 1)[0]) not in _LOOPBACK_HOSTS:
+            return "Origin"
+    return None
+
+
+def _absolutize_paths(payload: CheckDomainsInput, client_cwd: str | None) -> None:
+    if not client_cwd:
+        return
+    for name in PATH_OPTIONS:
+        value = getattr(payload.options, name)
+        if value and not Path(value).is_absolute():
+            setattr(payload.options, name, str(Path(client_cwd) / value))
+
+
+class CheckerDaemon:
+    def __init__(self, resources: CheckerResources, socket_path: str | None = None, port: int | None = None) -> None:
+        if (socket_path is None) == (port is None):
+            raise ValueError("CheckerDaemon needs exactly one of socket_path or port")
+        self.resources = resources
+        self.socket_path = socket_path
+        self.port = port
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self._server: asyncio.base_events.Server | None = None
+
+    async def start(self) -> None:
+        if self.socket_path is not None:
+            path = Path(self.socket_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                if _socket_is_live(path):
+                    raise DaemonError(f"A daemon is already listening on {path}")
+                path.unlink()
+            self._server = await asyncio.start_unix_server(self._handle, path=str(path))
+        else:
+            self._server = await asyncio.start_server(self._handle, host="127.0.0.1", port=self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.socket_path is not None:
+            Path(self.socket_path).unlink(missing_ok=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+            headers: dict[str, str] = {}
+            while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0"))
+            if length > MAX_BODY_BYTES:
+                status, body = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "payload too large"}
+            else:
+                raw = await reader.readexactly(length) if length else b""
+                status, body = await self.dispatch(method, target.split("?", 1)[0], raw, headers)
+            await _write_response(writer, status, body)
+        except (ValueError, asyncio.IncompleteReadError):
+            await _write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "malformed request"})
+        finally:
+            writer.close()
+
+    async def dispatch(
+        self, method: str, path: str, raw: bytes, headers: dict[str, str]
+    ) -> tuple[HTTPStatus, dict | str | bytes]:
+        foreign = _foreign_origin(headers)
+        if foreign is not None:
+            return HTTPStatus.FORBIDDEN, {"error": f"refusing a request with a non-local {foreign} header"}
+        if method == "GET" and path == "/metrics":
+            return HTTPStatus.OK, self.resources.metrics.render_openmetrics()
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "uptime_s": round(time.monotonic() - self.started_at, 3),
+                "requests": self.requests,
+            }
+        if method == "POST" and path == "/check":
+            self.requests += 1
+            content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            if content_type != "application/json":
+                return HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "POST /check needs Content-Type: application/json"}
+            try:
+                payload = CheckDomainsInput.model_validate(json.loads(raw or b"{}"))
+            except (json.JSONDecodeError, ValidationError) as exc:
+                return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+            # Only a Unix-socket peer is a process on this machine with access to the socket
+            # file; over TCP the header is ignored and defaults resolve against the daemon's cwd.
+            if self.socket_path is not None:
+                _absolutize_paths(payload, headers.get(CWD_HEADER.lower()))
+            try:
+                table, summary = await check_domains_table(payload, resources=self.resources)
+            except Exception as exc:  # pragma: no cover - surfaced to the client as a tool error
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+            return HTTPStatus.OK, output_json(table, summary, payload.options.include_stats).encode("utf-8")
+        return HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"}
+
+
+def _socket_is_live(path: Path) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus, body: dict | str | bytes) -> None:
+    """Send ``body``: a dict as JSON, text as OpenMetrics, bytes as already-encoded JSON."""
+    if isinstance(body, bytes):
+        encoded, content_type = body, "application/json"
+    elif isinstance(body, str):
+        encoded, content_type = body.encode("utf-8"), OPENMETRICS_CONTENT_TYPE
+    else:
+        encoded, content_type = json.dumps(body).encode("utf-8"), "application/json"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(encoded)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + encoded)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass
+
+
+async def serve(socket_path: str | None, port: int | None) -> None:
+    async with CheckerResources() as resources:
+        daemon = CheckerDaemon(resources, socket_path=socket_path, port=port)
+        await daemon.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        where = daemon.socket_path or f"127.0.0.1:{daemon.port}"
+        print(f"domainscout-check daemon listening on {where}", flush=True)
+        try:
+            await stop.wait()
+        finally:
+            await daemon.close()
+
+
+def run_daemon(socket_path: str | None, port: int | None) -> int:
+    try:
+        asyncio.run(serve(socket_path, port))
+    except DaemonError as exc:
+        print(f"Daemon error: {exc}")
+        return 2
+    return 0
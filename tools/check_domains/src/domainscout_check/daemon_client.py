@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+from pathlib import Path
+
+
+DEFAULT_SOCKET_PATH = ".rig_cache/domainscout-check.sock"
+CWD_HEADER = "X-Domainscout-Cwd"
+# Bounds a connect, a send or a wait for the reply; generous because /check answers only after the whole run.
+DAEMON_TIMEOUT_SECONDS = 600.0
+# Payload options naming files; the client resolves relative ones against its own cwd.
+PATH_OPTIONS = ("bootstrap_cache_path", "cache_path", "zone_index_dir")
+
+
+class DaemonRequestError(RuntimeError):
+    """The daemon accepted the connection but the request failed (timeout, reset)."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float | None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def daemon_request(
+    method: str,
+    path: str,
+    body: dict | None = None,
+    socket_path: str = DEFAULT_SOCKET_PATH,
+    port: int | None = None,
+    timeout: float = DAEMON_TIMEOUT_SECONDS,
+) -> tuple[int, dict] | None:
+    """Send one request to the daemon.
+
+    Returns None when no daemon is listening, so the caller can run in-process. Once
+    connected, a failure raises ``DaemonRequestError``: the daemon may already be running
+    the job, and rerunning it locally would hide the problem and double the load.
+    """
+    if port is None and not Path(socket_path).exists():
+        return None
+    if port is not None:
+        conn: http.client.HTTPConnection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    else:
+        conn = _UnixHTTPConnection(socket_path, timeout=timeout)
+
+    encoded = json.dumps(body).encode("utf-8") if body is not None else None
+    headers = {"Content-Type": "application/json", CWD_HEADER: os.getcwd()}
+    try:
+        try:
+            conn.connect()
+        except OSError:
+            return None
+        try:
+            conn.request(method, path, body=encoded, headers=headers)
+            response = conn.getresponse()
+            raw = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            raise DaemonRequestError(f"daemon request {method} {path} failed: {exc}") from exc
+    finally:
+        conn.close()
+    try:
+        return response.status, json.loads(raw or b"{}")
+    except json.JSONDecodeError:
+        return response.status, {"error": raw.decode("utf-8", errors="replace")}
+
+
+def forward_check(
+    raw_payload: dict,
+    socket_path: str = DEFAULT_SOCKET_PATH,
+    port: int | None = None,
+    timeout: float = DAEMON_TIMEOUT_SECONDS,
+) -> tuple[int, dict] | None:
+    options = raw_payload.get("options") if isinstance(raw_payload, dict) else None
+    if isinstance(options, dict):
+        resolved = {
+            name: os.path.abspath(options[name])
+            for name in PATH_OPTIONS
+            if isinstance(options.get(name), str) and options[name]
+        }
+        raw_payload = {**raw_payload, "options": {**options, **resolved}}
+    return daemon_request("POST", "/check", raw_payload, socket_path=socket_path, port=port, timeout=timeout)
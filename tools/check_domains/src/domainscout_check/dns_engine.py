@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import random
+import socket
+from functools import lru_cache
+
+import dns.exception
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+
+from .models import DNSProbeEvidence
+
+
+_MAX_PENDING_PER_SOCKET = 60000
+_RECV_BUFFER_BYTES = 4 * 1024 * 1024
+_ATTEMPTS_PER_SERVER = 2
+
+
+def enlarge_receive_buffer(transport: asyncio.BaseTransport) -> None:
+    sock = transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECV_BUFFER_BYTES)
+    except OSError:
+        pass
+
+
+def parse_nameserver(spec: str) -> tuple[str, int]:
+    host, port = spec, 53
+    if spec.startswith("["):
+        host, _, rest = spec[1:].partition("]")
+        if rest.startswith(":"):
+            port = int(rest[1:])
+    elif spec.count(":") == 1:
+        host, port_text = spec.split(":")
+        port = int(port_text)
+    if not 0 < port < 65536:
+        raise ValueError(f"invalid nameserver port: {spec}")
+    return host, port
+
+
+async def resolve_nameservers(specs: list[str]) -> list[tuple[str, int]]:
+    """``host`` / ``host:port`` specs as IP targets; hostnames are resolved once, unusable specs dropped."""
+    loop = asyncio.get_running_loop()
+    nameservers: list[tuple[str, int]] = []
+    for spec in specs:
+        try:
+            host, port = parse_nameserver(spec)
+        except ValueError:
+            continue
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            try:
+                infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+            except (OSError, UnicodeError):
+                continue
+            if not infos:
+                continue
+            host = infos[0][4][0]
+        nameservers.append((host, port))
+    return nameservers
+
+
+@lru_cache(maxsize=1)
+def system_nameservers() -> tuple[tuple[str, int], ...]:
+    try:
+        resolver = dns.resolver.Resolver(configure=True)
+    except dns.resolver.NoResolverConfiguration:
+        return ()
+    nameservers: list[tuple[str, int]] = []
+    for ns in resolver.nameservers:
+        try:
+            ipaddress.ip_address(ns)
+        except ValueError:
+            continue
+        nameservers.append((ns, resolver.nameserver_ports.get(ns, resolver.port)))
+    return tuple(nameservers)
+
+
+class _ReplyProtocol(asyncio.DatagramProtocol):
+    def __init__(self) -> None:
+        self.transport: asyncio.DatagramTransport | None = None
+        self.pending: dict[int, tuple[tuple[str, int], asyncio.Future[bytes]]] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+        enlarge_receive_buffer(transport)
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        if len(data) < 2:
+            return
+        query_id = int.from_bytes(data[:2], "big")
+        entry = self.pending.get(query_id)
+        if entry is None:
+            return
+        target, future = entry
+        if (addr[0], addr[1]) != target or future.done():
+            return
+        del self.pending[query_id]
+        future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        _ = exc
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        for _, future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc or ConnectionError("dns socket closed"))
+        self.pending.clear()
+
+
+class AsyncDNSEngine:
+    def __init__(self, nameservers: list[tuple[str, int]], sockets_per_family: int = 4) -> None:
+        if not nameservers:
+            raise ValueError("AsyncDNSEngine needs at least one nameserver")
+        self.nameservers = nameservers
+        self.sockets_per_family = sockets_per_family
+        self._sockets: dict[int, list[_ReplyProtocol]] = {}
+        self.queries = 0
+        self.timeouts = 0
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        families = {socket.AF_INET6 if ipaddress.ip_address(host).version == 6 else socket.AF_INET for host, _ in self.nameservers}
+        for family in families:
+            local = ("::", 0) if family == socket.AF_INET6 else ("0.0.0.0", 0)
+            protocols: list[_ReplyProtocol] = []
+            for _ in range(self.sockets_per_family):
+                _, protocol = await loop.create_datagram_endpoint(_ReplyProtocol, local_addr=local, family=family)
+                protocols.append(protocol)
+            self._sockets[family] = protocols
+
+    async def close(self) -> None:
+        for protocols in self._sockets.values():
+            for protocol in protocols:
+                if protocol.transport is not None:
+                    protocol.transport.close()
+        self._sockets.clear()
+
+    async def __aenter__(self) -> AsyncDNSEngine:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.close()
+
+    def _pick_socket(self, host: str) -> _ReplyProtocol:
+        family = socket.AF_INET6 if ipaddress.ip_address(host).version == 6 else socket.AF_INET
+        return min(self._sockets[family], key=lambda protocol: len(protocol.pending))
+
+    async def _exchange(self, query: dns.message.Message, target: tuple[str, int], timeout_s: float) -> dns.message.Message:
+        protocol = self._pick_socket(target[0])
+        if protocol.transport is None or len(protocol.pending) >= _MAX_PENDING_PER_SOCKET:
+            raise dns.exception.Timeout()
+        query_id = random.randrange(65536)
+        while query_id in protocol.pending:
+            query_id = random.randrange(65536)
+        query.id = query_id
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        protocol.pending[query_id] = (target, future)
+        protocol.transport.sendto(query.to_wire(), target)
+        try:
+            wire = await asyncio.wait_for(future, timeout_s)
+        except asyncio.TimeoutError:
+            raise dns.exception.Timeout() from None
+        finally:
+            if protocol.pending.get(query_id, (None, None))[1] is future:
+                del protocol.pending[query_id]
+        response = dns.message.from_wire(wire)
+        if not query.is_response(response):
+            raise dns.exception.FormError("mismatched DNS reply")
+        return response
+
+    async def query(self, name: str, rdtype: str, timeout_s: float) -> dns.message.Message | None:
+        self.queries += 1
+        query = dns.message.make_query(dns.name.from_text(name), dns.rdatatype.from_text(rdtype))
+        per_attempt = timeout_s / (len(self.nameservers) * _ATTEMPTS_PER_SERVER)
+        for target in self.nameservers:
+            for _ in range(_ATTEMPTS_PER_SERVER):
+                try:
+                    response = await self._exchange(query, target, per_attempt)
+                except dns.exception.Timeout:
+                    continue
+                except (dns.exception.FormError, ConnectionError):
+                    break
+                if response.rcode() == dns.rcode.SERVFAIL:
+                    break
+                return response
+        self.timeouts += 1
+        return None
+
+    async def probe(self, domain: str, timeout_s: float) -> DNSProbeEvidence:
+        ns_reply, soa_reply = await asyncio.gather(
+            self.query(domain, "NS", timeout_s),
+            self.query(domain, "SOA", timeout_s),
+        )
+        if _has_answer(ns_reply, dns.rdatatype.NS):
+            return DNSProbeEvidence(dns_ns=True)
+        if _is_nxdomain(ns_reply) or _is_nxdomain(soa_reply):
+            return DNSProbeEvidence(dns_nxdomain=True)
+        if _has_answer(soa_reply, dns.rdatatype.SOA):
+            return DNSProbeEvidence(dns_soa=True)
+        return DNSProbeEvidence()
+
+
+def _is_nxdomain(reply: dns.message.Message | None) -> bool:
+    return reply is not None and reply.rcode() == dns.rcode.NXDOMAIN
+
+
+def _has_answer(reply: dns.message.Message | None, rdtype: dns.rdatatype.RdataType) -> bool:
+    if reply is None or reply.rcode() != dns.rcode.NOERROR:
+        return False
+    return any(rrset.rdtype == rdtype and len(rrset) > 0 for rrset in reply.answer)
+
+
+async def open_dns_engine(nameserver_specs: list[str] | None) -> AsyncDNSEngine | None:
+    nameservers = await resolve_nameservers(nameserver_specs) if nameserver_specs else list(system_nameservers())
+    if not nameservers:
+        return None
+    engine = AsyncDNSEngine(nameservers)
+    await engine.start()
+    return engine
@@ -5,6 +5,7 @@ import asyncio
 import dns.exception
 import dns.resolver
 
+from .dns_engine import AsyncDNSEngine
 from .models import DNSProbeEvidence
 
 
@@ -16,8 +17,15 @@ def map_dns_probe_to_status(evidence: DNSProbeEvidence) -> tuple[str, float]:
     return "unknown", 0.30
 
 
-def _probe_domain_dns_sync(domain: str, timeout_s: float) -> DNSProbeEvidence:
+def _probe_domain_dns_sync(
+    domain: str,
+    timeout_s: float,
+    nameservers: list[tuple[str, int]] | None = None,
+) -> DNSProbeEvidence:
     resolver = dns.resolver.Resolver(configure=True)
+    if nameservers:
+        resolver.nameservers = [host for host, _ in nameservers]
+        resolver.nameserver_ports = dict(nameservers)
     resolver.lifetime = timeout_s
     resolver.timeout = timeout_s
 
@@ -42,6 +50,14 @@ def _probe_domain_dns_sync(domain: str, timeout_s: float) -> DNSProbeEvidence:
     return DNSProbeEvidence()
 
 
-async def probe_domain_dns(domain: str, timeout_ms: int) -> DNSProbeEvidence:
+async def probe_domain_dns(
+    domain: str,
+    timeout_ms: int,
+    engine: AsyncDNSEngine | None = None,
+    nameservers: list[tuple[str, int]] | None = None,
+) -> DNSProbeEvidence:
+    """Probe through ``engine``, or the threaded resolver (on ``nameservers`` when given)."""
     timeout_s = timeout_ms / 1000
-    return await asyncio.to_thread(_probe_domain_dns_sync, domain, timeout_s)
+    if engine is not None:
+        return await engine.probe(domain, timeout_s)
+    return await asyncio.to_thread(_probe_domain_dns_sync, domain, timeout_s, nameservers)
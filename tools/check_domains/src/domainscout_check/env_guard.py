@@ -1,19 +1,23 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
 
 
-def _find_project_root(start: Path) -> Path:
-    for parent in [start, *start.parents]:
-        if (parent / "pyproject.toml").exists():
-            return parent
-    raise RuntimeError("Could not locate project root (missing pyproject.toml in parent paths).")
+def _find_project_root(start: str) -> str:
+    # os.path rather than pathlib: this runs before every command, including --help.
+    current = start
+    while True:
+        if os.path.exists(os.path.join(current, "pyproject.toml")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            raise RuntimeError("Could not locate project root (missing pyproject.toml in parent paths).")
+        current = parent
 
 
 def require_uv_project_env() -> None:
-    project_root = _find_project_root(Path(__file__).resolve())
-    required_venv = (project_root / ".venv").resolve()
+    project_root = _find_project_root(os.path.dirname(os.path.realpath(__file__)))
+    required_venv = os.path.realpath(os.path.join(project_root, ".venv"))
     uv_bin = os.environ.get("UV")
     active_venv = os.environ.get("VIRTUAL_ENV")
 
@@ -26,7 +30,7 @@ def require_uv_project_env() -> None:
             "No active virtual environment detected. Use: `uv sync` then `uv run <command>`."
         )
 
-    resolved_active_venv = Path(active_venv).resolve()
+    resolved_active_venv = os.path.realpath(active_venv)
     if resolved_active_venv != required_venv:
         raise RuntimeError(
             "This RIG requires the project environment at "
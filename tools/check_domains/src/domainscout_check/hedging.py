@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+from .scheduler import ServerLane
+
+RDAPAnswer = tuple[str, float, int | None, str | None, float | None]
+
+_WINDOW = 256
+_MIN_SAMPLES = 20
+_RESORT_EVERY = 16
+_MIN_DELAY_S = 0.005
+
+
+class LatencyWindow:
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._stale += 1
+
+    def percentile(self, pct: float) -> float | None:
+        if len(self._samples) < _MIN_SAMPLES:
+            return None
+        if self._stale >= _RESORT_EVERY or len(self._sorted) < _MIN_SAMPLES:
+            self._sorted = sorted(self._samples)
+            self._stale = 0
+        idx = min(len(self._sorted) - 1, int(len(self._sorted) * pct / 100))
+        return self._sorted[idx]
+
+
+def _is_definitive(answer: RDAPAnswer) -> bool:
+    http_code = answer[2]
+    return http_code is not None and http_code not in {429, 500, 502, 503, 504}
+
+
+class RDAPHedger:
+    """Sends a second RDAP request when the first outlives the server's recent latency percentile.
+
+    Hedges are capped at ``budget_percent`` of all requests. Losing requests are left to
+    finish in the background (cancelling an HTTP/1.1 request would drop its pooled
+    connection) and their completion time gives the latency the hedge saved.
+
+    With a ``lane`` (the hedge target's), a hedge needs a free concurrency slot and a rate
+    token from it and is skipped while the lane is paused or its breaker is not closed.
+    That extra slot is held until both requests finish, so a straggler still counts against
+    the lane after the lookup that owned it has returned.
+    """
+
+    def __init__(self, percentile: float, budget_percent: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.percentile = percentile
+        self.budget = budget_percent / 100
+        self._clock = clock
+        self._windows: dict[str, LatencyWindow] = {}
+        self._stragglers: set[asyncio.Task] = set()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self.lane_denied = 0
+        self.latency_saved_s = 0.0
+
+    def window(self, rdap_base: str) -> LatencyWindow:
+        window = self._windows.get(rdap_base)
+        if window is None:
+            window = self._windows[rdap_base] = LatencyWindow()
+        return window
+
+    def hedge_delay(self, rdap_base: str) -> float | None:
+        delay = self.window(rdap_base).percentile(self.percentile)
+        return None if delay is None else max(delay, _MIN_DELAY_S)
+
+    def _spend(self) -> bool:
+        if self.hedges + 1 > self.budget * self.requests:
+            self.budget_denied += 1
+            return False
+        self.hedges += 1
+        return True
+
+    def _lane_free(self, lane: ServerLane | None) -> bool:
+        if lane is None:
+            return True
+        breaker_closed = lane.breaker is None or lane.breaker.state == "closed"
+        if lane.slots.locked() or not breaker_closed or lane.paused:
+            self.lane_denied += 1
+            return False
+        return True
+
+    @staticmethod
+    def _hold_slot_until_done(lane: ServerLane, tasks: list[asyncio.Task[RDAPAnswer]]) -> None:
+        remaining = len(tasks)
+
+        def release(_task: asyncio.Task[RDAPAnswer]) -> None:
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                lane.slots.release()
+
+        for task in tasks:
+            task.add_done_callback(release)
+
+    async def _hedge(
+        self,
+        query: Callable[[str], Awaitable[RDAPAnswer]],
+        hedge_base: str,
+        primary: asyncio.Task[RDAPAnswer],
+        lane: ServerLane | None,
+    ) -> asyncio.Task[RDAPAnswer] | None:
+        if not self._lane_free(lane) or not self._spend():
+            return None
+        if lane is None:
+            return self._timed(hedge_base, query)
+        await lane.slots.acquire()
+        try:
+            await lane.pace()
+        except BaseException:
+            lane.slots.release()
+            raise
+        lane.requests += 1
+        hedge = self._timed(hedge_base, query)
+        self._hold_slot_until_done(lane, [primary, hedge])
+        return hedge
+
+    def _timed(self, rdap_base: str, query: Callable[[str], Awaitable[RDAPAnswer]]) -> asyncio.Task[RDAPAnswer]:
+        started = self._clock()
+
+        async def run() -> RDAPAnswer:
+            answer = await query(rdap_base)
+            if answer[2] is not None:
+                self.window(rdap_base).add(self._clock() - started)
+            return answer
+
+        return asyncio.create_task(run())
+
+    def _let_finish(self, task: asyncio.Task[RDAPAnswer], started: float, answered_after: float | None) -> None:
+        def settle(done: asyncio.Task[RDAPAnswer]) -> None:
+            self._stragglers.discard(done)
+            if not done.cancelled():
+                done.exception()
+                if answered_after is not None:
+                    self.latency_saved_s += max(0.0, self._clock() - started - answered_after)
+
+        self._stragglers.add(task)
+        task.add_done_callback(settle)
+
+    async def query(
+        self,
+        query: Callable[[str], Awaitable[RDAPAnswer]],
+        rdap_base: str,
+        hedge_base: str,
+        lane: ServerLane | None = None,
+    ) -> RDAPAnswer:
+        self.requests += 1
+        started = self._clock()
+        primary = self._timed(rdap_base, query)
+        pending: set[asyncio.Task[RDAPAnswer]] = {primary}
+        try:
+            delay = self.hedge_delay(rdap_base)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    hedge = await self._hedge(query, hedge_base, primary, lane)
+                    if hedge is not None:
+                        pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # The first definitive answer wins; on a tie prefer the primary.
+                task = min(done, key=lambda t: (not _is_definitive(t.result()), t is not primary))
+                answer = task.result()
+                if not _is_definitive(answer) and pending:
+                    continue
+                hedge_won = task is not primary
+                self.hedge_wins += int(hedge_won)
+                answered_after = self._clock() - started if hedge_won else None
+                for loser in pending:
+                    self._let_finish(loser, started, answered_after)
+                pending = set()
+                return answer
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "lane_denied": self.lane_denied,
+            "latency_saved_s": round(self.latency_saved_s, 3),
+        }
+
+    async def aclose(self) -> None:
+        stragglers = list(self._stragglers)
+        for task in stragglers:
+            task.cancel()
+        await asyncio.gather(*stragglers, return_exceptions=True)
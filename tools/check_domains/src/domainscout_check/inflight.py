@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+_TABLES: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InflightTable] = weakref.WeakKeyDictionary()
+
+
+class InflightTable(Generic[T]):
+    def __init__(self) -> None:
+        self._futures: dict[Hashable, asyncio.Future[T]] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        while True:
+            future = self._futures.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled (its run was abandoned); only re-raise if we were.
+                if future.cancelled():
+                    continue
+                raise
+            self.followers += 1
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        self.leaders += 1
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers see the error; mark it retrieved so an unobserved failure is not logged twice.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+
+def shared_inflight_table() -> InflightTable:
+    loop = asyncio.get_running_loop()
+    table = _TABLES.get(loop)
+    if table is None:
+        table = InflightTable()
+        _TABLES[loop] = table
+    return table
@@ -4,24 +4,29 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
-from .models import CheckDomainsInput, CheckDomainsOutput
+from .models import CheckDomainsInput
+from .summary import RunSummary
 
 
-def append_run_log(cache_dir: Path, payload: CheckDomainsInput, output: CheckDomainsOutput) -> None:
+def append_run_log(cache_dir: Path, payload: CheckDomainsInput, summary: RunSummary) -> None:
     cache_dir.mkdir(parents=True, exist_ok=True)
     log_path = cache_dir / "results.jsonl"
 
-    summary = {
+    record = {
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "tool_version": "0.1.0",
         "options": payload.options.model_dump(),
-        "counts": {
-            "available": sum(1 for r in output.results if r.status == "available"),
-            "taken": sum(1 for r in output.results if r.status == "taken"),
-            "unknown": sum(1 for r in output.results if r.status == "unknown"),
-            "invalid": sum(1 for r in output.results if r.status == "invalid"),
-        },
-        "suggested_best": output.suggested_best,
+        "counts": dict(summary.counts),
+        "suggested_best": summary.suggested_best,
+        "cache": summary.cache.model_dump() if summary.cache is not None else None,
+        "rdap_servers": summary.rdap_servers,
+        "coalesced": summary.coalesced,
+        "connections": summary.connections,
+        "hedging": summary.hedging,
+        "retries": summary.retries,
+        "zone_hits": summary.zone_hits,
+        "early_stop": summary.early_stop.model_dump() if summary.early_stop is not None else None,
+        "stats": summary.metrics.snapshot(),
     }
     with log_path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(summary) + "\n")
+        fh.write(json.dumps(record) + "\n")
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .models import DomainResult
+
+# Upper bounds (seconds) shared by every latency histogram, so runs and servers merge bucket by bucket.
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_S) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: Histogram) -> None:
+        for idx, count in enumerate(other.counts):
+            self.counts[idx] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile (the last bound for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[min(idx, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def snapshot(self) -> dict:
+        snapshot: dict = {"count": self.count, "sum_s": round(self.sum, 4)}
+        for q in (50, 95, 99):
+            value = self.quantile(q / 100)
+            snapshot[f"p{q}_ms"] = None if value is None else round(value * 1000, 1)
+        snapshot["buckets"] = {f"{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        snapshot["buckets"]["+Inf"] = self.counts[-1]
+        return snapshot
+
+
+@dataclass
+class ServerMetrics:
+    latency: Histogram = field(default_factory=Histogram)
+    slot_wait: Histogram = field(default_factory=Histogram)
+    http_codes: Counter[str] = field(default_factory=Counter)
+    timeouts: int = 0
+    errors: int = 0
+    retries: int = 0
+
+    def merge(self, other: ServerMetrics) -> None:
+        self.latency.merge(other.latency)
+        self.slot_wait.merge(other.slot_wait)
+        self.http_codes.update(other.http_codes)
+        self.timeouts += other.timeouts
+        self.errors += other.errors
+        self.retries += other.retries
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.latency.count,
+            "latency": self.latency.snapshot(),
+            "http_codes": dict(sorted(self.http_codes.items())),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "retries": self.retries,
+            "slot_wait": self.slot_wait.snapshot(),
+        }
+
+
+@dataclass
+class TLDMetrics:
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+    dns_fallbacks: int = 0
+
+    def merge(self, other: TLDMetrics) -> None:
+        self.latency.merge(other.latency)
+        self.statuses.update(other.statuses)
+        self.dns_fallbacks += other.dns_fallbacks
+
+    def snapshot(self) -> dict:
+        lookups = self.latency.count
+        return {
+            "lookups": lookups,
+            "latency": self.latency.snapshot(),
+            "statuses": dict(sorted(self.statuses.items())),
+            "dns_fallbacks": self.dns_fallbacks,
+            "dns_fallback_rate": round(self.dns_fallbacks / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RunMetrics:
+    """Per-run lookup metrics, keyed by RDAP server (scheduler lane) and by TLD.
+
+    Server entries count individual RDAP requests (retries included) and the time spent
+    waiting for a concurrency slot; TLD entries count whole domain lookups, RDAP plus
+    any DNS fallback.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.started = clock()
+        self.first_result_s: float | None = None
+        self.wall_s: float | None = None
+        self.servers: dict[str, ServerMetrics] = {}
+        self.tlds: dict[str, TLDMetrics] = {}
+
+    def server(self, base: str) -> ServerMetrics:
+        metrics = self.servers.get(base)
+        if metrics is None:
+            metrics = self.servers[base] = ServerMetrics()
+        return metrics
+
+    def tld(self, tld: str) -> TLDMetrics:
+        metrics = self.tlds.get(tld)
+        if metrics is None:
+            metrics = self.tlds[tld] = TLDMetrics()
+        return metrics
+
+    def record_rdap(self, base: str, seconds: float, http_code: int | None, error: str | None) -> None:
+        server = self.server(base)
+        server.latency.observe(seconds)
+        if http_code is not None:
+            server.http_codes[str(http_code)] += 1
+        elif error == "timeout":
+            server.timeouts += 1
+        else:
+            server.errors += 1
+
+    def record_retry(self, base: str) -> None:
+        self.server(base).retries += 1
+
+    def record_slot_wait(self, lane: str, seconds: float) -> None:
+        self.server(lane).slot_wait.observe(seconds)
+
+    def record_lookup(self, tld: str, seconds: float, result: DomainResult) -> None:
+        metrics = self.tld(tld)
+        metrics.latency.observe(seconds)
+        metrics.statuses[result.status] += 1
+        if result.method in {"dns", "rdap+dns"}:
+            metrics.dns_fallbacks += 1
+
+    def record_network_result(self) -> None:
+        if self.first_result_s is None:
+            self.first_result_s = self._clock() - self.started
+
+    def finish(self) -> None:
+        self.wall_s = self._clock() - self.started
+
+    def merge(self, other: RunMetrics) -> None:
+        """Fold another run's server and TLD entries into this one (wall clock stays this run's)."""
+        for base, metrics in other.servers.items():
+            self.server(base).merge(metrics)
+        for tld, metrics in other.tlds.items():
+            self.tld(tld).merge(metrics)
+
+    def snapshot(self) -> dict:
+        return {
+            "wall_s": None if self.wall_s is None else round(self.wall_s, 4),
+            "first_result_s": None if self.first_result_s is None else round(self.first_result_s, 4),
+            "rdap_servers": {base: metrics.snapshot() for base, metrics in sorted(self.servers.items())},
+            "tlds": {tld: metrics.snapshot() for tld, metrics in sorted(self.tlds.items())},
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels: str) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(float(bound)))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+class MetricsRegistry:
+    """Cumulative metrics across runs, rendered as OpenMetrics text for long-running processes."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.first_result = Histogram()
+        self.run_wall = Histogram(LATENCY_BUCKETS_S + (30.0, 60.0, 120.0, 300.0))
+        self.servers: dict[str, ServerMetrics] = {}
+        self.tlds: dict[str, TLDMetrics] = {}
+
+    def add_run(self, run: RunMetrics) -> None:
+        self.runs += 1
+        if run.first_result_s is not None:
+            self.first_result.observe(run.first_result_s)
+        if run.wall_s is not None:
+            self.run_wall.observe(run.wall_s)
+        for base, metrics in run.servers.items():
+            self.servers.setdefault(base, ServerMetrics()).merge(metrics)
+        for tld, metrics in run.tlds.items():
+            self.tlds.setdefault(tld, TLDMetrics()).merge(metrics)
+
+    def render_openmetrics(self) -> str:
+        lines = ["# TYPE domainscout_runs counter", f"domainscout_runs_total {self.runs}"]
+        lines += ["# TYPE domainscout_run_seconds histogram", "# UNIT domainscout_run_seconds seconds"]
+        lines += _histogram_lines("domainscout_run_seconds", self.run_wall)
+        lines += ["# TYPE domainscout_first_result_seconds histogram", "# UNIT domainscout_first_result_seconds seconds"]
+        lines += _histogram_lines("domainscout_first_result_seconds", self.first_result)
+
+        servers = sorted(self.servers.items())
+        lines += ["# TYPE domainscout_rdap_request_seconds histogram", "# UNIT domainscout_rdap_request_seconds seconds"]
+        for base, metrics in servers:
+            if metrics.latency.count:
+                lines += _histogram_lines("domainscout_rdap_request_seconds", metrics.latency, server=base)
+        lines.append("# TYPE domainscout_rdap_responses counter")
+        for base, metrics in servers:
+            for code, count in sorted(metrics.http_codes.items()):
+                lines.append(f"domainscout_rdap_responses_total{_labels(server=base, code=code)} {count}")
+        for name, attr in (("timeouts", "timeouts"), ("errors", "errors"), ("retries", "retries")):
+            lines.append(f"# TYPE domainscout_rdap_{name} counter")
+            for base, metrics in servers:
+                if metrics.latency.count or getattr(metrics, attr):
+                    lines.append(f"domainscout_rdap_{name}_total{_labels(server=base)} {getattr(metrics, attr)}")
+        lines += ["# TYPE domainscout_slot_wait_seconds histogram", "# UNIT domainscout_slot_wait_seconds seconds"]
+        for base, metrics in servers:
+            if metrics.slot_wait.count:
+                lines += _histogram_lines("domainscout_slot_wait_seconds", metrics.slot_wait, lane=base)
+
+        tlds = sorted(self.tlds.items())
+        lines += ["# TYPE domainscout_lookup_seconds histogram", "# UNIT domainscout_lookup_seconds seconds"]
+        for tld, metrics in tlds:
+            lines += _histogram_lines("domainscout_lookup_seconds", metrics.latency, tld=tld)
+        lines.append("# TYPE domainscout_lookup_results counter")
+        for tld, metrics in tlds:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f"domainscout_lookup_results_total{_labels(tld=tld, status=status)} {count}")
+        lines.append("# TYPE domainscout_dns_fallbacks counter")
+        for tld, metrics in tlds:
+            lines.append(f"domainscout_dns_fallbacks_total{_labels(tld=tld)} {metrics.dns_fallbacks}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
@@ -1,16 +1,40 @@
 from __future__ import annotations
 
+import os
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 Status = Literal["available", "taken", "unknown", "invalid"]
-Method = Literal["rdap", "dns", "rdap+dns"]
+Method = Literal["rdap", "dns", "rdap+dns", "zone", "simulated"]
+Backend = Literal["cache", "zone", "rdap", "dns", "simulated", "deterministic"]
+LookupBackendName = Literal["rdap", "dns", "simulated"]
+CacheMode = Literal["use", "refresh", "bypass"]
+DNSEngineKind = Literal["async", "thread"]
+# Overrides the default cache_mode (not an explicit one), e.g. "bypass" for a CI or test run.
+CACHE_MODE_ENV = "DOMAINSCOUT_CACHE_MODE"
+
+
+def _default_cache_mode() -> CacheMode:
+    mode = os.environ.get(CACHE_MODE_ENV, "use")
+    return mode if mode in ("use", "refresh", "bypass") else "use"
+
+
+class SimulatedBackendOptions(BaseModel):
+    model_config = ConfigDict(extra="forbid", defer_build=True)
+
+    latency_ms_median: float = Field(default=40.0, ge=0, le=60000)
+    latency_ms_p99: float = Field(default=400.0, ge=0, le=60000)
+    available_rate: float = Field(default=0.3, ge=0, le=1)
+    error_rate: float = Field(default=0.0, ge=0, le=1)
+    timeout_rate: float = Field(default=0.0, ge=0, le=1)
+    max_lookups_per_second: float | None = Field(default=None, gt=0)
+    seed: int = Field(default=0, ge=0)
 
 
 class ToolOptions(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     timeout_ms: int = Field(default=2500, ge=100, le=30000)
     max_concurrency: int = Field(default=20, ge=1, le=200)
@@ -23,10 +47,45 @@ class ToolOptions(BaseModel):
     rdap_fallback_base: str | None = None
     deterministic_mode: bool = False
     deterministic_seed: int = Field(default=17, ge=0)
+    find_best_fast: bool = False
+    find_best_target: int = Field(default=1, ge=1, le=100)
+    rdap_server_concurrency: int | None = Field(default=None, ge=1, le=200)
+    rdap_rate_limit_per_server: float | None = Field(default=None, gt=0)
+    rdap_rate_burst: int = Field(default=5, ge=1, le=200)
+    rdap_retry_after_max_seconds: float = Field(default=30.0, ge=0, le=300)
+    rdap_breaker_threshold: int = Field(default=5, ge=1, le=100)
+    rdap_breaker_cooldown_seconds: float = Field(default=30.0, gt=0, le=600)
+    rdap_retry_budget_percent: float = Field(default=20.0, ge=0, le=100)
+    rdap_hedging: bool = False
+    rdap_hedge_percentile: float = Field(default=95.0, ge=50, le=99.9)
+    rdap_hedge_budget_percent: float = Field(default=5.0, gt=0, le=50)
+    http2: bool = True
+    prewarm_connections: bool = True
+    dns_engine: DNSEngineKind = "async"
+    dns_nameservers: list[str] | None = Field(default=None, min_length=1, max_length=8)
+    coalesce_inflight: bool = True
+    cache_mode: CacheMode = Field(default_factory=_default_cache_mode)
+    # None: verdicts.sqlite3 in the same directory as bootstrap_cache_path.
+    cache_path: str | None = None
+    cache_ttl_taken_seconds: int = Field(default=259200, ge=0)
+    cache_ttl_available_seconds: int = Field(default=14400, ge=0)
+    zone_index_dir: str | None = None
+    shards: int = Field(default=1, ge=1, le=64)
+    lookup_backends: list[LookupBackendName] | None = Field(default=None, min_length=1, max_length=3)
+    simulated: SimulatedBackendOptions = Field(default_factory=SimulatedBackendOptions)
+    include_stats: bool = False
+
+    @field_validator("lookup_backends")
+    @classmethod
+    def _distinct_backends(cls, value: list[LookupBackendName] | None) -> list[LookupBackendName] | None:
+        # Matches the schema's uniqueItems; asking one backend twice would only repeat its answer.
+        if value is not None and len(set(value)) != len(value):
+            raise ValueError("lookup_backends must not repeat a backend")
+        return value
 
 
 class CheckDomainsInput(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     tlds: list[str] = Field(min_length=1, max_length=3)
     slds: list[str] = Field(min_length=1, max_length=5000)
@@ -34,7 +93,7 @@ class CheckDomainsInput(BaseModel):
 
 
 class DNSProbeEvidence(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     dns_nxdomain: bool | None = None
     dns_ns: bool | None = None
@@ -42,7 +101,7 @@ class DNSProbeEvidence(BaseModel):
 
 
 class DomainResult(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     domain: str
     status: Status
@@ -57,11 +116,33 @@ class DomainResult(BaseModel):
     dns_soa: bool | None = None
 
     error: str | None = None
+    backend: Backend | None = None
+
+
+class CacheStats(BaseModel):
+    model_config = ConfigDict(extra="forbid", defer_build=True)
+
+    mode: CacheMode
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+
+
+class EarlyStopStats(BaseModel):
+    model_config = ConfigDict(extra="forbid", defer_build=True)
+
+    target: int
+    triggered: bool = False
+    checked: int = 0
+    skipped: int = 0
 
 
 class CheckDomainsOutput(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     checked_at: str
     results: list[DomainResult]
     suggested_best: str | None = None
+    cache: CacheStats | None = None
+    early_stop: EarlyStopStats | None = None
+    stats: dict | None = None
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
 import json
+import os
+import subprocess
+import sys
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Iterable
 
 import httpx
 
 
 IANA_DNS_BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
+# Cached and bundled bootstrap files store each RDAP base once plus a TLD -> server index map.
+BOOTSTRAP_FORMAT = "domainscout-bootstrap/1"
+BUNDLED_BOOTSTRAP_PATH = Path(__file__).parent / "data" / "rdap_bootstrap.json"
+# A detached refresh marks the cache for this long, so back-to-back runs spawn one fetch.
+DETACHED_REFRESH_HOLD_SECONDS = 60.0
+
+_BOOTSTRAP_MEMO: dict[Path, tuple[int, dict[str, str]]] = {}
+_BOOTSTRAP_REFRESHES: dict[Path, asyncio.Task[None]] = {}
 
 
 def map_rdap_http_status(status_code: int) -> tuple[str, float]:
@@ -24,6 +40,22 @@ def is_retryable_http_status(status_code: int) -> bool:
     return status_code in {429, 500, 502, 503, 504}
 
 
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    return max(0.0, retry_at.timestamp() - now)
+
+
 def _parse_bootstrap_tld_to_rdap(data: dict) -> dict[str, str]:
     services = data.get("services", [])
     mapping: dict[str, str] = {}
@@ -40,46 +72,193 @@ def _parse_bootstrap_tld_to_rdap(data: dict) -> dict[str, str]:
     return mapping
 
 
-async def load_bootstrap_map(
+def _compact_bootstrap(mapping: dict[str, str], publication: str | None) -> dict:
+    servers: dict[str, int] = {}
+    tlds = {tld: servers.setdefault(base, len(servers)) for tld, base in sorted(mapping.items())}
+    return {"format": BOOTSTRAP_FORMAT, "publication": publication, "servers": list(servers), "tlds": tlds}
+
+
+def _expand_bootstrap(data: dict) -> dict[str, str]:
+    if data.get("format") != BOOTSTRAP_FORMAT:
+        # Raw IANA dns.json written by older versions.
+        return _parse_bootstrap_tld_to_rdap(data)
+    servers = data["servers"]
+    return {tld: servers[idx] for tld, idx in data["tlds"].items()}
+
+
+def _read_bootstrap_file(path: Path) -> tuple[dict[str, str], float] | None:
+    """Return the mapping stored at ``path`` and its mtime, parsing each file version once."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    memo = _BOOTSTRAP_MEMO.get(path)
+    if memo is not None and memo[0] == stat.st_mtime_ns:
+        return memo[1], stat.st_mtime
+    try:
+        mapping = _expand_bootstrap(json.loads(path.read_bytes()))
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        return None
+    _BOOTSTRAP_MEMO[path] = (stat.st_mtime_ns, mapping)
+    return mapping, stat.st_mtime
+
+
+def load_bundled_bootstrap_map() -> dict[str, str]:
+    bundled = _read_bootstrap_file(BUNDLED_BOOTSTRAP_PATH)
+    return bundled[0] if bundled is not None else {}
+
+
+def _new_bootstrap_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=10.0)
+
+
+async def fetch_bootstrap_map(
     cache_path: Path,
-    ttl_seconds: int,
     client: httpx.AsyncClient | None = None,
     url: str = IANA_DNS_BOOTSTRAP_URL,
 ) -> dict[str, str]:
-    now = time.time()
-    if cache_path.exists() and (now - cache_path.stat().st_mtime) < ttl_seconds:
-        cached = json.loads(cache_path.read_text())
-        return _parse_bootstrap_tld_to_rdap(cached)
-
     owns_client = client is None
     if client is None:
-        client = httpx.AsyncClient(timeout=10.0)
+        client = _new_bootstrap_client()
 
     try:
         resp = await client.get(url)
         resp.raise_for_status()
         data = resp.json()
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = cache_path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(data))
-        tmp.replace(cache_path)
-        return _parse_bootstrap_tld_to_rdap(data)
     finally:
         if owns_client:
             await client.aclose()
 
+    mapping = _parse_bootstrap_tld_to_rdap(data)
+    if not mapping:
+        raise ValueError(f"RDAP bootstrap from {url} lists no TLDs")
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(_compact_bootstrap(mapping, data.get("publication")), separators=(",", ":")))
+    tmp.replace(cache_path)
+    return mapping
+
+
+async def _revalidate_bootstrap(cache_path: Path, url: str) -> None:
+    try:
+        await fetch_bootstrap_map(cache_path, url=url)
+    except (httpx.HTTPError, OSError, ValueError):
+        # Keep serving the stale copy; the next run past the TTL tries again.
+        pass
+
+
+def _schedule_revalidation(cache_path: Path, url: str) -> None:
+    running = _BOOTSTRAP_REFRESHES.get(cache_path)
+    if running is not None and not running.done():
+        return
+    _BOOTSTRAP_REFRESHES[cache_path] = asyncio.create_task(_revalidate_bootstrap(cache_path, url))
+
+
+def _spawn_detached_refresh(cache_path: Path, url: str) -> None:
+    """Refetch ``cache_path`` in a child process that outlives the caller.
+
+    One-shot runs end with ``asyncio.run()``, which would cancel an in-loop refresh; the
+    child (``python -m domainscout_check.rdap``) writes the cache for the next run instead.
+    """
+    marker = cache_path.with_name(cache_path.name + ".refreshing")
+    try:
+        if time.time() - marker.stat().st_mtime < DETACHED_REFRESH_HOLD_SECONDS:
+            return
+    except OSError:
+        pass
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        package_root = str(Path(__file__).resolve().parent.parent)
+        pythonpath = os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))
+        subprocess.Popen(
+            [sys.executable, "-m", "domainscout_check.rdap", "--output", str(cache_path), "--url", url],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            env={**os.environ, "PYTHONPATH": pythonpath},
+        )
+    except OSError:
+        # Keep serving the stale copy; a later run past the TTL tries again.
+        pass
+
+
+async def wait_bootstrap_refreshes(timeout: float | None = None) -> None:
+    """Wait (at most ``timeout`` seconds) for background bootstrap refreshes started on the running loop."""
+    loop = asyncio.get_running_loop()
+    pending = [task for task in _BOOTSTRAP_REFRESHES.values() if task.get_loop() is loop and not task.done()]
+    if pending:
+        await asyncio.wait(pending, timeout=timeout)
+
+
+async def load_bootstrap_map(
+    cache_path: Path,
+    ttl_seconds: int,
+    client: httpx.AsyncClient | None = None,
+    url: str = IANA_DNS_BOOTSTRAP_URL,
+    required_tlds: Iterable[str] = (),
+    detach_refresh: bool = False,
+) -> dict[str, str]:
+    """Return the TLD -> RDAP base map without waiting on IANA whenever possible.
+
+    A fresh cache is returned as is. An expired cache, or the bundled snapshot when there
+    is no cache yet, is returned at once while a background task refetches it
+    (stale-while-revalidate). Only a ``required_tlds`` entry missing from the stale map
+    makes the caller wait for the fetch, and a failed fetch still falls back to that map.
+    With ``detach_refresh`` the refetch runs in a child process instead, for callers whose
+    event loop closes when their run ends.
+    """
+    cached = _read_bootstrap_file(cache_path)
+    if cached is not None and time.time() - cached[1] < ttl_seconds:
+        return cached[0]
+
+    mapping = cached[0] if cached is not None else load_bundled_bootstrap_map()
+    if any(tld.lstrip(".").lower() not in mapping for tld in required_tlds):
+        try:
+            return await fetch_bootstrap_map(cache_path, client, url)
+        except (httpx.HTTPError, OSError, ValueError):
+            return mapping
+    if detach_refresh:
+        _spawn_detached_refresh(cache_path, url)
+    else:
+        _schedule_revalidation(cache_path, url)
+    return mapping
+
 
 async def query_rdap_domain(
     client: httpx.AsyncClient,
     rdap_base: str,
     domain: str,
-) -> tuple[str, float, int | None, str | None]:
+) -> tuple[str, float, int | None, str | None, float | None]:
     url = f"{rdap_base.rstrip('/')}/domain/{domain}"
     try:
         response = await client.get(url)
         status, confidence = map_rdap_http_status(response.status_code)
-        return status, confidence, response.status_code, None
+        retry_after = None
+        if response.status_code in {429, 503}:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        return status, confidence, response.status_code, None, retry_after
     except httpx.TimeoutException:
-        return "unknown", 0.25, None, "timeout"
+        return "unknown", 0.25, None, "timeout", None
     except httpx.HTTPError as exc:
-        return "unknown", 0.25, None, str(exc)
+        return "unknown", 0.25, None, str(exc), None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Fetch the IANA bootstrap into a cache file; by default, regenerate the bundled snapshot."""
+    parser = argparse.ArgumentParser(description="Fetch the IANA RDAP bootstrap (dns.json) in the compact cache format")
+    parser.add_argument("--output", default=str(BUNDLED_BOOTSTRAP_PATH), help="File to write (default: the bundled snapshot)")
+    parser.add_argument("--url", default=IANA_DNS_BOOTSTRAP_URL)
+    args = parser.parse_args(argv)
+    try:
+        mapping = asyncio.run(fetch_bootstrap_map(Path(args.output), url=args.url))
+    except (httpx.HTTPError, OSError, ValueError) as exc:
+        sys.stderr.write(f"Bootstrap fetch failed: {exc}\n")
+        return 1
+    sys.stdout.write(f"Wrote {len(mapping)} TLDs to {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
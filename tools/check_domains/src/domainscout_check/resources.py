@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Iterable
+
+import httpx
+
+from .cache import VerdictCache
+from .connections import ConnectionStats, InstrumentedTransport, build_transport
+from .dns_engine import AsyncDNSEngine, open_dns_engine
+from .metrics import MetricsRegistry
+from .rdap import load_bootstrap_map
+
+
+# load_bootstrap_map is cheap once parsed; recheck often enough to pick up background refreshes.
+BOOTSTRAP_RECHECK_SECONDS = 60
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Per-run clients must not tear down the pooled connections they borrow.
+        return None
+
+
+class CheckerResources:
+    """Warm state reused across check_domains runs (daemon mode, bulk jobs)."""
+
+    def __init__(self, max_connections: int = 200, http2: bool = True) -> None:
+        self._transport = build_transport(max_connections, http2)
+        self._bootstrap: dict[Path, tuple[dict[str, str], float]] = {}
+        self._dns_engines: dict[tuple[str, ...], AsyncDNSEngine | None] = {}
+        self._caches: dict[Path, VerdictCache] = {}
+        self.metrics = MetricsRegistry()
+
+    def client(self, timeout: httpx.Timeout, stats: ConnectionStats) -> httpx.AsyncClient:
+        transport = InstrumentedTransport(_SharedTransport(self._transport), stats)
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    async def bootstrap_map(
+        self,
+        cache_path: Path,
+        ttl_seconds: int,
+        client: httpx.AsyncClient,
+        required_tlds: Iterable[str] = (),
+    ) -> dict[str, str]:
+        cached = self._bootstrap.get(cache_path)
+        if (
+            cached is not None
+            and time.monotonic() - cached[1] < min(ttl_seconds, BOOTSTRAP_RECHECK_SECONDS)
+            and all(tld.lstrip(".") in cached[0] for tld in required_tlds)
+        ):
+            return cached[0]
+        mapping = await load_bootstrap_map(
+            cache_path=cache_path, ttl_seconds=ttl_seconds, client=client, required_tlds=required_tlds
+        )
+        self._bootstrap[cache_path] = (mapping, time.monotonic())
+        return mapping
+
+    async def dns_engine(self, nameserver_specs: list[str] | None) -> AsyncDNSEngine | None:
+        key = tuple(nameserver_specs or ())
+        if key not in self._dns_engines:
+            self._dns_engines[key] = await open_dns_engine(nameserver_specs)
+        return self._dns_engines[key]
+
+    def verdict_cache(self, path: Path) -> VerdictCache:
+        cache = self._caches.get(path)
+        if cache is None:
+            cache = VerdictCache(path)
+            self._caches[path] = cache
+        return cache
+
+    async def aclose(self) -> None:
+        for engine in self._dns_engines.values():
+            if engine is not None:
+                await engine.close()
+        self._dns_engines.clear()
+        for cache in self._caches.values():
+            cache.close()
+        self._caches.clear()
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> CheckerResources:
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.aclose()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from json.encoder import encode_basestring_ascii as _json_string
+from typing import Iterator
+
+from .models import DomainResult
+from .summary import extract_tld
+
+STATUSES = ("available", "taken", "unknown", "invalid")
+METHODS = ("rdap", "dns", "rdap+dns", "zone", "simulated")
+BACKENDS = ("cache", "zone", "rdap", "dns", "simulated", "deterministic")
+_STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+_METHOD_CODES = {name: code for code, name in enumerate(METHODS)}
+_BACKEND_CODES = {None: -1, **{name: code for code, name in enumerate(BACKENDS)}}
+# Each DNS evidence field takes two bits: "known" and its value, so None survives the round trip.
+_EVIDENCE = ("dns_nxdomain", "dns_ns", "dns_soa")
+_NONE = -1
+# Evidence byte -> (dns_nxdomain, dns_ns, dns_soa), decoded once instead of per row.
+_EVIDENCE_VALUES = [
+    tuple(bool(flags >> (2 * bit) & 2) if flags >> (2 * bit) & 1 else None for bit in range(len(_EVIDENCE)))
+    for flags in range(1 << (2 * len(_EVIDENCE)))
+]
+_EVIDENCE_FLAGS: dict[tuple[bool | None, ...], int] = {}
+for _flags, _values in enumerate(_EVIDENCE_VALUES):
+    _EVIDENCE_FLAGS.setdefault(_values, _flags)
+# JSON fragments for results_json. Code -1 (None) indexes the trailing "null".
+_ROW_FIELDS = ("domain", "status", "confidence", "method", "rdap_server", "rdap_http", *_EVIDENCE, "error", "backend")
+_JSON_LITERALS = {None: "null", True: "true", False: "false"}
+_STATUS_JSON = tuple(map(_json_string, STATUSES))
+_METHOD_JSON = tuple(map(_json_string, METHODS))
+_BACKEND_JSON = (*map(_json_string, BACKENDS), "null")
+_EVIDENCE_JSON = [tuple(map(_JSON_LITERALS.__getitem__, values)) for values in _EVIDENCE_VALUES]
+
+
+def _json_row_template(indent: int | None, depth: int) -> str:
+    """A %-template for one result object laid out as json.dumps(indent=indent) nests it at ``depth``."""
+    if indent is None:
+        opening, separator, closing = "{", ", ", "}"
+    else:
+        inner = "\n" + " " * (indent * (depth + 1))
+        opening, separator, closing = "{" + inner, "," + inner, "\n" + " " * (indent * depth) + "}"
+    return opening + separator.join(f'"{name}": %s' for name in _ROW_FIELDS) + closing
+
+
+class ResultTable:
+    """Column store for check results: one array per field instead of one object per row.
+
+    Domains and RDAP servers are interned strings, status, method and backend small integer codes,
+    confidence a float32 (rounded back to 6 places on read), DNS evidence bit flags and
+    errors a sparse map. ``DomainResult`` objects and JSON rows are built only on demand.
+    """
+
+    def __init__(self) -> None:
+        self.domains: list[str] = []
+        self.status = array("b")
+        self.method = array("b")
+        self.backend = array("b")
+        self.confidence = array("f")
+        self.rdap_http = array("h")
+        self.rdap_server = array("h")
+        self.evidence = array("B")
+        self.errors: dict[int, str] = {}
+        self._servers: list[str] = []
+        self._server_codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def _server_code(self, server: str | None) -> int:
+        if server is None:
+            return _NONE
+        code = self._server_codes.get(server)
+        if code is None:
+            code = self._server_codes[server] = len(self._servers)
+            self._servers.append(sys.intern(server))
+        return code
+
+    def append(self, result: DomainResult) -> None:
+        """Add one result, enforcing the TS1 output row schema.
+
+        Lookup backends build rows with ``model_construct``, which skips pydantic, so the
+        table is where a row is checked: enums through the code maps, types and the
+        confidence range here. The harness relies on this to skip the rows when it
+        validates the TS1 output.
+        """
+        status = _STATUS_CODES.get(result.status)
+        method = _METHOD_CODES.get(result.method)
+        backend = _BACKEND_CODES.get(result.backend)
+        evidence = _EVIDENCE_FLAGS.get((result.dns_nxdomain, result.dns_ns, result.dns_soa))
+        if (
+            status is None
+            or method is None
+            or backend is None
+            or evidence is None
+            or not isinstance(result.domain, str)
+            or len(result.domain) < 3
+            or not isinstance(result.confidence, (int, float))
+            or not 0.0 <= result.confidence <= 1.0
+            or not (result.rdap_http is None or isinstance(result.rdap_http, int))
+            or not (result.rdap_server is None or isinstance(result.rdap_server, str))
+            or not (result.error is None or isinstance(result.error, str))
+        ):
+            raise ValueError(f"result does not match the TS1 output row schema: {result!r}")
+        if result.error is not None:
+            self.errors[len(self.domains)] = result.error
+        self.domains.append(sys.intern(result.domain))
+        self.status.append(status)
+        self.method.append(method)
+        self.backend.append(backend)
+        self.confidence.append(result.confidence)
+        self.rdap_http.append(_NONE if result.rdap_http is None else result.rdap_http)
+        self.rdap_server.append(self._server_code(result.rdap_server))
+        self.evidence.append(evidence)
+
+    def sort_by_tld(self) -> None:
+        """Order rows by (TLD, domain), the order check_domains returns results in."""
+        keys = list(zip(map(extract_tld, self.domains), self.domains))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.domains = [key[1] for key in map(keys.__getitem__, order)]
+        for name in ("status", "method", "backend", "confidence", "rdap_http", "rdap_server", "evidence"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, map(column.__getitem__, order)))
+        if self.errors:
+            position = {old: new for new, old in enumerate(order)}
+            self.errors = {position[old]: error for old, error in self.errors.items()}
+
+    def _row(self, idx, domain, status, confidence, method, server, http, flags, backend) -> dict:
+        nxdomain, ns, soa = _EVIDENCE_VALUES[flags]
+        return {
+            "domain": domain,
+            "status": STATUSES[status],
+            "confidence": round(confidence, 6),
+            "method": METHODS[method],
+            "rdap_server": None if server == _NONE else self._servers[server],
+            "rdap_http": None if http == _NONE else http,
+            "dns_nxdomain": nxdomain,
+            "dns_ns": ns,
+            "dns_soa": soa,
+            "error": self.errors.get(idx),
+            "backend": None if backend == _NONE else BACKENDS[backend],
+        }
+
+    def row(self, idx: int) -> dict:
+        """One result as the JSON object DomainResult.model_dump(mode="json") would produce."""
+        return self._row(
+            idx,
+            self.domains[idx],
+            self.status[idx],
+            self.confidence[idx],
+            self.method[idx],
+            self.rdap_server[idx],
+            self.rdap_http[idx],
+            self.evidence[idx],
+            self.backend[idx],
+        )
+
+    def iter_rows(self) -> Iterator[dict]:
+        columns = (
+            self.domains,
+            self.status,
+            self.confidence,
+            self.method,
+            self.rdap_server,
+            self.rdap_http,
+            self.evidence,
+            self.backend,
+        )
+        for idx, values in enumerate(zip(*columns)):
+            yield self._row(idx, *values)
+
+    def results_json(self, indent: int | None = None, depth: int = 1) -> str:
+        """The results array as JSON text, the same as json.dumps of ``list(iter_rows())``.
+
+        ``indent`` and ``depth`` (nesting level of the array) match json.dumps' layout. Rows
+        are formatted from per-column fragments (each status, server, confidence and HTTP
+        code is encoded once), so no row dict is built and the encoder never walks them.
+        """
+        if not self.domains:
+            return "[]"
+        servers = (*map(_json_string, self._servers), "null")
+        confidences = {value: repr(round(value, 6)) for value in set(self.confidence)}
+        http_codes = {code: str(code) for code in set(self.rdap_http)}
+        http_codes[_NONE] = "null"
+        errors = {idx: _json_string(error) for idx, error in self.errors.items()}
+        template = _json_row_template(indent, depth + 1)
+        rows = [
+            template
+            % (
+                _json_string(domain),
+                _STATUS_JSON[status],
+                confidences[confidence],
+                _METHOD_JSON[method],
+                servers[server],
+                http_codes[http],
+                *_EVIDENCE_JSON[flags],
+                errors.get(idx, "null"),
+                _BACKEND_JSON[backend],
+            )
+            for idx, (domain, status, confidence, method, server, http, flags, backend) in enumerate(
+                zip(
+                    self.domains,
+                    self.status,
+                    self.confidence,
+                    self.method,
+                    self.rdap_server,
+                    self.rdap_http,
+                    self.evidence,
+                    self.backend,
+                )
+            )
+        ]
+        if indent is None:
+            return "[" + ", ".join(rows) + "]"
+        inner = "\n" + " " * (indent * (depth + 1))
+        return "[" + inner + ("," + inner).join(rows) + "\n" + " " * (indent * depth) + "]"
+
+    def iter_results(self) -> Iterator[DomainResult]:
+        for row in self.iter_rows():
+            yield DomainResult.model_construct(**row)
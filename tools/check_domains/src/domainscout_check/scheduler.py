@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from math import ceil
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from .models import ToolOptions
+
+
+DNS_LANE = "dns://fallback"
+
+
+class TokenBucket:
+    def __init__(self, rate: float | None, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self.rate is not None:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available now, without waiting."""
+        if self.rate is None:
+            return True
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        if self.rate is None:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one RDAP server.
+
+    closed -> open after ``threshold`` failures in a row; open -> half_open once
+    ``cooldown`` seconds pass, letting a single probe through; the probe's outcome
+    closes or re-opens it. A probe that ends neither way (throttled, cancelled) is
+    handed back with ``release_probe`` so the next request can probe instead.
+    """
+
+    def __init__(self, threshold: int, cooldown: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._started = clock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.transitions: list[dict] = []
+
+    def _move(self, state: str) -> None:
+        self.transitions.append(
+            {
+                "at_s": round(self._clock() - self._started, 3),
+                "from": self.state,
+                "to": state,
+                "failures": self.failures,
+            }
+        )
+        self.state = state
+
+    def allow(self) -> bool:
+        if self.state == "open" and self._clock() - self.opened_at >= self.cooldown:
+            self._move("half_open")
+            self._probing = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    @property
+    def probing(self) -> bool:
+        return self._probing
+
+    def release_probe(self) -> None:
+        if self.state == "half_open":
+            self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._move("closed")
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+            self._move("open")
+            self.opened_at = self._clock()
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "rejected": self.rejected, "transitions": list(self.transitions)}
+
+
+class RetryBudget:
+    """Run-wide cap: retries may not exceed ``percent`` of first attempts (plus a small floor)."""
+
+    def __init__(self, percent: float, floor: int = 10) -> None:
+        self.ratio = percent / 100
+        self.floor = floor
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        if self.retries + 1 > self.floor + self.ratio * self.requests:
+            self.denied += 1
+            return False
+        self.retries += 1
+        return True
+
+    def snapshot(self) -> dict:
+        return {"requests": self.requests, "retries": self.retries, "denied": self.denied}
+
+
+class SharedPauses:
+    """Retry-After pauses shared by the processes of a sharded run.
+
+    One wall-clock deadline per lane in shared memory (``multiprocessing.Array``): a
+    pause any shard takes holds every shard's lane, so N shards do not hit a throttled
+    server N times as hard. Hand it to worker processes when they start (pool initargs).
+    """
+
+    def __init__(self, bases: Iterable[str], context: Any) -> None:
+        self.index = {base: idx for idx, base in enumerate(sorted(set(bases)))}
+        self._until = context.Array("d", max(1, len(self.index)))
+
+    def until(self, base: str) -> float:
+        idx = self.index.get(base)
+        return 0.0 if idx is None else self._until[idx]
+
+    def extend(self, base: str, until: float) -> None:
+        idx = self.index.get(base)
+        if idx is None:
+            return
+        with self._until.get_lock():
+            if until > self._until[idx]:
+                self._until[idx] = until
+
+
+class ServerLane:
+    def __init__(
+        self,
+        base: str,
+        concurrency: int,
+        rate: float | None,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        breaker: CircuitBreaker | None = None,
+        shared: SharedPauses | None = None,
+    ) -> None:
+        self.base = base
+        self.concurrency = concurrency
+        self.slots = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst, clock=clock)
+        self._clock = clock
+        self.breaker = breaker
+        self.shared = shared
+        self.paused_until = 0.0
+        self.warmup: asyncio.Future[None] | None = None
+        self.requests = 0
+        self.throttled = 0
+        self.deferred_seconds = 0.0
+
+    @property
+    def paused(self) -> bool:
+        return self.paused_until > self._clock()
+
+    def _adopt_shared_pause(self) -> None:
+        """Take on a pause another shard's lane for this server started."""
+        remaining = self.shared.until(self.base) - time.time()
+        if remaining > 0:
+            self.paused_until = max(self.paused_until, self._clock() + remaining)
+
+    async def pace(self) -> None:
+        """Wait out any Retry-After pause and take a rate token."""
+        while True:
+            if self.shared is not None:
+                self._adopt_shared_pause()
+            delay = self.paused_until - self._clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            await self.bucket.acquire()
+            if self.paused_until <= self._clock():
+                return
+
+    async def wait_turn(self) -> None:
+        if self.warmup is not None and not self.warmup.done():
+            await asyncio.shield(self.warmup)
+        await self.pace()
+        self.requests += 1
+
+    def defer(self, seconds: float) -> None:
+        self.throttled += 1
+        until = self._clock() + seconds
+        if until > self.paused_until:
+            self.deferred_seconds += until - max(self.paused_until, self._clock())
+            self.paused_until = until
+        if self.shared is not None:
+            self.shared.extend(self.base, time.time() + seconds)
+
+    def snapshot(self) -> dict:
+        snapshot = {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "deferred_seconds": round(self.deferred_seconds, 3),
+        }
+        if self.breaker is not None and (self.breaker.transitions or self.breaker.rejected):
+            snapshot["breaker"] = self.breaker.snapshot()
+        return snapshot
+
+
+class RDAPScheduler:
+    def __init__(self, options: ToolOptions, servers: Iterable[str], shared_pauses: SharedPauses | None = None) -> None:
+        distinct = sorted({s for s in servers if s})
+        self.max_retry_after = options.rdap_retry_after_max_seconds
+        self._global = asyncio.Semaphore(options.max_concurrency)
+        # find_best_fast runs one TLD at a time, so a single lane is active and may take the whole pool.
+        active = 1 if options.find_best_fast else max(1, len(distinct))
+        share = options.rdap_server_concurrency or ceil(options.max_concurrency / active)
+        self._defaults = (share, options.rdap_rate_limit_per_server, options.rdap_rate_burst)
+        self._breaker_settings = (options.rdap_breaker_threshold, options.rdap_breaker_cooldown_seconds)
+        self.retry_budget = RetryBudget(options.rdap_retry_budget_percent)
+        self._shared_pauses = shared_pauses
+        self._lanes = {base: self._new_lane(base) for base in distinct}
+        self._lanes[DNS_LANE] = ServerLane(DNS_LANE, options.max_concurrency, None, 1)
+
+    def _new_lane(self, base: str) -> ServerLane:
+        return ServerLane(
+            base, *self._defaults, breaker=CircuitBreaker(*self._breaker_settings), shared=self._shared_pauses
+        )
+
+    def lane(self, rdap_base: str | None) -> ServerLane:
+        key = rdap_base or DNS_LANE
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._new_lane(key)
+            self._lanes[key] = lane
+        return lane
+
+    @asynccontextmanager
+    async def slot(self, rdap_base: str | None) -> AsyncIterator[ServerLane]:
+        lane = self.lane(rdap_base)
+        async with lane.slots:
+            async with self._global:
+                yield lane
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            base: lane.snapshot()
+            for base, lane in self._lanes.items()
+            if lane.requests or lane.throttled or (lane.breaker is not None and lane.breaker.rejected)
+        }
+
+    def rdap_lanes(self) -> list[ServerLane]:
+        return [lane for base, lane in self._lanes.items() if base != DNS_LANE]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, AsyncIterator, Collection
+
+from .backends import lookup_chain, needs_bootstrap, simulated_base
+from .checker import _resolve_rdap_base, iter_lookups
+from .metrics import RunMetrics
+from .models import CheckDomainsInput, DomainResult, ToolOptions
+from .rdap import load_bootstrap_map
+from .result_table import ResultTable
+from .scheduler import SharedPauses
+from .summary import RunSummary
+
+# A shard sends its results in chunks of at most this many rows, or whatever it has once
+# this long has passed: the parent streams them as they complete without paying a queue
+# round trip per result.
+SHARD_CHUNK_ROWS = 64
+SHARD_CHUNK_SECONDS = 0.05
+# How often the parent, waiting on the result queue, checks whether a shard died.
+_SHARD_POLL_SECONDS = 0.2
+
+# Set in each worker process by _init_worker.
+_results_queue: Any = None
+_shared_pauses: SharedPauses | None = None
+
+
+@dataclass
+class ShardOutcome:
+    metrics: RunMetrics
+    rdap_servers: dict[str, dict]
+    retries: dict | None
+    connections: dict[str, dict]
+    hedging: dict | None
+    coalesced: int
+
+
+def shard_count(options: ToolOptions, valid_slds: int) -> int:
+    """Shards actually used: every shard needs at least one slot, SLD and (when rate limited) burst token."""
+    limits = [options.shards, options.max_concurrency, valid_slds]
+    if options.rdap_server_concurrency is not None:
+        limits.append(options.rdap_server_concurrency)
+    if options.rdap_rate_limit_per_server is not None:
+        limits.append(options.rdap_rate_burst)
+    return max(1, min(limits))
+
+
+def _split(total: int, shards: int, idx: int) -> int:
+    return total // shards + (idx < total % shards)
+
+
+def shard_options(options: ToolOptions, shards: int, idx: int) -> ToolOptions:
+    """Options for shard ``idx`` of ``shards``, with limits split so the shards add up to the run's.
+
+    Every shard talks to every RDAP server (SLDs are dealt round-robin), so each gets a
+    fixed share of every per-server limit (concurrency, rate, burst), of the simulated
+    registry's throughput cap and of the breaker's failure threshold. Retry-After pauses
+    are shared outright (``SharedPauses``). The verdict cache and zone index stay with
+    the parent, which consults them before sharding and stores the merged results.
+    """
+    rate = options.rdap_rate_limit_per_server
+    server_concurrency = options.rdap_server_concurrency
+    simulated_rate = options.simulated.max_lookups_per_second
+    return options.model_copy(
+        update={
+            "shards": 1,
+            "max_concurrency": _split(options.max_concurrency, shards, idx),
+            "rdap_server_concurrency": None if server_concurrency is None else _split(server_concurrency, shards, idx),
+            "rdap_rate_limit_per_server": None if rate is None else rate / shards,
+            "rdap_rate_burst": _split(options.rdap_rate_burst, shards, idx) if rate is not None else options.rdap_rate_burst,
+            "rdap_breaker_threshold": max(1, ceil(options.rdap_breaker_threshold / shards)),
+            "simulated": options.simulated.model_copy(
+                update={"max_lookups_per_second": None if simulated_rate is None else simulated_rate / shards}
+            ),
+            "cache_mode": "bypass",
+            "zone_index_dir": None,
+        }
+    )
+
+
+def _init_worker(results_queue: Any, shared_pauses: SharedPauses) -> None:
+    """Pool initializer: queues and shared memory can only reach a worker as it starts."""
+    global _results_queue, _shared_pauses
+    _results_queue = results_queue
+    _shared_pauses = shared_pauses
+
+
+async def _run_shard(
+    payload: CheckDomainsInput,
+    slds: list[str],
+    tlds: list[str],
+    skip: list[str],
+    rdap_base_map: dict[str, str],
+) -> ShardOutcome:
+    summary = RunSummary(tlds=tlds, allow_unknown=payload.options.treat_unknown_as_available)
+    chunk = ResultTable()
+    flush_at = time.monotonic() + SHARD_CHUNK_SECONDS
+    lookups = iter_lookups(payload, slds, tlds, set(skip), summary, rdap_base_map=rdap_base_map, shared_pauses=_shared_pauses)
+    async for result in lookups:
+        chunk.append(result)
+        if len(chunk) >= SHARD_CHUNK_ROWS or time.monotonic() >= flush_at:
+            _results_queue.put(chunk)
+            chunk = ResultTable()
+            flush_at = time.monotonic() + SHARD_CHUNK_SECONDS
+    if len(chunk):
+        _results_queue.put(chunk)
+    return ShardOutcome(
+        metrics=summary.metrics,
+        rdap_servers=summary.rdap_servers,
+        retries=summary.retries,
+        connections=summary.connections,
+        hedging=summary.hedging,
+        coalesced=summary.coalesced,
+    )
+
+
+def run_shard(
+    payload: CheckDomainsInput,
+    slds: list[str],
+    tlds: list[str],
+    skip: list[str],
+    rdap_base_map: dict[str, str],
+) -> ShardOutcome:
+    """Process-pool entry point: one shard on its own event loop and HTTP client.
+
+    Results go to the run's queue in chunks as they complete, then ``None`` marks the
+    shard finished; the return value carries only the shard's summary state.
+    """
+    try:
+        return asyncio.run(_run_shard(payload, slds, tlds, skip, rdap_base_map))
+    finally:
+        _results_queue.put(None)
+
+
+def _add_snapshots(total: dict | None, part: dict | None) -> dict | None:
+    """Sum two lane/connection/retry snapshots: numbers add, dicts merge, anything else keeps the first."""
+    if total is None or part is None:
+        return part if total is None else total
+    merged = dict(total)
+    for key, value in part.items():
+        current = merged.get(key)
+        if current is None:
+            merged[key] = value
+        elif isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = _add_snapshots(current, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(current, (int, float)):
+            merged[key] = round(current + value, 3) if isinstance(value, float) else current + value
+        elif isinstance(value, list) and isinstance(current, list):
+            merged[key] = current + value
+    return merged
+
+
+def _merge_outcome(summary: RunSummary, outcome: ShardOutcome) -> None:
+    summary.metrics.merge(outcome.metrics)
+    summary.rdap_servers = _add_snapshots(summary.rdap_servers, outcome.rdap_servers) or {}
+    summary.retries = _add_snapshots(summary.retries, outcome.retries)
+    summary.connections = _add_snapshots(summary.connections, outcome.connections) or {}
+    summary.hedging = _add_snapshots(summary.hedging, outcome.hedging)
+    summary.coalesced += outcome.coalesced
+
+
+async def iter_sharded_lookups(
+    payload: CheckDomainsInput,
+    valid_slds: list[str],
+    tlds: list[str],
+    skip: Collection[str],
+    summary: RunSummary,
+) -> AsyncIterator[DomainResult]:
+    """``iter_lookups`` split across ``options.shards`` processes, each with its own loop and client.
+
+    SLDs are dealt round-robin so every shard sees every TLD. The RDAP bootstrap map is
+    resolved once here and handed to the shards. Results stream back through a queue in
+    small chunks as the shards produce them; lane and retry stats are merged at the end.
+    """
+    options = payload.options
+    shards = shard_count(options, len(valid_slds))
+    rdap_base_map: dict[str, str] = {}
+    if needs_bootstrap(lookup_chain(options)):
+        rdap_base_map = await load_bootstrap_map(
+            cache_path=Path(options.bootstrap_cache_path),
+            ttl_seconds=options.bootstrap_ttl_seconds,
+            required_tlds=tlds,
+            detach_refresh=True,
+        )
+    context = get_context("spawn")
+    results_queue = context.Queue()
+    lanes = {simulated_base(tld) for tld in tlds} | {_resolve_rdap_base(tld, rdap_base_map, payload) for tld in tlds}
+    shared_pauses = SharedPauses((base for base in lanes if base), context)
+    loop = asyncio.get_running_loop()
+    # spawn, not fork: the parent has a running event loop and open sockets.
+    pool = ProcessPoolExecutor(
+        max_workers=shards, mp_context=context, initializer=_init_worker, initargs=(results_queue, shared_pauses)
+    )
+    try:
+        pending = []
+        for idx in range(shards):
+            shard_slds = valid_slds[idx::shards]
+            shard_skip = [domain for sld in shard_slds for tld in tlds if (domain := f"{sld}{tld}") in skip]
+            shard_payload = payload.model_copy(update={"options": shard_options(options, shards, idx)})
+            pending.append(loop.run_in_executor(pool, run_shard, shard_payload, shard_slds, tlds, shard_skip, rdap_base_map))
+        running = shards
+        while running:
+            try:
+                chunk = await asyncio.to_thread(results_queue.get, True, _SHARD_POLL_SECONDS)
+            except queue.Empty:
+                for future in pending:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                continue
+            if chunk is None:
+                running -= 1
+                continue
+            for result in chunk.iter_results():
+                yield result
+        for outcome in await asyncio.gather(*pending):
+            _merge_outcome(summary, outcome)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
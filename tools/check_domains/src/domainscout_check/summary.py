@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .metrics import RunMetrics
+from .models import CacheStats, DomainResult, EarlyStopStats
+
+
+def extract_tld(domain: str) -> str:
+    parts = domain.rsplit(".", maxsplit=1)
+    if len(parts) != 2:
+        return ""
+    return f".{parts[1].lower()}"
+
+
+class BestTracker:
+    def __init__(self, tlds: list[str], allow_unknown: bool) -> None:
+        self._tld_order = {t.lower(): idx for idx, t in enumerate(tlds)}
+        self._missing_rank = len(tlds) + 1
+        self.allow_unknown = allow_unknown
+        self._best: dict[str, tuple[int, float, int, str]] = {}
+
+    def sort_key(self, result: DomainResult) -> tuple[int, float, int, str]:
+        tld_idx = self._tld_order.get(extract_tld(result.domain), self._missing_rank)
+        return (tld_idx, -result.confidence, len(result.domain), result.domain)
+
+    def add(self, result: DomainResult) -> None:
+        if result.status not in {"available", "unknown"}:
+            return
+        key = self.sort_key(result)
+        current = self._best.get(result.status)
+        if current is None or key < current:
+            self._best[result.status] = key
+
+    @property
+    def best(self) -> str | None:
+        if "available" in self._best:
+            return self._best["available"][3]
+        if self.allow_unknown and "unknown" in self._best:
+            return self._best["unknown"][3]
+        return None
+
+
+class PreferenceTarget:
+    """find_best_fast stop rule: enough available domains in the preferred TLDs.
+
+    Walking TLDs in preference order, availables accumulate until the target is met;
+    a TLD that is not fully checked yet blocks the walk, because it could still produce
+    a better pick than anything in the TLDs after it.
+    """
+
+    def __init__(self, tlds: list[str], slds_per_tld: int, target: int) -> None:
+        self._tlds = [t.lower() for t in tlds]
+        self._per_tld = slds_per_tld
+        self._checked: Counter[str] = Counter()
+        self._available: Counter[str] = Counter()
+        self.stats = EarlyStopStats(target=target)
+
+    def satisfied(self) -> bool:
+        found = 0
+        for tld in self._tlds:
+            found += self._available[tld]
+            if found >= self.stats.target:
+                return True
+            if self._checked[tld] < self._per_tld:
+                return False
+        return False
+
+    def add(self, result: DomainResult) -> bool:
+        tld = extract_tld(result.domain)
+        self._checked[tld] += 1
+        self._available[tld] += int(result.status == "available")
+        self.stats.checked += 1
+        if not self.stats.triggered and self.satisfied():
+            self.stats.triggered = True
+            self.stats.skipped = self._per_tld * len(self._tlds) - self.stats.checked
+        return self.stats.triggered
+
+
+@dataclass
+class RunSummary:
+    tlds: list[str]
+    allow_unknown: bool
+    checked_at: str | None = None
+    counts: dict[str, int] = field(default_factory=lambda: {"available": 0, "taken": 0, "unknown": 0, "invalid": 0})
+    cache: CacheStats | None = None
+    rdap_servers: dict[str, dict] = field(default_factory=dict)
+    coalesced: int = 0
+    connections: dict[str, dict] = field(default_factory=dict)
+    hedging: dict | None = None
+    retries: dict | None = None
+    zone_hits: int | None = None
+    early_stop: EarlyStopStats | None = None
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    tracker: BestTracker = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.tracker = BestTracker(self.tlds, self.allow_unknown)
+
+    def add(self, result: DomainResult) -> None:
+        self.counts[result.status] = self.counts.get(result.status, 0) + 1
+        self.tracker.add(result)
+
+    @property
+    def suggested_best(self) -> str | None:
+        return self.tracker.best
+
+    def as_dict(self) -> dict:
+        return {
+            "checked_at": self.checked_at,
+            "counts": dict(self.counts),
+            "suggested_best": self.suggested_best,
+            "cache": self.cache.model_dump() if self.cache is not None else None,
+            "coalesced": self.coalesced,
+            "connections": self.connections,
+            "hedging": self.hedging,
+            "retries": self.retries,
+            "zone_hits": self.zone_hits,
+            "early_stop": self.early_stop.model_dump() if self.early_stop is not None else None,
+            "stats": self.metrics.snapshot(),
+        }
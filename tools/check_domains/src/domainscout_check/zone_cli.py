@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .env_guard import require_uv_project_env
+from .zone_index import apply_zone_diff, build_zone_index, index_path_for, open_zone_text, read_zone_diff
+
+
+DEFAULT_INDEX_DIR = ".rig_cache/zones"
+
+
+def main() -> int:
+    try:
+        require_uv_project_env()
+    except RuntimeError as exc:
+        sys.stderr.write(f"Environment error: {exc}\n")
+        return 2
+
+    parser = argparse.ArgumentParser(description="DomainScout zone-file index maintenance")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR, help="Directory holding <tld>.zidx files")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build a TLD index from a zone file (.txt or .txt.gz)")
+    build.add_argument("zone_file")
+    build.add_argument("--tld", required=True)
+
+    diff = sub.add_parser("apply-diff", help="Merge a daily +name/-name diff into an existing index")
+    diff.add_argument("diff_file")
+    diff.add_argument("--tld", required=True)
+    diff.add_argument("--serial", type=int, help="Zone serial the diff brings the index to")
+
+    args = parser.parse_args()
+    index_path = index_path_for(Path(args.index_dir), args.tld)
+    try:
+        if args.command == "build":
+            header = build_zone_index(Path(args.zone_file), args.tld, index_path)
+        else:
+            with open_zone_text(Path(args.diff_file)) as fh:
+                added, removed = read_zone_diff(fh, args.tld)
+            header = apply_zone_diff(index_path, added, removed, serial=args.serial)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Zone index error: {exc}\n")
+        return 3
+
+    sys.stdout.write(json.dumps({"index": str(index_path), **header}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
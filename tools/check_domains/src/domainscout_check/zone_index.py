@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+# Layout: MAGIC | u32 header length | JSON header | pad to 4 | (count + 1) u32 LE offsets | label blob.
+# Labels are the zone's second-level labels (ASCII/punycode), sorted bytewise and deduplicated.
+MAGIC = b"DSZIDX1\n"
+INDEX_SUFFIX = ".zidx"
+_U32 = struct.Struct("<I")
+# Labels sorted in memory per run (and offsets buffered per write) before spilling to disk,
+# so building or diffing a .com-sized zone keeps a bounded footprint.
+_RUN_LABELS = 1_000_000
+
+
+def index_path_for(index_dir: Path, tld: str) -> Path:
+    return index_dir / f"{tld.lstrip('.').lower()}{INDEX_SUFFIX}"
+
+
+def open_zone_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="ascii", errors="replace")
+    return path.open("r", encoding="ascii", errors="replace")
+
+
+def iter_zone_slds(lines: Iterable[str], tld: str, serial: list[int] | None = None) -> Iterator[str]:
+    """Yield second-level labels owning records in a TLD zone file (RFC 1035 master format).
+
+    Handles comments, ``$ORIGIN``, ``@`` and blank owners; multi-line records only need
+    their first line because the owner is all that matters. The SOA serial, when seen, is
+    stored in ``serial[0]``.
+    """
+    tld = tld.lstrip(".").lower()
+    origin = f"{tld}."
+    suffix = f".{origin}"
+    owner = origin
+    for line in lines:
+        if not line or line[0] == ";":
+            continue
+        if line[0] == "$":
+            directive = line.split()
+            if directive[0].upper() == "$ORIGIN" and len(directive) > 1:
+                origin = directive[1].lower()
+            continue
+        tokens = line.split(";", 1)[0].split()
+        if not tokens:
+            continue
+        if not line[0].isspace():
+            name = tokens.pop(0).lower()
+            if name == "@":
+                owner = origin
+            elif name.endswith("."):
+                owner = name
+            else:
+                owner = f"{name}.{origin}"
+        if owner == origin or owner == f"{tld}.":
+            if serial is not None and "SOA" in (t.upper() for t in tokens[:4]):
+                rdata = [t for t in tokens if t not in {"(", ")"}]
+                idx = [t.upper() for t in rdata].index("SOA")
+                if len(rdata) > idx + 3 and rdata[idx + 3].isdigit():
+                    serial[:] = [int(rdata[idx + 3])]
+            continue
+        if not owner.endswith(suffix):
+            continue
+        label = owner[: -len(suffix)]
+        if "." in label:
+            # Glue or other records below a delegation: the SLD is the last label.
+            label = label.rsplit(".", 1)[1]
+        yield label
+
+
+def _flush_offsets(offsets: array, fh: IO[bytes]) -> None:
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    fh.write(offsets.tobytes())
+
+
+def _write_index(path: Path, labels: Iterable[bytes], header: dict) -> dict:
+    """Stream sorted labels into an index: offsets and blob go to scratch files, then one concatenation."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+    with tempfile.TemporaryFile(dir=path.parent) as offsets_fh, tempfile.TemporaryFile(dir=path.parent) as blob_fh:
+        offsets = array("I", [0])
+        end = 0
+        for label in labels:
+            blob_fh.write(label)
+            end += len(label)
+            count += 1
+            offsets.append(end)
+            if len(offsets) >= _RUN_LABELS:
+                _flush_offsets(offsets, offsets_fh)
+                offsets = array("I")
+        _flush_offsets(offsets, offsets_fh)
+
+        header = {**header, "count": count}
+        encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+        pad = (-(len(MAGIC) + _U32.size + len(encoded))) % 4
+        with tmp.open("wb") as fh:
+            fh.write(MAGIC)
+            fh.write(_U32.pack(len(encoded) + pad))
+            fh.write(encoded + b" " * pad)
+            for scratch in (offsets_fh, blob_fh):
+                scratch.seek(0)
+                shutil.copyfileobj(scratch, fh, 1 << 20)
+    tmp.replace(path)
+    return header
+
+
+def _read_run(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as fh:
+        for line in fh:
+            yield line[:-1]
+
+
+def _unique(labels: Iterable[bytes]) -> Iterator[bytes]:
+    previous = None
+    for label in labels:
+        if label != previous:
+            yield label
+        previous = label
+
+
+def _sorted_unique(labels: Iterable[bytes], workdir: Path) -> Iterator[bytes]:
+    """External sort: sorted, deduplicated runs of ``_RUN_LABELS`` spill to ``workdir``, then merge."""
+    runs: list[Path] = []
+    chunk: set[bytes] = set()
+    for label in labels:
+        chunk.add(label)
+        if len(chunk) >= _RUN_LABELS:
+            run = workdir / f"run{len(runs)}"
+            run.write_bytes(b"".join(label + b"\n" for label in sorted(chunk)))
+            runs.append(run)
+            chunk = set()
+    if not runs:
+        return iter(sorted(chunk))
+    return _unique(heapq.merge(*(_read_run(run) for run in runs), sorted(chunk)))
+
+
+def build_zone_index(zone_path: Path, tld: str, index_path: Path) -> dict:
+    serial: list[int] = []
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open_zone_text(zone_path) as fh, tempfile.TemporaryDirectory(dir=index_path.parent) as workdir:
+        labels = (label.encode("ascii", "replace") for label in iter_zone_slds(fh, tld, serial))
+        # Reads the whole zone (and so its SOA serial) before returning the merge.
+        sorted_labels = _sorted_unique(labels, Path(workdir))
+        return _write_index(
+            index_path,
+            sorted_labels,
+            {
+                "tld": tld.lstrip(".").lower(),
+                "serial": serial[0] if serial else None,
+                "source": zone_path.name,
+                "built_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "diffs_applied": 0,
+            },
+        )
+
+
+def read_zone_diff(lines: Iterable[str], tld: str) -> tuple[set[str], set[str]]:
+    """Parse a daily diff: ``+name`` adds and ``-name`` removes (SLD or FQDN, one per line)."""
+    suffix = f".{tld.lstrip('.').lower()}"
+    added: set[str] = set()
+    removed: set[str] = set()
+    for raw in lines:
+        line = raw.strip().lower().rstrip(".")
+        if len(line) < 2 or line[0] not in "+-":
+            continue
+        name = line[1:].strip()
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+        (added if line[0] == "+" else removed).add(name)
+    return added, removed
+
+
+def apply_zone_diff(index_path: Path, added: Iterable[str], removed: Iterable[str], serial: int | None = None) -> dict:
+    """Merge a diff into an existing index in one sequential pass (no zone re-parse)."""
+    drop = {name.encode("ascii", "replace") for name in removed}
+    extra = sorted({name.encode("ascii", "replace") for name in added} - drop)
+    with ZoneIndex(index_path) as current:
+        header = dict(current.header)
+        header["diffs_applied"] = header.get("diffs_applied", 0) + 1
+        if serial is not None:
+            header["serial"] = serial
+        merged = _unique(heapq.merge(current.iter_labels(), extra))
+        # The old index stays mapped while the new one streams into a temporary file beside it.
+        return _write_index(index_path, (label for label in merged if label not in drop), header)
+
+
+class ZoneIndex:
+    """Memory-mapped, binary-searched set of registered second-level labels for one TLD."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a zone index: {path}")
+        header_len = _U32.unpack_from(self._mm, len(MAGIC))[0]
+        start = len(MAGIC) + _U32.size
+        self.header = json.loads(self._mm[start : start + header_len])
+        self.count = int(self.header["count"])
+        offsets_start = start + header_len
+        self._blob_start = offsets_start + (self.count + 1) * 4
+        self._offsets = memoryview(self._mm)[offsets_start : self._blob_start].cast("I")
+        if sys.byteorder == "big":
+            self._offsets = array("I", self._offsets)
+            self._offsets.byteswap()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, label: str) -> bool:
+        key = label.encode("ascii", "replace")
+        mm, offsets, base = self._mm, self._offsets, self._blob_start
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = mm[base + offsets[mid] : base + offsets[mid + 1]]
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def iter_labels(self) -> Iterator[bytes]:
+        mm, offsets, base = self._mm, self._offsets, self._blob_start
+        for idx in range(self.count):
+            yield mm[base + offsets[idx] : base + offsets[idx + 1]]
+
+    def close(self) -> None:
+        if isinstance(getattr(self, "_offsets", None), memoryview):
+            self._offsets.release()
+        self._mm.close()
+        self._fh.close()
+
+    def __enter__(self) -> ZoneIndex:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def open_zone_indexes(index_dir: Path, tlds: Iterable[str]) -> dict[str, ZoneIndex]:
+    indexes: dict[str, ZoneIndex] = {}
+    for tld in tlds:
+        path = index_path_for(index_dir, tld)
+        if path.exists():
+            indexes[tld] = ZoneIndex(path)
+    return indexes